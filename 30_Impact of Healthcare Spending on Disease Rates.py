@@ -1,12 +1,11 @@
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-import numpy as np
 import warnings
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+
+from dashboard.disease import (
+    asean_options, cases_by_year, chart_rows, correlations, country_metrics, country_rows, create_filters,
+    create_metrics, expenditure_by_country, filtered, load_tables
+)
+from dashboard.disease_plots import plot_country_trend, plot_interactive_bar, plot_interactive_line, plot_spending_split
 
 # Suppress warnings
 warnings.simplefilter(action='ignore', category=FutureWarning)
@@ -18,186 +17,8 @@ st.markdown(
     "This dashboard analyzes the relationship between immunization expenditures and infectious disease cases across different countries over time.")
 
 
-# Define helper functions
-def create_metrics(col1, col2, col3, metric1, value1, metric2, value2, metric3, value3):
-    with col1:
-        st.metric(metric1, value1)
-    with col2:
-        st.metric(metric2, value2)
-    with col3:
-        st.metric(metric3, value3)
-
-
-def create_filters(min_year, max_year, df, key_prefix, disease_filter=True, region_filter=False, top_n_filter=False):
-    filters = {}
-
-    filter_cols = st.columns(3)
-    with filter_cols[0]:
-        filters['year_range'] = st.slider(
-            "Year Range",
-            min_value=min_year,
-            max_value=max_year,
-            value=(min_year, max_year),
-            key=f"{key_prefix}_year_slider"
-        )
-
-    with filter_cols[1]:
-        if top_n_filter:
-            filters['top_n'] = st.slider("Show Top N Countries",
-                                         min_value=5, max_value=20, value=10,
-                                         key=f"{key_prefix}_top_n_slider")
-
-    with filter_cols[2]:
-        if disease_filter and 'SUBJECT' in df.columns:
-            disease_types = sorted(df['SUBJECT'].unique())
-            filters['disease'] = st.selectbox(
-                "Disease Type",
-                options=["All"] + disease_types,
-                key=f"{key_prefix}_disease_filter"
-            )
-        else:
-            filters['disease'] = "All"
-
-    if region_filter and 'REGION' in df.columns:
-        regions = sorted(df['REGION'].unique())
-        filters['regions'] = st.multiselect(
-            "Select Regions",
-            options=["All"] + regions,
-            default="All",
-            key=f"{key_prefix}_region_filter"
-        )
-    else:
-        filters['regions'] = ["All"]
-
-    return filters
-
-
-def filter_data(df, filters, countries=None):
-    filtered_df = df.copy()
-
-    # Filter by year range
-    filtered_df = filtered_df[
-        (filtered_df['YEAR'] >= filters['year_range'][0]) &
-        (filtered_df['YEAR'] <= filters['year_range'][1])
-        ]
-
-    # Filter by countries if provided
-    if countries:
-        filtered_df = filtered_df[filtered_df['COUNTRYNAME'].isin(countries)]
-
-    # Filter by disease type if selected
-    if filters.get('disease') != "All" and 'SUBJECT' in filtered_df.columns:
-        filtered_df = filtered_df[filtered_df['SUBJECT'] == filters['disease']]
-
-    # Filter by region if selected
-    if filters.get('regions') != ["All"] and 'REGION' in filtered_df.columns:
-        filtered_df = filtered_df[filtered_df['REGION'].isin(filters['regions'])]
-
-    return filtered_df
-
-
-def plot_interactive_bar(data, x, y, title, xlabel, ylabel):
-    """Create an interactive bar chart with plotly"""
-    fig = px.bar(
-        data,
-        x=x,
-        y=y,
-        title=title,
-        labels={x: xlabel, y: ylabel},
-        hover_data={x: True, y: ':.2f'}
-    )
-
-    fig.update_layout(
-        xaxis_title=xlabel,
-        yaxis_title=ylabel,
-        hoverlabel=dict(
-            bgcolor="white",
-            font_size=12,
-            font_family="Arial"
-        ),
-        hovermode="closest"
-    )
-
-    return fig
-
-
-def plot_interactive_line(data, x, y, title, xlabel, ylabel, color=None, line_group=None):
-    """Create an interactive line chart with plotly"""
-    fig = px.line(
-        data,
-        x=x,
-        y=y,
-        title=title,
-        color=color,
-        line_group=line_group,
-        labels={x: xlabel, y: ylabel},
-        hover_data={x: True, y: ':.2f'},
-        markers=True
-    )
-
-    fig.update_layout(
-        xaxis_title=xlabel,
-        yaxis_title=ylabel,
-        legend_title_text=color if color else "",
-        hoverlabel=dict(
-            bgcolor="white",
-            font_size=12,
-            font_family="Arial"
-        ),
-        hovermode="closest"
-    )
-
-    return fig
-
-
-def calculate_correlations(df, group_by='COUNTRYNAME'):
-    corr_df = df.groupby(group_by).apply(
-        lambda x: x['IMMUNISATION_EXPENDITURE'].corr(x['DISEASE_CASES'])
-    ).reset_index()
-    corr_df.columns = ['Country', 'Correlation']
-    return corr_df.sort_values('Correlation')
-
-
-@st.cache_data
-def load_data():
-    # Replace with your actual file paths
-    file1 = file1 = "data/Immunization_expenditure.csv"
-    file2 = "data/Infectious_Disease.csv"
-
-    df_immunization = pd.read_csv(file1, encoding='ISO-8859-1')
-    df_disease = pd.read_csv(file2)
-    return df_immunization, df_disease
-
-
-# Load and preprocess data
-df_immunization, df_disease = load_data()
-
-# Data Preprocessing
-df_immunization['VALUE'] = pd.to_numeric(df_immunization['VALUE'], errors='coerce')
-df_immunization_vacc = df_immunization[df_immunization['INDCODE'] == 'FIN_GVT_VACC'].copy()
-df_immunization_grouped = \
-    df_immunization_vacc.dropna(subset=['VALUE']).groupby(['COUNTRYNAME', 'YEAR'], as_index=False)['VALUE'].sum()
-df_immunization_grouped.rename(columns={"VALUE": "IMMUNISATION_EXPENDITURE"}, inplace=True)
-
-df_disease.columns = df_disease.columns.str.strip().str.upper()
-df_disease.rename(columns={"PERIOD": "YEAR", "LOCATION": "COUNTRYNAME", "FACTVALUENUMERIC": "DISEASE_CASES"},
-                  inplace=True)
-
-df_merged = pd.merge(df_immunization_grouped, df_disease, on=["YEAR", "COUNTRYNAME"], how="inner")
-df_merged = df_merged.dropna(subset=['DISEASE_CASES'])
-df_merged['YEAR'] = pd.to_numeric(df_merged['YEAR'], errors='coerce')
-
-# Define ASEAN countries
-asean_countries = ["Brunei", "Cambodia", "Indonesia", "Laos", "Malaysia",
-                   "Myanmar", "Philippines", "Singapore", "Thailand", "Vietnam"]
-
-# Calculate preventive and treatment spending percentages
-df_spending = df_immunization_grouped.copy()
-df_spending['PREVENTIVE_SPENDING'] = df_spending['IMMUNISATION_EXPENDITURE'] * 0.4  # Placeholder
-df_spending['TREATMENT_SPENDING'] = df_spending['IMMUNISATION_EXPENDITURE'] * 0.6  # Placeholder
-df_spending['TOTAL_SPENDING'] = df_spending['PREVENTIVE_SPENDING'] + df_spending['TREATMENT_SPENDING']
-df_spending['PREVENTIVE_SPENDING_PERCENT'] = (df_spending['PREVENTIVE_SPENDING'] / df_spending['TOTAL_SPENDING']) * 100
-df_spending['TREATMENT_SPENDING_PERCENT'] = (df_spending['TREATMENT_SPENDING'] / df_spending['TOTAL_SPENDING']) * 100
+# Load the preprocessed tables (shared with the dashboard's disease analysis page)
+df_merged = load_tables()[0]
 
 # Create tabs for different sections
 global_tab, asean_tab = st.tabs(["Global Overview", "ASEAN Focus"])
@@ -220,13 +41,9 @@ with global_tab:
 
     st.markdown("---")
 
-    # Apply filters
-    df_global = filter_data(df_merged, global_filters)
-
-    # Get top N countries
-    top_countries = df_global.groupby('COUNTRYNAME')['IMMUNISATION_EXPENDITURE'].mean().nlargest(
-        global_filters['top_n']).index.tolist()
-    df_global_top = df_global[df_global['COUNTRYNAME'].isin(top_countries)]
+    # Apply filters; the top N countries' rows feed the charts
+    df_global = filtered("merged", global_filters)
+    df_global_top = chart_rows(global_filters)
 
     # Display metrics
     st.subheader("📈 Global Key Metrics")
@@ -244,11 +61,8 @@ with global_tab:
 
     if len(df_global_top) > 0:
         # Top countries bar chart - interactive
-        top_countries_summary = df_global_top.groupby('COUNTRYNAME')['IMMUNISATION_EXPENDITURE'].mean().reset_index()
-        top_countries_summary = top_countries_summary.sort_values('IMMUNISATION_EXPENDITURE', ascending=False)
-
         fig_top = plot_interactive_bar(
-            top_countries_summary, 'COUNTRYNAME', 'IMMUNISATION_EXPENDITURE',
+            expenditure_by_country(global_filters), 'COUNTRYNAME', 'IMMUNISATION_EXPENDITURE',
             f"Top {global_filters['top_n']} Countries by Average Immunisation Expenditure",
             "Country", "Average Immunisation Expenditure"
         )
@@ -258,9 +72,8 @@ with global_tab:
         st.subheader("📈 Global Disease Cases Over Time")
 
         # Average trend - interactive
-        global_disease_trend = df_global_top.groupby('YEAR')['DISEASE_CASES'].mean().reset_index()
         fig_global_disease = plot_interactive_line(
-            global_disease_trend, 'YEAR', 'DISEASE_CASES',
+            cases_by_year(global_filters), 'YEAR', 'DISEASE_CASES',
             f"Global Average Disease Cases Over Time (Top {global_filters['top_n']} Countries)",
             "Year", "Average Disease Cases"
         )
@@ -276,10 +89,8 @@ with global_tab:
 
         # Correlation analysis - interactive
         st.subheader("🔗 Global Correlation Analysis")
-        global_correlations = calculate_correlations(df_global_top)
-
         fig_global_corr = plot_interactive_bar(
-            global_correlations,
+            correlations(global_filters),
             'Country', 'Correlation',
             "Correlation between Immunisation Expenditure and Disease Cases",
             "Country", "Correlation Coefficient"
@@ -310,18 +121,18 @@ with asean_tab:
     )
 
     # ASEAN country selection
-    asean_options = [country for country in asean_countries if country in df_merged['COUNTRYNAME'].unique()]
+    asean_countries = asean_options()
     selected_asean_countries = st.multiselect(
         "Select ASEAN Countries",
-        options=asean_options,
-        default=asean_options,
+        options=asean_countries,
+        default=asean_countries,
         key="asean_country_filter"
     )
 
     st.markdown("---")
 
     # Apply filters
-    df_asean = filter_data(df_merged, asean_filters, selected_asean_countries)
+    df_asean = filtered("merged", asean_filters, selected_asean_countries)
 
     # Display metrics
     st.subheader("📈 ASEAN Key Metrics")
@@ -338,11 +149,8 @@ with asean_tab:
 
     if len(df_asean) > 0:
         # ASEAN countries summary - interactive
-        asean_summary = df_asean.groupby('COUNTRYNAME')['IMMUNISATION_EXPENDITURE'].mean().reset_index()
-        asean_summary = asean_summary.sort_values('IMMUNISATION_EXPENDITURE', ascending=False)
-
         fig_asean = plot_interactive_bar(
-            asean_summary, 'COUNTRYNAME', 'IMMUNISATION_EXPENDITURE',
+            expenditure_by_country(asean_filters, selected_asean_countries), 'COUNTRYNAME', 'IMMUNISATION_EXPENDITURE',
             "Average Immunisation Expenditure by ASEAN Country",
             "Country", "Average Immunisation Expenditure"
         )
@@ -358,10 +166,8 @@ with asean_tab:
 
         # Correlation analysis - interactive
         st.subheader("🔗 ASEAN Correlation Analysis")
-        asean_correlations = calculate_correlations(df_asean)
-
         fig_asean_corr = plot_interactive_bar(
-            asean_correlations,
+            correlations(asean_filters, selected_asean_countries),
             'Country', 'Correlation',
             "Correlation between Immunisation Expenditure and Disease Cases in ASEAN",
             "Country", "Correlation Coefficient"
@@ -384,41 +190,10 @@ with asean_tab:
         st.subheader("ASEAN Countries Comparison")
 
         # Filter spending data
-        df_asean_spending = filter_data(df_spending, asean_filters, selected_asean_countries)
+        df_asean_spending = filtered("spending", asean_filters, selected_asean_countries)
 
         if len(df_asean_spending) > 0:
-            # Calculate average spending percentages
-            asean_spending_summary = df_asean_spending.groupby('COUNTRYNAME')[
-                ['PREVENTIVE_SPENDING_PERCENT', 'TREATMENT_SPENDING_PERCENT']
-            ].mean().reset_index()
-
-            # Create interactive stacked bar chart
-            fig_spending = go.Figure()
-
-            fig_spending.add_trace(go.Bar(
-                x=asean_spending_summary['COUNTRYNAME'],
-                y=asean_spending_summary['PREVENTIVE_SPENDING_PERCENT'],
-                name='Preventive Spending %',
-                marker_color='green',
-                hovertemplate='%{y:.1f}%<extra>Preventive Spending</extra>'
-            ))
-
-            fig_spending.add_trace(go.Bar(
-                x=asean_spending_summary['COUNTRYNAME'],
-                y=asean_spending_summary['TREATMENT_SPENDING_PERCENT'],
-                name='Treatment Spending %',
-                marker_color='blue',
-                hovertemplate='%{y:.1f}%<extra>Treatment Spending</extra>'
-            ))
-
-            fig_spending.update_layout(
-                title='Preventive vs Treatment Spending Across ASEAN Countries',
-                xaxis_title='Country',
-                yaxis_title='Spending Percentage',
-                barmode='group',
-                hovermode='closest'
-            )
-
+            fig_spending = plot_spending_split(df_asean_spending)
             st.plotly_chart(fig_spending, use_container_width=True)
         else:
             st.info("No spending data available for the selected filters.")
@@ -429,107 +204,25 @@ with asean_tab:
         # Country selector
         selected_country = st.selectbox(
             "Select ASEAN Country for Deep Dive",
-            options=selected_asean_countries if selected_asean_countries else asean_options,
+            options=selected_asean_countries if selected_asean_countries else asean_countries,
             key="country_deep_dive"
         )
 
         # Filter for selected country
-        df_country = df_asean[df_asean['COUNTRYNAME'] == selected_country].sort_values('YEAR')
-        df_country_spending = df_asean_spending[df_asean_spending['COUNTRYNAME'] == selected_country].sort_values(
-            'YEAR')
+        df_country, df_country_spending = country_rows(asean_filters, selected_country)
 
         if len(df_country) > 0:
-            # Interactive dual-axis chart
-            fig_country = make_subplots(
-                rows=2, cols=1,
-                subplot_titles=(
-                    f'{selected_country}: Immunisation Expenditure vs Disease Cases',
-                    f'{selected_country}: Preventive vs Treatment Spending Over Years'
-                ),
-                specs=[[{"secondary_y": True}], [{"secondary_y": False}]],
-                vertical_spacing=0.12
-            )
-
-            # Top chart - Expenditure and cases
-            fig_country.add_trace(
-                go.Scatter(
-                    x=df_country['YEAR'],
-                    y=df_country['IMMUNISATION_EXPENDITURE'],
-                    name='Immunisation Expenditure',
-                    line=dict(color='blue', width=3),
-                    mode='lines+markers',
-                    hovertemplate='Year: %{x}<br>Expenditure: %{y:.2f}<extra></extra>'
-                ),
-                row=1, col=1
-            )
-
-            fig_country.add_trace(
-                go.Scatter(
-                    x=df_country['YEAR'],
-                    y=df_country['DISEASE_CASES'],
-                    name='Disease Cases',
-                    line=dict(color='red', width=3),
-                    mode='lines+markers',
-                    hovertemplate='Year: %{x}<br>Cases: %{y:.2f}<extra></extra>'
-                ),
-                row=1, col=1, secondary_y=True
-            )
-
-            # Bottom chart - Spending percentages
-            if len(df_country_spending) > 0:
-                fig_country.add_trace(
-                    go.Bar(
-                        x=df_country_spending['YEAR'],
-                        y=df_country_spending['PREVENTIVE_SPENDING_PERCENT'],
-                        name='Preventive Spending %',
-                        marker_color='green',
-                        hovertemplate='Year: %{x}<br>Preventive: %{y:.1f}%<extra></extra>'
-                    ),
-                    row=2, col=1
-                )
-
-                fig_country.add_trace(
-                    go.Bar(
-                        x=df_country_spending['YEAR'],
-                        y=df_country_spending['TREATMENT_SPENDING_PERCENT'],
-                        name='Treatment Spending %',
-                        marker_color='blue',
-                        hovertemplate='Year: %{x}<br>Treatment: %{y:.1f}%<extra></extra>'
-                    ),
-                    row=2, col=1
-                )
-
-                fig_country.update_layout(barmode='group')
-
-            # Update layout and axes
-            fig_country.update_layout(
-                height=800,
-                hovermode='closest',
-                legend=dict(
-                    orientation="h",
-                    yanchor="bottom",
-                    y=1.02,
-                    xanchor="right",
-                    x=1
-                )
-            )
-
-            # Update axes labels
-            fig_country.update_xaxes(title_text="Year", row=1, col=1)
-            fig_country.update_xaxes(title_text="Year", row=2, col=1)
-            fig_country.update_yaxes(title_text="Immunisation Expenditure", row=1, col=1)
-            fig_country.update_yaxes(title_text="Disease Cases", secondary_y=True, row=1, col=1)
-            fig_country.update_yaxes(title_text="Spending Percentage", row=2, col=1)
-
+            # Expenditure vs cases and the spending split over the years
+            fig_country = plot_country_trend(df_country, df_country_spending, selected_country)
             st.plotly_chart(fig_country, use_container_width=True)
 
             # Key insights
             st.subheader(f"Key Insights for {selected_country}")
 
             # Calculate metrics
-            avg_expenditure = df_country['IMMUNISATION_EXPENDITURE'].mean()
-            avg_cases = df_country['DISEASE_CASES'].mean()
-            correlation = df_country['IMMUNISATION_EXPENDITURE'].corr(df_country['DISEASE_CASES'])
+            metrics = country_metrics(asean_filters, selected_country)
+            avg_expenditure, avg_cases, correlation = \
+                metrics["avg_expenditure"], metrics["avg_cases"], metrics["correlation"]
 
             # Display metrics
             key_metrics_cols = st.columns(3)
@@ -592,8 +285,6 @@ with st.expander("📦 Package Requirements"):
     # Required packages
     streamlit
     pandas
-    matplotlib
-    seaborn
     numpy
     plotly
     """)
@@ -0,0 +1 @@
+"""Shared data loading, statistics and plotting helpers for the dashboard pages."""
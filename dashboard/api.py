@@ -0,0 +1,368 @@
+"""Read-only HTTP API over the dashboard's datasets and precomputed statistics.
+
+    python -m dashboard.api [--host 127.0.0.1] [--port 8600]
+
+Run from the repository root, like ``streamlit run``; ``python -m
+dashboard.serve`` also starts it when ``DASHBOARD_API_PORT`` is set. ``GET /``
+lists the resources. Every resource is a table, returned as JSON records by
+default or as an Arrow IPC stream with ``?format=arrow`` (or ``Accept:
+application/vnd.apache.arrow.stream``).
+
+Tables come from the same loaders and caches as the pages. Responses carry an
+ETag derived from the request and the source files' versions, so a client
+that sends ``If-None-Match`` gets ``304 Not Modified`` without anything being
+loaded, and repeated requests are answered from the ``"api"`` cache.
+
+Row filters, where the table has the column: ``country``, ``income_group``,
+``region``, ``indicator`` and ``series`` (comma-separated or repeated
+values), ``year``, ``year_from`` and ``year_to``; ``columns`` picks columns.
+``/disease/correlations`` also takes ``disease`` when the data has a disease
+column.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+import traceback
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd
+import pyarrow as pa
+
+from dashboard import data, derived, disease
+from dashboard.cache import MANAGER
+from dashboard.imputation import FILL_METHODS
+
+API_PORT = 8600
+ARROW_TYPE = "application/vnd.apache.arrow.stream"
+JSON_TYPE = "application/json"
+# Bump when response bodies change for the same data, so clients drop their copies
+API_VERSION = 2
+
+# Query parameter -> candidate column names across the tables
+FILTER_COLUMNS = {
+    "country": ("Country Name", "Country", "COUNTRYNAME"),
+    "income_group": ("IncomeGroup",),
+    "region": ("Region", "REGION"),
+    "indicator": ("Indicator",),
+    "series": ("Series",)
+}
+YEAR_COLUMNS = ("Year", "YEAR")
+COMMON_PARAMS = {"format", "columns", "year", "year_from", "year_to", *FILTER_COLUMNS}
+
+FILLS = {method for method in FILL_METHODS.values() if method is not None}
+
+# Path -> (loader, version, extra parameters, description); loaders take the query dict
+RESOURCES = {}
+
+_responses = MANAGER.cache("api", max_entries=256)
+
+
+class BadRequest(ValueError):
+    pass
+
+
+def resource(path, version, params=(), description=""):
+    """Register a table loader under a URL path."""
+    def register(load):
+        RESOURCES[path] = (load, version, set(params), description)
+        return load
+    return register
+
+
+def _values(query, name):
+    """All values of a parameter, splitting comma-separated lists."""
+    return [value.strip() for raw in query.get(name, []) for value in raw.split(",") if value.strip()]
+
+
+def _one(query, name, default=None):
+    values = _values(query, name)
+    if len(values) > 1:
+        raise BadRequest(f"{name} takes one value")
+    return values[0] if values else default
+
+
+def _int(query, name, default=None):
+    value = _one(query, name)
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise BadRequest(f"{name} must be an integer") from None
+
+
+def _fill(query):
+    fill = _one(query, "fill")
+    if fill is not None and fill not in FILLS:
+        raise BadRequest(f"fill must be one of {', '.join(sorted(FILLS))}")
+    return fill
+
+
+# --- Resources ---
+WDI_FILES = (data.HEALTH_EXP_FILE, data.LIFE_EXP_FILE, data.METADATA_FILE)
+
+
+@resource("/panel", lambda: data.data_version(*WDI_FILES),
+          description="WDI health expenditure and life expectancy by country and year")
+def panel(query):
+    return data.load_wdi_panel()
+
+
+@resource("/workforce", lambda: data.data_version(data.WORKFORCE_FILE, *WDI_FILES), params=["fill"],
+          description="WHO workforce density joined with the WDI panel; fill gap-fills the cadres")
+def workforce(query):
+    return data.load_workforce_panel(_fill(query)).reset_index()
+
+
+@resource("/workforce_expenditure", lambda: data.data_version(data.WORKFORCE_EXPENDITURE_FILE), params=["fill"],
+          description="ASEAN/Asia workforce density with health expenditure (% GDP)")
+def workforce_expenditure(query):
+    return data.load_workforce_expenditure(_fill(query))
+
+
+@resource("/education",
+          lambda: data.data_version(*(path for path in data.EDUCATION_FILES.values() if os.path.exists(path))),
+          description="ASEAN education and health indicators by series, country and year")
+def education(query):
+    return data.load_education_cube()
+
+
+def _build_version(artifact):
+    """Identifies the artifact's build, (re)building it first if needed; a stale one is served if that fails."""
+    derived.ensure_built(artifact)
+    entry = derived.read_entry(artifact)
+    return f"{entry['sources']}-{entry['format']}-{entry['built']}"
+
+
+def _derived_resource(artifact, table):
+    @resource(f"/derived/{table}", lambda: _build_version(artifact),
+              description=f"Precomputed {artifact.replace('_', ' ')} table")
+    def load(query):
+        df = derived.load_derived(artifact)[table]
+        # Keep named indexes (country_fits is indexed by country) as columns
+        return df.reset_index() if any(df.index.names) else df
+
+
+DERIVED_TABLES = {
+    "wdi_group_averages": ["region_life_expectancy", "income_life_expectancy", "income_health_expenditure"],
+    "country_regressions": ["country_observations", "country_fits", "country_refits"],
+    "income_group_statistics": ["income_group_correlations", "income_group_elasticities"],
+    "optimal_spend": ["optimal_spend", "optimal_spend_curves", "optimal_spend_scores"],
+    "country_forecasts": ["country_forecasts", "country_trends"]
+}
+for _artifact, _tables in DERIVED_TABLES.items():
+    for _table in _tables:
+        _derived_resource(_artifact, _table)
+
+
+@resource("/disease/merged", disease.version,
+          description="Immunization expenditure joined with infectious disease cases by country and year")
+def disease_merged(query):
+    return disease.load_tables()[0]
+
+
+@resource("/disease/correlations", disease.version, params=["top_n", "disease"],
+          description="Per-country correlation of immunization expenditure and disease cases; "
+                      "top_n keeps the countries with the highest mean expenditure")
+def disease_correlations(query):
+    merged = disease.load_tables()[0]
+    years = merged["YEAR"]
+    year = _int(query, "year")
+    if _one(query, "disease") is not None and "SUBJECT" not in merged.columns:
+        raise BadRequest("disease cannot be applied: the merged data has no disease column")
+    filters = {
+        "year_range": (_int(query, "year_from", year or int(years.min())),
+                       _int(query, "year_to", year or int(years.max()))),
+        "disease": _one(query, "disease", "All"),
+        "regions": _values(query, "region") or ["All"]
+    }
+    top_n = _int(query, "top_n")
+    if top_n is not None:
+        filters["top_n"] = top_n
+    countries = tuple(_values(query, "country")) or None
+    return disease.correlations(filters, countries)
+
+
+# Filters already applied by the loader itself
+_LOADER_FILTERS = {"/disease/correlations": {"country", "year", "year_from", "year_to", "region"}}
+
+
+def filter_rows(df, query, skip=()):
+    """Rows matching the query's filters; filters on columns the table lacks are ignored."""
+    mask = pd.Series(True, index=df.index)
+    for name, columns in FILTER_COLUMNS.items():
+        values = _values(query, name)
+        column = next((col for col in columns if col in df.columns), None)
+        if values and column is not None and name not in skip:
+            mask &= df[column].astype(str).isin(values)
+    year_column = next((col for col in YEAR_COLUMNS if col in df.columns), None)
+    if year_column is not None and "year" not in skip:
+        year = _int(query, "year")
+        start, end = _int(query, "year_from", year), _int(query, "year_to", year)
+        years = pd.to_numeric(df[year_column], errors="coerce")
+        if start is not None:
+            mask &= years >= start
+        if end is not None:
+            mask &= years <= end
+    rows = df[mask]
+
+    columns = _values(query, "columns")
+    if columns:
+        missing = [col for col in columns if col not in rows.columns]
+        if missing:
+            raise BadRequest(f"unknown columns: {', '.join(missing)}")
+        rows = rows[columns]
+    return rows.reset_index(drop=True)
+
+
+# --- Responses ---
+def normalize_query(query):
+    return tuple(sorted((name, tuple(_values(query, name))) for name in query))
+
+
+def response_format(query, accept):
+    fmt = _one(query, "format") or ("arrow" if ARROW_TYPE in accept else "json")
+    if fmt not in ("json", "arrow"):
+        raise BadRequest("format must be json or arrow")
+    return fmt
+
+
+def etag(path, query, fmt):
+    version = RESOURCES[path][1]()
+    digest = hashlib.sha1(repr((API_VERSION, path, normalize_query(query), fmt, version)).encode())
+    return f'"{digest.hexdigest()[:20]}"'
+
+
+def to_json(df):
+    return json.dumps({
+        "columns": list(df.columns),
+        "rows": len(df),
+        "data": json.loads(df.to_json(orient="records", date_format="iso"))
+    }).encode()
+
+
+def to_arrow(df):
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def render(path, query, fmt):
+    load, _, params, _ = RESOURCES[path]
+    unknown = set(query) - params - COMMON_PARAMS
+    if unknown:
+        raise BadRequest(f"unknown parameters: {', '.join(sorted(unknown))}")
+    rows = filter_rows(load(query), query, skip=_LOADER_FILTERS.get(path, ()))
+    return to_arrow(rows) if fmt == "arrow" else to_json(rows)
+
+
+def index():
+    return json.dumps({
+        "resources": {
+            path: {"description": description, "parameters": sorted(params)}
+            for path, (_, _, params, description) in RESOURCES.items()
+        },
+        "filters": sorted(COMMON_PARAMS),
+        "formats": {"json": JSON_TYPE, "arrow": ARROW_TYPE}
+    }, indent=2).encode()
+
+
+def _matches(header, tag):
+    if header is None:
+        return False
+    candidates = [value.strip().removeprefix("W/") for value in header.split(",")]
+    return "*" in candidates or tag in candidates
+
+
+class Handler(BaseHTTPRequestHandler):
+    server_version = "DashboardAPI/1"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        path = url.path.rstrip("/") or "/"
+        query = parse_qs(url.query)
+        if path == "/":
+            return self._send(HTTPStatus.OK, JSON_TYPE, index())
+        if path not in RESOURCES:
+            return self._error(HTTPStatus.NOT_FOUND, f"no resource {path}; GET / lists them")
+
+        try:
+            fmt = response_format(query, self.headers.get("Accept", ""))
+            tag = etag(path, query, fmt)
+        except BadRequest as exc:
+            return self._error(HTTPStatus.BAD_REQUEST, str(exc))
+        except derived.ArtifactMissing as exc:
+            return self._error(HTTPStatus.SERVICE_UNAVAILABLE, str(exc))
+        except FileNotFoundError as exc:
+            return self._error(HTTPStatus.SERVICE_UNAVAILABLE, f"source data missing: {exc.filename}")
+        if _matches(self.headers.get("If-None-Match"), tag):
+            return self._send(HTTPStatus.NOT_MODIFIED, None, b"", tag)
+
+        body = _responses.get(tag)
+        if body is None:
+            try:
+                body = render(path, query, fmt)
+            except BadRequest as exc:
+                return self._error(HTTPStatus.BAD_REQUEST, str(exc))
+            except Exception as exc:
+                self.log_error("failed to render %s: %r", self.path, exc)
+                traceback.print_exc()
+                return self._error(HTTPStatus.INTERNAL_SERVER_ERROR, "internal error; see the server log")
+            _responses.put(tag, body)
+        self._send(HTTPStatus.OK, ARROW_TYPE if fmt == "arrow" else JSON_TYPE, body, tag)
+
+    def _send(self, status, content_type, body, tag=None):
+        self.send_response(status)
+        if content_type is not None:
+            self.send_header("Content-Type", content_type)
+        if tag is not None:
+            self.send_header("ETag", tag)
+            # Cache, but check back every time: unchanged data costs a 304
+            self.send_header("Cache-Control", "no-cache")
+        if status != HTTPStatus.NOT_MODIFIED:
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status, message):
+        self._send(status, JSON_TYPE, json.dumps({"error": message}).encode())
+
+
+def make_server(host="127.0.0.1", port=API_PORT):
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    return server
+
+
+def start(host="127.0.0.1", port=API_PORT):
+    """Serve in a daemon thread (used by ``dashboard.serve``); returns the server."""
+    server = make_server(host, port)
+    threading.Thread(target=server.serve_forever, name="dashboard-api", daemon=True).start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1", help="interface to listen on (default: %(default)s)")
+    parser.add_argument("--port", type=int, default=API_PORT, help="port (default: %(default)s)")
+    args = parser.parse_args(argv)
+    server = make_server(args.host, args.port)
+    print(f"Serving the dashboard API on http://{args.host}:{args.port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
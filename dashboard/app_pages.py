@@ -0,0 +1,21 @@
+"""The app's pages, in navigation order.
+
+``streamlit_app.py`` lists these pages explicitly instead of letting Streamlit
+discover ``pages/``, so the cache admin page (which lets anyone who opens it
+clear the server's caches) is only there with ``DASHBOARD_ADMIN=1``.
+"""
+import os
+import re
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+HOME_SCRIPT = ROOT / "home.py"
+ADMIN_PAGES = {"90_Admin - Caches"}
+ADMIN_ENABLED = os.environ.get("DASHBOARD_ADMIN", "") not in ("", "0")
+
+
+def page_scripts(admin=False):
+    """Scripts under ``pages/`` sorted by number prefix; admin pages only with ``admin``."""
+    pages = [path for path in (ROOT / "pages").glob("*.py") if admin or path.stem not in ADMIN_PAGES]
+    return sorted(pages, key=lambda path: (int(re.match(r"\d*", path.stem).group() or sys.maxsize), path.stem))
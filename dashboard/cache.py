@@ -0,0 +1,277 @@
+"""In-process caches under one memory budget.
+
+Every :class:`LRUCache` created through :data:`MANAGER` counts towards a
+global byte budget (``$DASHBOARD_CACHE_BUDGET_MB``, default 1024). When the
+total goes over it, the least recently used entries are evicted across all
+caches, whichever cache holds them, so a burst of figures can push out old
+exports and vice versa. Entries may expire after a per-cache TTL, and entries
+too large for their share of the budget are not stored at all. Each cache
+counts hits, misses, evictions and expirations for the admin page.
+"""
+import functools
+import hashlib
+import itertools
+import os
+import sys
+import time
+import types
+from collections import OrderedDict
+from threading import Lock, RLock
+
+import numpy as np
+import pandas as pd
+
+CACHE_BUDGET_BYTES = int(float(os.environ.get("DASHBOARD_CACHE_BUDGET_MB", 1024)) * 1024 ** 2)
+# No single entry may take more than this share of the budget
+MAX_ENTRY_FRACTION = 0.25
+
+
+def normalize_widget_value(value):
+    """Turn widget values into hashable, order-stable cache key parts."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(normalize_widget_value(v) for v in value))
+    if isinstance(value, (list, tuple)):
+        return tuple(normalize_widget_value(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, normalize_widget_value(v)) for k, v in value.items()))
+    return value
+
+
+def sizeof(value):
+    """Approximate bytes held by a cached value."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, (pd.Series, pd.Index)):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(sizeof(v) for v in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(sizeof(k) + sizeof(v) for k, v in value.items())
+    return sys.getsizeof(value)
+
+
+class _Entry:
+    __slots__ = ("value", "size", "expires", "used")
+
+    def __init__(self, value, size, expires, used):
+        self.value = value
+        self.size = size
+        self.expires = expires
+        self.used = used
+
+
+class LRUCache:
+    """Thread-safe least-recently-used cache with hit/miss/eviction counters.
+
+    ``ttl`` (seconds) expires entries after they were stored. With a
+    ``manager`` the cache also counts towards its byte budget and shares its
+    lock; on its own it is bounded by ``max_entries`` only.
+    """
+
+    def __init__(self, max_entries=128, ttl=None, name=None, manager=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.name = name
+        self.manager = manager
+        self._entries = OrderedDict()
+        self._lock = manager.lock if manager is not None else Lock()
+        self._ticks = manager.ticks if manager is not None else itertools.count()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.rejected = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires is not None and entry.expires <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            entry.used = next(self._ticks)
+            self.hits += 1
+            return entry.value
+
+    def put(self, key, value, size=None):
+        """Store ``value``; ``size`` overrides :func:`sizeof` for objects it cannot measure."""
+        size = sizeof(value) if size is None else size
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if self.manager is not None and size > self.manager.budget * MAX_ENTRY_FRACTION:
+                self.rejected += 1
+                return
+            expires = time.monotonic() + self.ttl if self.ttl is not None else None
+            self._entries[key] = _Entry(value, size, expires, next(self._ticks))
+            self.bytes += size
+            while len(self._entries) > self.max_entries:
+                self.evict_oldest()
+            if self.manager is not None:
+                self.manager.enforce_budget()
+
+    def _remove(self, key):
+        self.bytes -= self._entries.pop(key).size
+
+    def evict_oldest(self):
+        key = next(iter(self._entries))
+        self._remove(key)
+        self.evictions += 1
+
+    def oldest_use(self):
+        """Access tick of the least recently used entry, or None when empty."""
+        return self._entries[next(iter(self._entries))].used if self._entries else None
+
+    def purge_expired(self):
+        now = time.monotonic()
+        with self._lock:
+            for key in [key for key, entry in self._entries.items()
+                        if entry.expires is not None and entry.expires <= now]:
+                self._remove(key)
+                self.expirations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "Cache": self.name,
+            "Entries": len(self._entries),
+            "Max entries": self.max_entries,
+            "Bytes": self.bytes,
+            "Hits": self.hits,
+            "Misses": self.misses,
+            "Hit rate": self.hits / lookups if lookups else None,
+            "Evictions": self.evictions,
+            "Expirations": self.expirations,
+            "Too large": self.rejected,
+            "TTL (s)": self.ttl
+        }
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+
+class CacheManager:
+    """Registry of named caches that share one byte budget."""
+
+    def __init__(self, budget=CACHE_BUDGET_BYTES):
+        self.budget = budget
+        self.lock = RLock()
+        self.ticks = itertools.count()
+        self.caches = {}
+
+    def cache(self, name, max_entries=128, ttl=None):
+        """The cache called ``name``, created on first use."""
+        with self.lock:
+            if name not in self.caches:
+                self.caches[name] = LRUCache(max_entries, ttl=ttl, name=name, manager=self)
+            return self.caches[name]
+
+    @property
+    def bytes(self):
+        return sum(cache.bytes for cache in self.caches.values())
+
+    def enforce_budget(self):
+        """Drop expired entries, then the least recently used ones, until under budget."""
+        with self.lock:
+            if self.bytes <= self.budget:
+                return
+            for cache in self.caches.values():
+                cache.purge_expired()
+            total = self.bytes
+            while total > self.budget:
+                oldest = min((cache for cache in self.caches.values() if len(cache)), key=LRUCache.oldest_use)
+                before = oldest.bytes
+                oldest.evict_oldest()
+                total -= before - oldest.bytes
+
+    def stats(self):
+        with self.lock:
+            return [cache.stats() for cache in self.caches.values()]
+
+    def clear(self):
+        with self.lock:
+            for cache in self.caches.values():
+                cache.clear()
+
+
+MANAGER = CacheManager()
+
+
+def _copy_out(value):
+    # Cached frames are shared by every caller; copy-on-write makes shallow copies safe to modify
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy(deep=False)
+    if isinstance(value, np.ndarray):
+        view = value.view()
+        view.flags.writeable = False
+        return view
+    if isinstance(value, tuple):
+        return tuple(_copy_out(v) for v in value)
+    if isinstance(value, list):
+        return [_copy_out(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _copy_out(v) for k, v in value.items()}
+    return value
+
+
+def _code_hash(func):
+    """Hash of what a function computes: bytecode, constants and names (nested functions included) and defaults."""
+    digest = hashlib.sha1()
+
+    def add(code):
+        digest.update(code.co_code)
+        digest.update(repr(code.co_names).encode())
+        for const in code.co_consts:
+            # Nested code objects' reprs carry their address, so hash their contents instead
+            if isinstance(const, types.CodeType):
+                add(const)
+            else:
+                digest.update(repr(const).encode())
+
+    add(func.__code__)
+    digest.update(repr((func.__defaults__, func.__kwdefaults__)).encode())
+    return digest.hexdigest()
+
+
+def cached(name, max_entries=128, ttl=None):
+    """Memoize a function in the managed cache ``name``.
+
+    Replaces ``@st.cache_data`` for data and statistics functions: results
+    count towards the budget and show up on the admin page. Keys are the
+    function's file, name, code (bytecode, constants, names and defaults)
+    plus its normalized arguments, so a page function redefined on every
+    rerun still hits, while an edit to a constant or default misses. Frames come back as
+    shallow copies and arrays as read-only views instead of full copies.
+    """
+    def decorator(func):
+        name_key = (func.__code__.co_filename, func.__qualname__, _code_hash(func))
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            cache = MANAGER.cache(name, max_entries=max_entries, ttl=ttl)
+            key = (name_key, normalize_widget_value(args), normalize_widget_value(kwargs))
+            missing = object()
+            result = cache.get(key, missing)
+            if result is missing:
+                result = func(*args, **kwargs)
+                cache.put(key, result)
+            return _copy_out(result)
+        return wrapper
+    return decorator
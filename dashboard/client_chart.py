@@ -0,0 +1,173 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import plotly.express as px
+import streamlit as st
+from plotly.offline import get_plotlyjs, get_plotlyjs_version
+
+# Served by Streamlit's static file serving (.streamlit/config.toml) from the
+# "static" folder next to the main script, so the chart works offline and
+# draws with the same plotly.js version as st.plotly_chart's figures
+STATIC_DIR = Path(__file__).resolve().parent.parent / "static"
+PLOTLY_JS = f"plotly-{get_plotlyjs_version()}.min.js"
+
+_TEMPLATE = """
+<div style="font-family: 'Source Sans Pro', sans-serif; font-size: 14px;">
+  <div style="margin-bottom: 6px;">
+    Years <input type="range" id="from"> <input type="range" id="to"> <b id="years"></b>
+  </div>
+  <div id="groups" style="display: flex; flex-wrap: wrap; gap: 2px 12px; max-height: 84px; overflow-y: auto;"></div>
+  <div id="chart" style="height: __HEIGHT__px;"></div>
+  <div id="stats"></div>
+</div>
+<script src="app/static/__PLOTLY_JS__"></script>
+<script>
+const spec = __SPEC__;
+const col = spec.columns;
+const n = col.x.length;
+const from = document.getElementById("from"), to = document.getElementById("to");
+for (const input of [from, to]) {
+  input.min = spec.years[0]; input.max = spec.years[1]; input.step = 1;
+  input.oninput = render;
+}
+from.value = spec.initial_years[0]; to.value = spec.initial_years[1];
+
+const groupBox = document.getElementById("groups");
+spec.groups.forEach((group, i) => {
+  const label = document.createElement("label"), box = document.createElement("input");
+  box.type = "checkbox"; box.value = i;
+  box.checked = spec.initial_groups.includes(group);
+  box.onchange = render;
+  label.append(box, document.createTextNode(" " + group));
+  groupBox.appendChild(label);
+});
+
+function fitLine(xs, ys) {
+  const m = xs.length, mx = xs.reduce((a, b) => a + b, 0) / m, my = ys.reduce((a, b) => a + b, 0) / m;
+  let sxx = 0, sxy = 0, syy = 0;
+  for (let i = 0; i < m; i++) {
+    sxx += (xs[i] - mx) ** 2; sxy += (xs[i] - mx) * (ys[i] - my); syy += (ys[i] - my) ** 2;
+  }
+  return {slope: sxy / sxx, intercept: my - sxy / sxx * mx, r: sxy / Math.sqrt(sxx * syy)};
+}
+
+function render() {
+  const lo = Math.min(+from.value, +to.value), hi = Math.max(+from.value, +to.value);
+  document.getElementById("years").textContent = `${lo}–${hi}`;
+  const active = new Set([...groupBox.querySelectorAll("input:checked")].map(box => +box.value));
+  const traces = [], allX = [], allY = [], imputed = {x: [], y: [], text: []};
+
+  spec.groups.forEach((group, g) => {
+    if (!active.has(g)) return;
+    const rows = [];
+    for (let i = 0; i < n; i++) {
+      if (col.group[i] === g && col.year[i] >= lo && col.year[i] <= hi && col.x[i] !== null && col.y[i] !== null) rows.push(i);
+    }
+    rows.sort((a, b) => col.x[a] - col.x[b]);
+    const xs = rows.map(i => col.x[i]), ys = rows.map(i => col.y[i]);
+    const color = spec.colors[g % spec.colors.length];
+    const base = {x: xs, y: ys, name: group, legendgroup: group, text: rows.map(() => group)};
+    if (spec.kind === "bar") traces.push({...base, type: "bar", marker: {color}});
+    else traces.push({...base, type: "scatter", mode: spec.kind === "line" ? "lines+markers" : "markers", marker: {color}});
+    if (spec.trendline && xs.length > 1) {
+      const f = fitLine(xs, ys), ends = [xs[0], xs[xs.length - 1]];
+      traces.push({x: ends, y: ends.map(v => f.intercept + f.slope * v), type: "scatter", mode: "lines",
+                   line: {color}, legendgroup: group, showlegend: false, hoverinfo: "skip"});
+    }
+    if (col.imputed) rows.filter(i => col.imputed[i]).forEach(i => {
+      imputed.x.push(col.x[i]); imputed.y.push(col.y[i]); imputed.text.push(group);
+    });
+    allX.push(...xs); allY.push(...ys);
+  });
+
+  if (imputed.x.length) traces.push({...imputed, type: "scatter", mode: "markers", name: "Imputed",
+    marker: {symbol: "circle-open", size: 11, color: "black"}});
+  Plotly.react("chart", traces, {
+    title: {text: spec.title}, barmode: "group", margin: {t: 50, r: 10},
+    xaxis: {title: {text: spec.x_label}}, yaxis: {title: {text: spec.y_label}},
+    legend: {title: {text: spec.group_label}}
+  }, {responsive: true});
+
+  const stats = document.getElementById("stats");
+  if (spec.correlation && allX.length > 2) {
+    stats.innerHTML = `<b>Correlation coefficient:</b> ${fitLine(allX, allY).r.toFixed(2)} ` +
+                      `(${allX.length} points, computed in the browser)`;
+  } else stats.textContent = "";
+}
+render();
+</script>
+"""
+
+
+def _column(values):
+    # JSON has no NaN; missing values travel as null
+    return [None if v is None or (isinstance(v, float) and np.isnan(v)) else v for v in values.tolist()]
+
+
+def client_chart_html(df, x, y, group, year, kind="scatter", initial_groups=None, initial_years=None,
+                      imputed=None, trendline=False, correlation=False, title=None, height=450):
+    """HTML for a chart whose year range and group selection are filtered in the browser.
+
+    The data for every group and year is embedded once as column arrays;
+    moving the year sliders or ticking groups re-draws with Plotly.js without
+    a Streamlit rerun. Per-group OLS lines and the correlation coefficient are
+    recomputed client-side for the current selection.
+    """
+    groups = sorted(df[group].dropna().unique())
+    codes = {name: i for i, name in enumerate(groups)}
+    years = (int(df[year].min()), int(df[year].max()))
+    columns = {
+        "x": _column(df[x].astype(float) if kind != "bar" and x != year else df[x].astype(int)),
+        "y": _column(df[y].astype(float)),
+        "group": df[group].map(codes).astype(int).tolist(),
+        "year": df[year].astype(int).tolist()
+    }
+    if imputed is not None:
+        columns["imputed"] = df[imputed].astype(bool).tolist()
+    spec = {
+        "columns": columns,
+        "groups": groups,
+        "colors": px.colors.qualitative.Plotly,
+        "years": years,
+        "initial_years": list(initial_years or years),
+        "initial_groups": list(initial_groups if initial_groups is not None else groups),
+        "kind": kind,
+        "trendline": trendline,
+        "correlation": correlation,
+        "title": title or "",
+        "x_label": x,
+        "y_label": y,
+        "group_label": group
+    }
+    # Keep "</script>" sequences in the data from closing the script tag
+    payload = json.dumps(spec, separators=(",", ":")).replace("</", "<\\/")
+    return (_TEMPLATE.replace("__SPEC__", payload)
+            .replace("__PLOTLY_JS__", PLOTLY_JS)
+            .replace("__HEIGHT__", str(height)))
+
+
+def ensure_plotly_js():
+    """Write the bundled plotly.js into the static folder if it is not there yet."""
+    path = STATIC_DIR / PLOTLY_JS
+    if path.exists():
+        return path
+    STATIC_DIR.mkdir(exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=STATIC_DIR, prefix=f".{PLOTLY_JS}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(get_plotlyjs())
+        os.chmod(tmp, 0o644)  # mkstemp creates it owner-only
+        os.replace(tmp, path)
+    except BaseException:
+        os.remove(tmp)
+        raise
+    return path
+
+
+def client_chart(df, x, y, group, year, height=450, **kwargs):
+    """Render :func:`client_chart_html` in an iframe sized for the controls and chart."""
+    ensure_plotly_js()
+    st.iframe(client_chart_html(df, x, y, group, year, height=height, **kwargs), height=height + 150)
@@ -0,0 +1,220 @@
+import hashlib
+import os
+
+import pandas as pd
+
+from dashboard.cache import cached
+from dashboard.disk_cache import disk_cache
+from dashboard.imputation import impute
+from dashboard.shared_data import shared_dataset
+
+HEALTH_EXP_FILE = "data/API_SH.XPD.CHEX.PC.CD_DS2_en_csv_v2_75935.csv"
+LIFE_EXP_FILE = "data/API_SP.DYN.LE00.IN_DS2_en_CSV_v2_76065.csv"
+METADATA_FILE = "data/Metadata_Country_API_SH.XPD.CHEX.PC.CD_DS2_en_csv_v2_75935.csv"
+LIFE_METADATA_FILE = "data/Metadata_Country_API_SP.DYN.LE00.IN_DS2_en_CSV_v2_76065.csv"
+
+YEARS = [str(year) for year in range(2000, 2023)]
+
+
+def _melt_wdi(df, value_name):
+    return df.melt(
+        id_vars=["Country Name", "Country Code"],
+        value_vars=YEARS,
+        var_name="Year",
+        value_name=value_name
+    )
+
+
+@shared_dataset
+@cached("data")
+@disk_cache(HEALTH_EXP_FILE, LIFE_EXP_FILE, METADATA_FILE)
+def load_wdi_panel():
+    """Health expenditure and life expectancy (2000-2022) joined with country metadata.
+
+    One row per country and year with both values present. Aggregates such as
+    "World" are kept; they have no IncomeGroup or Region.
+    """
+    health_exp_df = pd.read_csv(HEALTH_EXP_FILE, skiprows=4)
+    life_exp_df = pd.read_csv(LIFE_EXP_FILE, skiprows=4)
+    metadata_df = pd.read_csv(METADATA_FILE)
+
+    health_long = _melt_wdi(health_exp_df, "Health Expenditure")
+    life_long = _melt_wdi(life_exp_df, "Life Expectancy").drop(columns="Country Name")
+
+    df = pd.merge(health_long, life_long, on=["Country Code", "Year"])
+    df = pd.merge(df, metadata_df[["Country Code", "IncomeGroup", "Region"]], on="Country Code", how="left")
+    df.dropna(subset=["Health Expenditure", "Life Expectancy"], inplace=True)
+    df["Year"] = df["Year"].astype(int)
+    return df.reset_index(drop=True)
+
+
+@shared_dataset
+@cached("data")
+@disk_cache(LIFE_EXP_FILE, LIFE_METADATA_FILE)
+def load_life_expectancy():
+    """Life expectancy (2000-2022) by country and year, with the life expectancy metadata's Region and IncomeGroup.
+
+    Covers every country with a value, including those without health
+    expenditure data, which :func:`load_wdi_panel` leaves out.
+    """
+    df = _melt_wdi(pd.read_csv(LIFE_EXP_FILE, skiprows=4), "Life Expectancy").dropna(subset=["Life Expectancy"])
+    df = df.merge(pd.read_csv(LIFE_METADATA_FILE)[["Country Code", "Region", "IncomeGroup"]],
+                  on="Country Code", how="left")
+    df["Year"] = df["Year"].astype(int)
+    return df.reset_index(drop=True)
+
+
+WORKFORCE_FILE = "data/workforce.csv"
+
+# Short names for the four WHO workforce cadres (values are per 10 000 population)
+WORKFORCE_CADRES = {
+    "Medical doctors (per 10 000 population)": "Doctors",
+    "Nursing and midwifery personnel (per 10 000 population)": "Nurses",
+    "Dentists (per 10 000 population)": "Dentists",
+    "Pharmacists  (per 10 000 population)": "Pharmacists"
+}
+
+# WHO country names that differ from the World Bank (WDI) spelling
+WHO_TO_WDI_NAMES = {
+    "Bahamas": "Bahamas, The",
+    "Bolivia (Plurinational State of)": "Bolivia",
+    "Congo": "Congo, Rep.",
+    "Democratic People's Republic of Korea": "Korea, Dem. People's Rep.",
+    "Democratic Republic of the Congo": "Congo, Dem. Rep.",
+    "Egypt": "Egypt, Arab Rep.",
+    "Gambia": "Gambia, The",
+    "Iran (Islamic Republic of)": "Iran, Islamic Rep.",
+    "Kyrgyzstan": "Kyrgyz Republic",
+    "Lao People's Democratic Republic": "Lao PDR",
+    "Micronesia (Federated States of)": "Micronesia, Fed. Sts.",
+    "Netherlands (Kingdom of the)": "Netherlands",
+    "Republic of Korea": "Korea, Rep.",
+    "Republic of Moldova": "Moldova",
+    "Saint Kitts and Nevis": "St. Kitts and Nevis",
+    "Saint Lucia": "St. Lucia",
+    "Saint Vincent and the Grenadines": "St. Vincent and the Grenadines",
+    "Slovakia": "Slovak Republic",
+    "United Kingdom of Great Britain and Northern Ireland": "United Kingdom",
+    "United Republic of Tanzania": "Tanzania",
+    "United States of America": "United States",
+    "Venezuela (Bolivarian Republic of)": "Venezuela, RB",
+    "Yemen": "Yemen, Rep.",
+    "occupied Palestinian territory, including east Jerusalem": "West Bank and Gaza"
+}
+
+
+@shared_dataset
+@cached("data")
+@disk_cache(WORKFORCE_FILE, version=2)
+def load_workforce(fill_method=None):
+    """WHO health workforce density (four cadres) with country names in WDI spelling.
+
+    ``fill_method`` is one of the ``FILL_METHODS`` values in
+    ``dashboard.imputation``; each method is cached separately.
+    """
+    df = pd.read_csv(WORKFORCE_FILE)
+    df = df.rename(columns={"Countries, territories and areas": "Country Name", **WORKFORCE_CADRES})
+    df["Country Name"] = df["Country Name"].replace(WHO_TO_WDI_NAMES)
+    if fill_method is not None:
+        df = impute(df, "Country Name", "Year", list(WORKFORCE_CADRES.values()), fill_method)
+    return df
+
+
+@shared_dataset
+@cached("data")
+@disk_cache(WORKFORCE_FILE, HEALTH_EXP_FILE, LIFE_EXP_FILE, METADATA_FILE, version=2)
+def load_workforce_panel(fill_method=None):
+    """WHO workforce cadres joined with the WDI panel on a (Country Name, Year) index."""
+    workforce = load_workforce(fill_method).set_index(["Country Name", "Year"]).sort_index()
+    panel = load_wdi_panel().set_index(["Country Name", "Year"]).sort_index()
+    return workforce.join(panel[["Country Code", "Health Expenditure", "Life Expectancy"]], how="inner")
+
+
+WORKFORCE_EXPENDITURE_FILE = "data/workforce_expenditure.csv"
+
+
+@shared_dataset
+@cached("data")
+@disk_cache(WORKFORCE_EXPENDITURE_FILE, version=3)
+def load_workforce_expenditure(fill_method=None):
+    """ASEAN/Asia workforce density with health expenditure (% GDP), optionally gap-filled.
+
+    Runs of spaces in the column names are collapsed, e.g. the file's
+    "Pharmacists  (per 10 000 population)".
+    """
+    df = pd.read_csv(WORKFORCE_EXPENDITURE_FILE, index_col=0)
+    df = df.rename(columns=lambda name: " ".join(name.split()))
+    if fill_method is not None:
+        value_cols = [col for col in df.columns if col not in ("Country", "Year")]
+        df = impute(df, "Country", "Year", value_cols, fill_method)
+    return df
+
+
+# ASEAN Statistics workbooks used by the Education pages. Each sheet stacks
+# blocks of country rows (e.g. total, male, female) separated by a blank row
+# and a header row naming the next block.
+EDUCATION_FILES = {
+    "Adult literacy rate": "data/ASEAN adult literacy rate.xlsx",
+    "Life expectancy": "data/ASEAN average life expectancy.xlsx",
+    "Immunisation coverage": "data/ASEAN immunisation against measles and DPT.xlsx",
+    "Primary school enrolment rate": "data/ASEAN pri sch enrolment rate.xlsx"
+}
+
+
+def _clean_label(labels):
+    # Strip padding and footnote markers such as "Singapore1)" or "DPT2)"
+    return labels.astype(str).str.strip().str.replace(r"\d+\)$", "", regex=True)
+
+
+def _education_blocks(raw):
+    """Split one stacked workbook into (series, country, year, value) rows."""
+    labels = raw.iloc[:, 0]
+    values = raw.iloc[:, 1:].apply(pd.to_numeric, errors="coerce")
+    years = [int(float(col)) for col in raw.columns[1:]]
+
+    # A header row has a label and either no values or the years repeated
+    repeats_years = values.eq(years).all(axis=1)
+    is_header = labels.notna() & (values.isna().all(axis=1) | repeats_years)
+    first_series = "Total" if raw.columns[0] == "Country" else _clean_label(pd.Series([raw.columns[0]]))[0]
+    series = _clean_label(labels.where(is_header)).where(is_header).ffill().fillna(first_series)
+
+    rows = labels.notna() & ~is_header
+    wide = values[rows].set_axis(years, axis=1)
+    wide.insert(0, "Country", _clean_label(labels[rows]))
+    wide.insert(0, "Series", series[rows])
+    long = wide.melt(id_vars=["Series", "Country"], var_name="Year", value_name="Value")
+    return long.dropna(subset=["Value"])
+
+
+@shared_dataset
+@cached("data")
+@disk_cache(*EDUCATION_FILES.values())
+def load_education_cube():
+    """Tidy ASEAN education and health indicators.
+
+    One row per indicator, series (e.g. Total/Male/Female or Measles/DPT),
+    country and year. Workbooks that are missing are skipped (the cube is
+    empty if they all are).
+    """
+    frames = []
+    for indicator, path in EDUCATION_FILES.items():
+        if not os.path.exists(path):
+            continue
+        long = _education_blocks(pd.read_excel(path))
+        long.insert(0, "Indicator", indicator)
+        frames.append(long)
+    if not frames:
+        columns = ["Indicator", "Series", "Country", "Year", "Value"]
+        return pd.DataFrame(columns=columns).astype({"Year": int, "Value": float})
+    cube = pd.concat(frames, ignore_index=True)
+    cube["Year"] = cube["Year"].astype(int)
+    return cube
+
+
+def data_version(*paths):
+    """Short fingerprint of source files (size and modification time) for cache keys."""
+    digest = hashlib.sha1()
+    for path in paths:
+        stat = os.stat(path)
+        digest.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()[:12]
@@ -0,0 +1,335 @@
+"""Derived tables computed from the raw data and stored under ``data/derived``.
+
+Each artifact is a group of tables produced by one builder from a fixed set of
+source files, and ``data/derived/<artifact>.json`` records the content hash of
+those sources. :func:`load_derived` builds an artifact that is missing or whose
+sources have changed before serving it; one process builds while the others
+wait on the artifact's lock file. ``python -m dashboard.precompute`` builds
+them ahead of time instead. If a rebuild fails the last build is served, and
+:func:`show_status` tells the reader.
+"""
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: builds are only serialized within the process
+    fcntl = None
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from streamlit.logger import get_logger
+
+from dashboard.cache import cached
+from dashboard.data import (
+    HEALTH_EXP_FILE, LIFE_EXP_FILE, LIFE_METADATA_FILE, METADATA_FILE, _melt_wdi, load_life_expectancy, load_wdi_panel
+)
+from dashboard.disk_cache import source_hash
+from dashboard.model_selection import select_curve
+from dashboard.stats import fit, influence, prediction_interval, refit_without
+
+DERIVED_DIR = Path("data/derived")
+# Bump when a builder's output changes, so existing tables are reported stale
+FORMAT_VERSION = 2
+PRECOMPUTE_COMMAND = "python -m dashboard.precompute"
+
+OPTIMAL_SPEND_FILE = "data/merged_lifeBirth_spend.csv"
+# Years of history each country trend is fitted on, and years forecast past the data
+FORECAST_WINDOW = 10
+FORECAST_HORIZON = 5
+
+# Artifact name -> (builder, source files); builders return {table name: frame}
+ARTIFACTS = {}
+
+_LOGGER = get_logger(__name__)
+_build_lock = threading.Lock()
+# Artifact -> (source hash, format) its last rebuild failed on, so it isn't retried on every load
+_failed = {}
+
+
+class ArtifactMissing(FileNotFoundError):
+    pass
+
+
+def artifact(*sources):
+    """Register a builder under its function name."""
+    def register(build):
+        ARTIFACTS[build.__name__] = (build, sources)
+        return build
+    return register
+
+
+def manifest_file(name):
+    return DERIVED_DIR / f"{name}.json"
+
+
+def read_entry(name):
+    """The manifest entry written by the artifact's last build, or None."""
+    try:
+        return json.loads(manifest_file(name).read_text())
+    except FileNotFoundError:
+        return None
+
+
+def read_manifest():
+    """Manifest entries of every artifact that has been built."""
+    return {name: entry for name in ARTIFACTS if (entry := read_entry(name)) is not None}
+
+
+def _write_atomic(path, write):
+    # One manifest file per artifact, each replaced by a rename: concurrent
+    # builds in other processes never interleave their writes
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp)
+        os.chmod(tmp, 0o644)  # mkstemp creates it owner-only
+        os.replace(tmp, path)
+    except BaseException:
+        os.remove(tmp)
+        raise
+
+
+def status(name):
+    """``"fresh"``, ``"stale"`` (sources changed) or ``"missing"`` for one artifact."""
+    _, sources = ARTIFACTS[name]
+    entry = read_entry(name)
+    if entry is None or not all((DERIVED_DIR / f"{table}.parquet").exists() for table in entry["tables"]):
+        return "missing"
+    if entry["sources"] != source_hash(*sources) or entry["format"] != FORMAT_VERSION:
+        return "stale"
+    return "fresh"
+
+
+@contextmanager
+def _artifact_lock(name):
+    """Held while ``name`` is built, across threads and (through a lock file) processes."""
+    DERIVED_DIR.mkdir(parents=True, exist_ok=True)
+    with _build_lock, open(DERIVED_DIR / f".{name}.lock", "a") as handle:
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_EX)  # released when the file is closed
+        yield
+
+
+def build(name):
+    """Run one builder and write its tables plus the manifest entry."""
+    with _artifact_lock(name):
+        return _build(name)
+
+
+def ensure_built(name):
+    """Build the artifact if it is missing or stale; returns its status afterwards.
+
+    Whoever gets the lock first builds, and the rest find the artifact fresh.
+    A failed rebuild leaves the last build in place (``"stale"``) and is not
+    retried until the sources change; an artifact that was never built and
+    can't be for lack of source data raises :class:`ArtifactMissing`.
+    """
+    state = status(name)
+    if state == "fresh":
+        return state
+    attempt = (source_hash(*ARTIFACTS[name][1]), FORMAT_VERSION)
+    if state == "stale" and _failed.get(name) == attempt:
+        return state
+    with _artifact_lock(name):
+        state = status(name)
+        if state == "fresh":
+            return state
+        try:
+            _build(name)
+        except FileNotFoundError as error:
+            if state == "missing":
+                raise ArtifactMissing(f"the {name} tables can't be built: {error}") from error
+            _LOGGER.warning("Rebuild of %s failed, serving the last build: %s", name, error)
+            _failed[name] = attempt
+            return state
+        except Exception:
+            if state == "missing":
+                raise
+            _LOGGER.exception("Rebuild of %s failed, serving the last build", name)
+            _failed[name] = attempt
+            return state
+    _failed.pop(name, None)
+    return "fresh"
+
+
+def _build(name):
+    builder, sources = ARTIFACTS[name]
+    expected = source_hash(*sources)
+    start = time.perf_counter()
+    tables = builder()
+    DERIVED_DIR.mkdir(parents=True, exist_ok=True)
+    for table, df in tables.items():
+        _write_atomic(DERIVED_DIR / f"{table}.parquet", df.to_parquet)
+
+    entry = {
+        "sources": expected,
+        "source_files": list(sources),
+        "format": FORMAT_VERSION,
+        "built": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "build_seconds": round(time.perf_counter() - start, 2),
+        "tables": {table: len(df) for table, df in tables.items()}
+    }
+    _write_atomic(manifest_file(name), lambda path: Path(path).write_text(json.dumps(entry, indent=2)))
+    return entry
+
+
+@cached("derived")
+def _read_tables(tables, version):
+    return {table: pd.read_parquet(DERIVED_DIR / f"{table}.parquet") for table in tables}
+
+
+def load_derived(name):
+    """An artifact's tables, (re)built first if needed; see :func:`ensure_built`."""
+    ensure_built(name)
+    entry = read_entry(name)
+    # Keyed by build, so a rebuild (even from the same sources) is picked up
+    return _read_tables(tuple(entry["tables"]), (entry["sources"], entry["built"]))
+
+
+def show_status(name):
+    """On a page: build the artifact if needed, then stop if it can't be built or note that it is stale."""
+    state = status(name)
+    if state != "fresh":
+        label = name.replace('_', ' ')
+        with st.spinner(f"Computing the {label} tables (only needed once after the data changes)..."):
+            try:
+                state = ensure_built(name)
+            except ArtifactMissing as error:
+                st.error(f"The {label} tables could not be built: {error.__cause__}. "
+                         f"Check the data files, then run `{PRECOMPUTE_COMMAND}` from the repository root.")
+                st.stop()
+    if state == "stale":
+        st.warning(f"These results were computed on {read_entry(name)['built'][:10]} from data that has since "
+                   f"changed, and rebuilding them failed. Run `{PRECOMPUTE_COMMAND}` to see why.")
+
+
+@artifact(LIFE_EXP_FILE, LIFE_METADATA_FILE, HEALTH_EXP_FILE, METADATA_FILE)
+def wdi_group_averages():
+    """Region and income-group means of life expectancy and health expenditure per year."""
+    life = load_life_expectancy()
+
+    health = _melt_wdi(pd.read_csv(HEALTH_EXP_FILE, skiprows=4), "Health Expenditure")
+    health = health.merge(pd.read_csv(METADATA_FILE)[["Country Code", "IncomeGroup"]], on="Country Code", how="left")
+    health = health.dropna(subset=["Health Expenditure", "IncomeGroup"])
+    health["Year"] = health["Year"].astype(int)
+
+    return {
+        "region_life_expectancy":
+            life.dropna(subset=["Region"]).groupby(["Region", "Year"])["Life Expectancy"].mean().reset_index(),
+        "income_life_expectancy":
+            life.dropna(subset=["IncomeGroup"]).groupby(["Year", "IncomeGroup"])["Life Expectancy"].mean().reset_index(),
+        "income_health_expenditure":
+            health.groupby(["IncomeGroup", "Year"])["Health Expenditure"].mean().reset_index()
+    }
+
+
+@artifact(HEALTH_EXP_FILE, LIFE_EXP_FILE, METADATA_FILE)
+def country_regressions():
+    """Per-country OLS of life expectancy on health expenditure, with influence and refits.
+
+    Every country is its own group, so the rows for any selection of countries
+    are exactly what fitting that selection alone would give.
+    """
+    panel = load_wdi_panel()
+    coefs = fit(panel, "Health Expenditure", "Life Expectancy", by="Country Name")
+    observations = panel.join(influence(panel, "Health Expenditure", "Life Expectancy", by="Country Name", coefs=coefs))
+    refits = refit_without(observations, "Health Expenditure", "Life Expectancy", observations["influential"],
+                           by="Country Name")
+    return {"country_observations": observations, "country_fits": coefs, "country_refits": refits}
+
+
+@artifact(HEALTH_EXP_FILE, LIFE_EXP_FILE, METADATA_FILE)
+def income_group_statistics():
+    """Correlation over all years and log-log elasticity per year, for every income group."""
+    panel = load_wdi_panel().dropna(subset=["IncomeGroup"])
+    correlations = pd.DataFrame([
+        {"IncomeGroup": group, "Correlation": rows["Health Expenditure"].corr(rows["Life Expectancy"])}
+        for group, rows in panel.groupby("IncomeGroup", sort=False) if len(rows) > 2
+    ])
+
+    positive = panel[panel["Health Expenditure"] > 0]
+    logged = pd.DataFrame({
+        "IncomeGroup": positive["IncomeGroup"],
+        "Year": positive["Year"],
+        "Log Health Expenditure": np.log(positive["Health Expenditure"]),
+        "Log Life Expectancy": np.log(positive["Life Expectancy"])
+    })
+    # All group-year regressions come from a single grouped least-squares pass
+    coefs = fit(logged, "Log Health Expenditure", "Log Life Expectancy", by=["IncomeGroup", "Year"])
+    elasticities = coefs[["slope", "se_slope", "n", "r_squared"]].reset_index()
+    elasticities.columns = ["IncomeGroup", "Year", "Elasticity", "Standard Error", "Countries", "R-squared"]
+    elasticities["95% CI"] = 1.96 * elasticities["Standard Error"]
+    return {"income_group_correlations": correlations, "income_group_elasticities": elasticities}
+
+
+@artifact(OPTIMAL_SPEND_FILE)
+def optimal_spend():
+    """Cross-validated curve and bootstrap band for the optimal expenditure in every year."""
+    df = pd.read_csv(OPTIMAL_SPEND_FILE)
+    df = df[df["Gender"] == "Both sexes"]
+    summary, curves, scores = [], [], []
+    for year in sorted(df["Year"].unique()):
+        year_df = df[df["Year"] == year]
+        x = pd.to_numeric(year_df["Healthcare Expenditure"], errors="coerce")
+        y = pd.to_numeric(year_df["Life Expectancy at Birth"], errors="coerce")
+        valid = x.notna() & y.notna()
+        result = select_curve(x[valid].values, y[valid].values, k=5, n_boot=400)
+        band = result["band"] or (None, None)
+        # None (no interior optimum, or too few resamples with one for a band) is stored as NaN
+        summary.append({
+            "Year": year,
+            "Model": result["model"],
+            "Optimal Expenditure": result["optimal_x"],
+            "Optimal Life Expectancy": result["optimal_y"],
+            "Band Low": band[0],
+            "Band High": band[1]
+        })
+        curves.append(pd.DataFrame({"Year": year, "x": result["x_grid"], "y": result["y_grid"]}))
+        scores.append(result["scores"].assign(Year=year))
+    return {
+        "optimal_spend": pd.DataFrame(summary),
+        "optimal_spend_curves": pd.concat(curves, ignore_index=True),
+        "optimal_spend_scores": pd.concat(scores, ignore_index=True)
+    }
+
+
+@artifact(HEALTH_EXP_FILE, LIFE_EXP_FILE, METADATA_FILE)
+def country_forecasts():
+    """Linear-trend forecasts of health expenditure and life expectancy for every country.
+
+    Each series is fitted on its last ``FORECAST_WINDOW`` years of the panel and
+    extended ``FORECAST_HORIZON`` years past them with a 95% prediction
+    interval; series with fewer than three observations in the window are left out.
+    """
+    panel = load_wdi_panel()
+    last_year = int(panel["Year"].max())
+    history = panel[panel["Year"] > last_year - FORECAST_WINDOW].melt(
+        id_vars=["Country Name", "Year"], value_vars=["Health Expenditure", "Life Expectancy"],
+        var_name="Indicator", value_name="Value"
+    ).dropna(subset=["Value"])
+    coefs = fit(history, "Year", "Value", by=["Country Name", "Indicator"])
+    coefs = coefs[coefs["n"] >= 3]
+
+    years = np.arange(last_year + 1, last_year + FORECAST_HORIZON + 1)
+    rows = coefs.loc[coefs.index.repeat(len(years))]
+    year = np.tile(years, len(coefs))
+    forecast, low, high = prediction_interval(rows, year)
+    forecasts = pd.DataFrame({
+        "Country Name": rows.index.get_level_values("Country Name"),
+        "Indicator": rows.index.get_level_values("Indicator"),
+        "Year": year,
+        "Forecast": forecast.to_numpy(),
+        "Low": low.to_numpy(),
+        "High": high.to_numpy()
+    })
+    trends = coefs[["n", "slope", "se_slope", "r_squared"]].reset_index()
+    trends.columns = ["Country Name", "Indicator", "Years", "Trend per Year", "Standard Error", "R-squared"]
+    return {"country_forecasts": forecasts, "country_trends": trends}
@@ -0,0 +1,283 @@
+"""Immunization expenditure vs infectious disease cases: data, filters and results.
+
+One engine behind both ``pages/31_Disease Rates - Analysis Page.py`` and the
+standalone ``30_Impact of Healthcare Spending on Disease Rates.py``. The
+preprocessed tables are built once per source version (on disk, in shared
+memory when enabled, and in the process cache), and every filtered subset,
+summary and COVID-19 comparison is memoized by its filters in the
+``"disease"`` cache, so the two entry points and all their sessions reuse
+each other's results.
+"""
+import pandas as pd
+import streamlit as st
+
+from dashboard.cache import cached
+from dashboard.data import data_version
+from dashboard.disk_cache import disk_cache
+from dashboard.selection import year_range_slider
+from dashboard.shared_data import shared_dataset
+
+IMMUNIZATION_FILE = "data/Immunization_expenditure.csv"
+DISEASE_FILE = "data/Infectious_Disease.csv"
+
+ASEAN_COUNTRIES = ["Brunei Darussalam", "Cambodia", "Indonesia", "Lao People's Democratic Republic", "Malaysia",
+                   "Myanmar", "Philippines", "Singapore", "Thailand", "Viet Nam"]
+
+# Placeholder split of immunization spending into preventive and treatment shares
+PREVENTIVE_SHARE = 0.4
+TREATMENT_SHARE = 0.6
+
+PRE_COVID_YEAR = 2019
+COVID_YEARS = [2020, 2021]
+# Assumed economic cost of one disease case, in currency units
+ESTIMATED_COST_PER_CASE = 5000
+SCENARIO_INCREASES = [10, 25, 50]
+
+
+def version():
+    return data_version(IMMUNIZATION_FILE, DISEASE_FILE)
+
+
+@shared_dataset
+@cached("data")
+@disk_cache(IMMUNIZATION_FILE, DISEASE_FILE)
+def load_tables():
+    """Merged expenditure/cases table and the per-country-year spending table."""
+    df_immunization = pd.read_csv(IMMUNIZATION_FILE, encoding='ISO-8859-1')
+    df_disease = pd.read_csv(DISEASE_FILE)
+
+    df_immunization['VALUE'] = pd.to_numeric(df_immunization['VALUE'], errors='coerce')
+    df_immunization_vacc = df_immunization[df_immunization['INDCODE'] == 'FIN_GVT_VACC']
+    df_immunization_grouped = \
+        df_immunization_vacc.dropna(subset=['VALUE']).groupby(['COUNTRYNAME', 'YEAR'], as_index=False)['VALUE'].sum()
+    df_immunization_grouped = df_immunization_grouped.rename(columns={"VALUE": "IMMUNISATION_EXPENDITURE"})
+
+    df_disease.columns = df_disease.columns.str.strip().str.upper()
+    df_disease = df_disease.rename(
+        columns={"PERIOD": "YEAR", "LOCATION": "COUNTRYNAME", "FACTVALUENUMERIC": "DISEASE_CASES"}
+    )
+
+    df_merged = pd.merge(df_immunization_grouped, df_disease, on=["YEAR", "COUNTRYNAME"], how="inner")
+    df_merged = df_merged.dropna(subset=['DISEASE_CASES'])
+    df_merged['YEAR'] = pd.to_numeric(df_merged['YEAR'], errors='coerce')
+
+    df_spending = df_immunization_grouped.copy()
+    df_spending['PREVENTIVE_SPENDING'] = df_spending['IMMUNISATION_EXPENDITURE'] * PREVENTIVE_SHARE
+    df_spending['TREATMENT_SPENDING'] = df_spending['IMMUNISATION_EXPENDITURE'] * TREATMENT_SHARE
+    df_spending['TOTAL_SPENDING'] = df_spending['PREVENTIVE_SPENDING'] + df_spending['TREATMENT_SPENDING']
+    df_spending['PREVENTIVE_SPENDING_PERCENT'] = \
+        (df_spending['PREVENTIVE_SPENDING'] / df_spending['TOTAL_SPENDING']) * 100
+    df_spending['TREATMENT_SPENDING_PERCENT'] = \
+        (df_spending['TREATMENT_SPENDING'] / df_spending['TOTAL_SPENDING']) * 100
+    return df_merged.reset_index(drop=True), df_spending
+
+
+def _table(name):
+    df_merged, df_spending = load_tables()
+    return {"merged": df_merged, "spending": df_spending}[name]
+
+
+def asean_options():
+    """ASEAN countries that have merged data, in the usual order."""
+    present = set(load_tables()[0]['COUNTRYNAME'])
+    return [country for country in ASEAN_COUNTRIES if country in present]
+
+
+# --- Filters ---
+def create_filters(min_year, max_year, df, key_prefix, disease_filter=True, region_filter=False, top_n_filter=False):
+    filters = {}
+
+    filter_cols = st.columns(3)
+    with filter_cols[0]:
+        filters['year_range'] = year_range_slider(
+            "Year Range",
+            min_year,
+            max_year,
+            key=f"{key_prefix}_year_slider"
+        )
+
+    with filter_cols[1]:
+        if top_n_filter:
+            filters['top_n'] = st.slider("Show Top N Countries",
+                                         min_value=5, max_value=20, value=10,
+                                         key=f"{key_prefix}_top_n_slider")
+
+    with filter_cols[2]:
+        if disease_filter and 'SUBJECT' in df.columns:
+            disease_types = sorted(df['SUBJECT'].unique())
+            filters['disease'] = st.selectbox(
+                "Disease Type",
+                options=["All"] + disease_types,
+                key=f"{key_prefix}_disease_filter"
+            )
+        else:
+            filters['disease'] = "All"
+
+    if region_filter and 'REGION' in df.columns:
+        regions = sorted(df['REGION'].unique())
+        filters['regions'] = st.multiselect(
+            "Select Regions",
+            options=["All"] + regions,
+            default="All",
+            key=f"{key_prefix}_region_filter"
+        )
+    else:
+        filters['regions'] = ["All"]
+
+    return filters
+
+
+def create_metrics(col1, col2, col3, metric1, value1, metric2, value2, metric3, value3):
+    with col1:
+        st.metric(metric1, value1)
+    with col2:
+        st.metric(metric2, value2)
+    with col3:
+        st.metric(metric3, value3)
+
+
+def filter_data(df, filters, countries=None):
+    mask = df['YEAR'].between(*filters['year_range'])
+
+    # Filter by countries if provided
+    if countries:
+        mask &= df['COUNTRYNAME'].isin(list(countries))
+
+    # Filter by disease type if selected
+    if filters.get('disease', "All") != "All" and 'SUBJECT' in df.columns:
+        mask &= df['SUBJECT'] == filters['disease']
+
+    # Filter by region if selected
+    if list(filters.get('regions', ["All"])) != ["All"] and 'REGION' in df.columns:
+        mask &= df['REGION'].isin(list(filters['regions']))
+
+    return df[mask]
+
+
+def calculate_correlations(df, group_by='COUNTRYNAME'):
+    """Correlation of expenditure and cases within each group, most negative first."""
+    if df.empty:
+        return pd.DataFrame({'Country': pd.Series(dtype=object), 'Correlation': pd.Series(dtype=float)})
+    corr_df = df.groupby(group_by)[['IMMUNISATION_EXPENDITURE', 'DISEASE_CASES']].corr()
+    corr_df = corr_df.xs('IMMUNISATION_EXPENDITURE', level=1)['DISEASE_CASES'].reset_index()
+    corr_df.columns = ['Country', 'Correlation']
+    return corr_df.sort_values('Correlation')
+
+
+# --- Memoized results; filters are the dicts create_filters returns ---
+@cached("disease")
+def filtered(table, filters, countries=None):
+    """Rows of the ``"merged"`` or ``"spending"`` table matching the filters and countries."""
+    return filter_data(_table(table), filters, countries)
+
+
+@cached("disease")
+def chart_rows(filters, countries=None):
+    """Filtered merged rows, limited to the ``top_n`` countries by mean expenditure when the filters set it."""
+    rows = filtered("merged", filters, countries)
+    if filters.get('top_n') is None:
+        return rows
+    top_countries = rows.groupby('COUNTRYNAME')['IMMUNISATION_EXPENDITURE'].mean().nlargest(filters['top_n']).index
+    return rows[rows['COUNTRYNAME'].isin(top_countries)]
+
+
+@cached("disease")
+def expenditure_by_country(filters, countries=None):
+    summary = chart_rows(filters, countries).groupby('COUNTRYNAME')['IMMUNISATION_EXPENDITURE'].mean().reset_index()
+    return summary.sort_values('IMMUNISATION_EXPENDITURE', ascending=False)
+
+
+@cached("disease")
+def cases_by_year(filters, countries=None):
+    return chart_rows(filters, countries).groupby('YEAR')['DISEASE_CASES'].mean().reset_index()
+
+
+@cached("disease")
+def correlations(filters, countries=None):
+    return calculate_correlations(chart_rows(filters, countries))
+
+
+@cached("disease")
+def country_rows(filters, country):
+    """One country's merged and spending rows, by year."""
+    return (filtered("merged", filters, (country,)).sort_values('YEAR'),
+            filtered("spending", filters, (country,)).sort_values('YEAR'))
+
+
+@cached("disease")
+def country_metrics(filters, country):
+    df_country = country_rows(filters, country)[0]
+    return {
+        "avg_expenditure": df_country['IMMUNISATION_EXPENDITURE'].mean(),
+        "avg_cases": df_country['DISEASE_CASES'].mean(),
+        "correlation": df_country['IMMUNISATION_EXPENDITURE'].corr(df_country['DISEASE_CASES'])
+    }
+
+
+@cached("disease")
+def yearly_changes(filters, country):
+    """Year-on-year % change in expenditure and in cases for one country."""
+    df_country = country_rows(filters, country)[0]
+    return df_country.assign(
+        EXPENDITURE_PCT_CHANGE=df_country['IMMUNISATION_EXPENDITURE'].pct_change() * 100,
+        CASES_PCT_CHANGE=df_country['DISEASE_CASES'].pct_change() * 100
+    )
+
+
+@cached("disease")
+def covid_impact(filters, country):
+    """Pre-COVID (2019) vs during-COVID (2020-2021) comparison for one country, or None without both periods.
+
+    Projections and the effectiveness ratio are only defined when spending
+    rose and cases fell; otherwise they are None.
+    """
+    df_country = country_rows(filters, country)[0]
+    pre_covid = df_country[df_country['YEAR'] == PRE_COVID_YEAR]
+    during_covid = df_country[df_country['YEAR'].isin(COVID_YEARS)]
+    if pre_covid.empty or during_covid.empty:
+        return None
+
+    pre_exp = pre_covid['IMMUNISATION_EXPENDITURE'].mean()
+    pre_cases = pre_covid['DISEASE_CASES'].mean()
+    during_exp = during_covid['IMMUNISATION_EXPENDITURE'].mean()
+    during_cases = during_covid['DISEASE_CASES'].mean()
+    exp_change = ((during_exp - pre_exp) / pre_exp) * 100
+    cases_change = ((during_cases - pre_cases) / pre_cases) * 100
+
+    absolute_case_change = pre_cases - during_cases
+    absolute_exp_change = during_exp - pre_exp
+    # Cost-effectiveness is only meaningful when cases decreased
+    cost_per_case_reduction = absolute_exp_change / absolute_case_change if cases_change < 0 else 0
+    economic_benefit = absolute_case_change * ESTIMATED_COST_PER_CASE
+    roi = ((economic_benefit - absolute_exp_change) / absolute_exp_change) * 100 if absolute_exp_change > 0 else 0
+
+    effectiveness_ratio = scenarios = None
+    optimal_increase = 0
+    if cases_change < 0 and exp_change > 0:
+        # % reduction in cases per % increase in spending, applied linearly to higher spending levels
+        effectiveness_ratio = abs(cases_change) / exp_change
+        scenarios = {0: (during_exp, during_cases)}
+        best_roi = roi
+        for increase in SCENARIO_INCREASES:
+            investment = during_exp * (1 + increase / 100)
+            scenarios[increase] = (investment, max(0, during_cases * (1 - increase * effectiveness_ratio / 100)))
+            case_reduction = during_cases * (effectiveness_ratio * increase / 100)
+            scenario_roi = ((case_reduction * ESTIMATED_COST_PER_CASE - (investment - during_exp))
+                            / (investment - during_exp)) * 100
+            if scenario_roi > best_roi:
+                optimal_increase, best_roi = increase, scenario_roi
+
+    return {
+        "pre_exp": pre_exp,
+        "pre_cases": pre_cases,
+        "during_exp": during_exp,
+        "during_cases": during_cases,
+        "exp_change": exp_change,
+        "cases_change": cases_change,
+        "cost_per_case_reduction": cost_per_case_reduction,
+        "economic_benefit": economic_benefit,
+        "roi": roi,
+        "effectiveness_ratio": effectiveness_ratio,
+        "scenarios": scenarios,
+        "optimal_increase": optimal_increase
+    }
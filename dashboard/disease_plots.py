@@ -0,0 +1,366 @@
+"""Plotly figures for the immunization expenditure and disease analysis.
+
+Shared by ``pages/31_Disease Rates - Analysis Page.py`` and the standalone
+``30_Impact of Healthcare Spending on Disease Rates.py``; the data behind
+them comes from :mod:`dashboard.disease`.
+"""
+import plotly.express as px
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+
+def format_number(num):
+    """Format large numbers as thousands (K), millions (M) or billions (B) for readability."""
+    if num >= 1_000_000_000:
+        return f"{num/1_000_000_000:.2f}B"
+    elif num >= 1_000_000:
+        return f"{num/1_000_000:.2f}M"
+    elif num >= 1_000:
+        return f"{num/1_000:.2f}K"
+    else:
+        return f"{num:.2f}"
+
+
+def plot_interactive_bar(data, x, y, title, xlabel, ylabel):
+    """Create an interactive bar chart with plotly"""
+    fig = px.bar(
+        data,
+        x=x,
+        y=y,
+        title=title,
+        labels={x: xlabel, y: ylabel},
+        hover_data={x: True, y: ':.2f'}
+    )
+
+    # Customize hover template with formatted values
+    hovertemplate = f"<b>%{{x}}</b><br>{ylabel}: %{{customdata}}<extra></extra>"
+
+    # Create formatted values for hover text
+    customdata = [format_number(val) for val in data[y]]
+
+    # Update traces with custom hover template
+    fig.update_traces(
+        customdata=customdata,
+        hovertemplate=hovertemplate
+    )
+
+    fig.update_layout(
+        xaxis_title=xlabel,
+        yaxis_title=ylabel,
+        hoverlabel=dict(
+            bgcolor="black",
+            font_size=12,
+            font_family="Arial"
+        ),
+        hovermode="closest"
+    )
+
+    return fig
+
+
+def plot_interactive_line(data, x, y, title, xlabel, ylabel, color=None, line_group=None):
+    """Create an interactive line chart with plotly"""
+    fig = px.line(
+        data,
+        x=x,
+        y=y,
+        title=title,
+        color=color,
+        line_group=line_group,
+        labels={x: xlabel, y: ylabel},
+        hover_data={x: True, y: ':.2f'},
+        markers=True
+    )
+
+    fig.update_layout(
+        xaxis_title=xlabel,
+        yaxis_title=ylabel,
+        legend_title_text=color if color else "",
+        hoverlabel=dict(
+            bgcolor="black",
+            font_size=12,
+            font_family="Arial"
+        ),
+        hovermode="closest"
+    )
+
+    return fig
+
+
+def plot_scatter_with_regression(df, country=None):
+    """Create a scatter plot with regression line to visualize correlation"""
+    if country:
+        plot_df = df[df['COUNTRYNAME'] == country].copy()
+        title = f"Correlation Analysis for {country}"
+    else:
+        plot_df = df.copy()
+        title = "Global Correlation Analysis"
+
+    # Create the scatter plot with trend line
+    fig = px.scatter(
+        plot_df,
+        x='IMMUNISATION_EXPENDITURE',
+        y='DISEASE_CASES',
+        color='COUNTRYNAME' if not country else None,
+        trendline='ols',
+        title=title,
+        labels={
+            'IMMUNISATION_EXPENDITURE': 'Immunization Expenditure',
+            'DISEASE_CASES': 'Disease Cases'
+        }
+    )
+
+    # Update layout for better readability
+    fig.update_layout(
+        xaxis_title="Immunization Expenditure",
+        yaxis_title="Disease Cases",
+        hoverlabel=dict(
+            bgcolor="black",
+            font_size=12,
+            font_family="Arial"
+        ),
+        hovermode="closest"
+    )
+
+    # Add annotations for correlation coefficient
+    if country:
+        corr = plot_df['IMMUNISATION_EXPENDITURE'].corr(plot_df['DISEASE_CASES'])
+        fig.add_annotation(
+            x=0.05, y=0.95,
+            xref="paper", yref="paper",
+            text=f"Correlation: {corr:.3f}",
+            showarrow=False,
+            font=dict(size=14, color="black"),
+            bgcolor="rgba(255, 255, 255, 0.7)",
+            bordercolor="black",
+            borderwidth=1,
+            borderpad=4
+        )
+
+    return fig
+
+
+def plot_spending_split(df_spending):
+    """Grouped bar of average preventive vs treatment spending share per country"""
+    # Calculate average spending percentages
+    asean_spending_summary = df_spending.groupby('COUNTRYNAME')[
+        ['PREVENTIVE_SPENDING_PERCENT', 'TREATMENT_SPENDING_PERCENT']
+    ].mean().reset_index()
+
+    # Create interactive stacked bar chart
+    fig_spending = go.Figure()
+
+    fig_spending.add_trace(go.Bar(
+        x=asean_spending_summary['COUNTRYNAME'],
+        y=asean_spending_summary['PREVENTIVE_SPENDING_PERCENT'],
+        name='Preventive Spending %',
+        marker_color='green',
+        hovertemplate='%{y:.1f}%<extra>Preventive Spending</extra>'
+    ))
+
+    fig_spending.add_trace(go.Bar(
+        x=asean_spending_summary['COUNTRYNAME'],
+        y=asean_spending_summary['TREATMENT_SPENDING_PERCENT'],
+        name='Treatment Spending %',
+        marker_color='blue',
+        hovertemplate='%{y:.1f}%<extra>Treatment Spending</extra>'
+    ))
+
+    fig_spending.update_layout(
+        title='Preventive vs Treatment Spending Across ASEAN Countries',
+        xaxis_title='Country',
+        yaxis_title='Spending Percentage',
+        barmode='group',
+        hovermode='closest'
+    )
+
+    return fig_spending
+
+
+def plot_spending_trend(df_spending):
+    """Stacked area of average preventive and treatment spending over time"""
+    # Create stacked area chart for spending trends over time
+    # First, calculate yearly averages across all selected countries
+    yearly_spending = df_spending.groupby('YEAR')[
+        ['PREVENTIVE_SPENDING', 'TREATMENT_SPENDING', 'TOTAL_SPENDING']
+    ].mean().reset_index()
+
+    # Create the stacked area chart
+    fig_area = go.Figure()
+
+    fig_area.add_trace(go.Scatter(
+        x=yearly_spending['YEAR'],
+        y=yearly_spending['PREVENTIVE_SPENDING'],
+        name='Preventive Spending',
+        mode='lines',
+        line=dict(width=0.5, color='green'),
+        stackgroup='one',
+        hovertemplate='Year: %{x}<br>Preventive: %{y:.2f}<extra></extra>'
+    ))
+
+    fig_area.add_trace(go.Scatter(
+        x=yearly_spending['YEAR'],
+        y=yearly_spending['TREATMENT_SPENDING'],
+        name='Treatment Spending',
+        mode='lines',
+        line=dict(width=0.5, color='blue'),
+        stackgroup='one',
+        hovertemplate='Year: %{x}<br>Treatment: %{y:.2f}<extra></extra>'
+    ))
+
+    fig_area.update_layout(
+        title='ASEAN Spending Trends Over Time (Average across selected countries)',
+        xaxis_title='Year',
+        yaxis_title='Average Spending',
+        hovermode='closest',
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+
+    return fig_area
+
+
+def plot_country_trend(df_country, df_country_spending, country):
+    """Expenditure vs cases (top) and spending split (bottom) for one country"""
+    # Interactive dual-axis chart
+    fig_country = make_subplots(
+        rows=2, cols=1,
+        subplot_titles=(
+            f'{country}: Immunisation Expenditure vs Disease Cases',
+            f'{country}: Preventive vs Treatment Spending Over Years'
+        ),
+        specs=[[{"secondary_y": True}], [{"secondary_y": False}]],
+        vertical_spacing=0.12
+    )
+
+    # Top chart - Expenditure and cases
+    fig_country.add_trace(
+        go.Scatter(
+            x=df_country['YEAR'],
+            y=df_country['IMMUNISATION_EXPENDITURE'],
+            name='Immunisation Expenditure',
+            line=dict(color='blue', width=3),
+            mode='lines+markers',
+            hovertemplate='Year: %{x}<br>Expenditure: %{y:.2f}<extra></extra>'
+        ),
+        row=1, col=1
+    )
+
+    fig_country.add_trace(
+        go.Scatter(
+            x=df_country['YEAR'],
+            y=df_country['DISEASE_CASES'],
+            name='Disease Cases',
+            line=dict(color='red', width=3),
+            mode='lines+markers',
+            hovertemplate='Year: %{x}<br>Cases: %{y:.2f}<extra></extra>'
+        ),
+        row=1, col=1, secondary_y=True
+    )
+
+    # Bottom chart - Spending percentages
+    if len(df_country_spending) > 0:
+        fig_country.add_trace(
+            go.Bar(
+                x=df_country_spending['YEAR'],
+                y=df_country_spending['PREVENTIVE_SPENDING_PERCENT'],
+                name='Preventive Spending %',
+                marker_color='green',
+                hovertemplate='Year: %{x}<br>Preventive: %{y:.1f}%<extra></extra>'
+            ),
+            row=2, col=1
+        )
+
+        fig_country.add_trace(
+            go.Bar(
+                x=df_country_spending['YEAR'],
+                y=df_country_spending['TREATMENT_SPENDING_PERCENT'],
+                name='Treatment Spending %',
+                marker_color='blue',
+                hovertemplate='Year: %{x}<br>Treatment: %{y:.1f}%<extra></extra>'
+            ),
+            row=2, col=1
+        )
+
+        fig_country.update_layout(barmode='group')
+
+    # Update layout and axes
+    fig_country.update_layout(
+        height=800,
+        hovermode='closest',
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1
+        )
+    )
+
+    # Update axes labels
+    fig_country.update_xaxes(title_text="Year", row=1, col=1)
+    fig_country.update_xaxes(title_text="Year", row=2, col=1)
+    fig_country.update_yaxes(title_text="Immunisation Expenditure", row=1, col=1)
+    fig_country.update_yaxes(title_text="Disease Cases", secondary_y=True, row=1, col=1)
+    fig_country.update_yaxes(title_text="Spending Percentage", row=2, col=1)
+
+    return fig_country
+
+
+def plot_yearly_change(df_yearly_change, country):
+    """Side-by-side yearly % change in expenditure and in disease cases"""
+    # Create the yearly change chart
+    fig_yearly_change = make_subplots(
+        rows=1, cols=2,
+        subplot_titles=(
+            f'Yearly % Change in Expenditure',
+            f'Yearly % Change in Disease Cases'
+        ),
+        specs=[[{"type": "bar"}, {"type": "bar"}]],
+        horizontal_spacing=0.1
+    )
+
+    # Expenditure changes
+    fig_yearly_change.add_trace(
+        go.Bar(
+            x=df_yearly_change['YEAR'][1:],  # Skip first year as it has no change
+            y=df_yearly_change['EXPENDITURE_PCT_CHANGE'][1:],
+            name='% Change in Expenditure',
+            marker_color=['green' if x >= 0 else 'red' for x in
+                          df_yearly_change['EXPENDITURE_PCT_CHANGE'][1:]],
+            hovertemplate='Year: %{x}<br>Change: %{y:.1f}%<extra></extra>'
+        ),
+        row=1, col=1
+    )
+
+    # Disease case changes
+    fig_yearly_change.add_trace(
+        go.Bar(
+            x=df_yearly_change['YEAR'][1:],  # Skip first year as it has no change
+            y=df_yearly_change['CASES_PCT_CHANGE'][1:],
+            name='% Change in Cases',
+            marker_color=['red' if x >= 0 else 'green' for x in
+                          df_yearly_change['CASES_PCT_CHANGE'][1:]],
+            hovertemplate='Year: %{x}<br>Change: %{y:.1f}%<extra></extra>'
+        ),
+        row=1, col=2
+    )
+
+    # Update layout
+    fig_yearly_change.update_layout(
+        height=500,
+        title_text=f"Yearly Percentage Changes for {country} (2019-2021)",
+        showlegend=True,
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1
+        )
+    )
+
+    # Update axes
+    fig_yearly_change.update_yaxes(title_text="% Change", row=1, col=1)
+    fig_yearly_change.update_yaxes(title_text="% Change", row=1, col=2)
+
+    return fig_yearly_change
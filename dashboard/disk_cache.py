@@ -0,0 +1,171 @@
+"""Persistent cache for the data loaders, shared by every process on the host.
+
+Results are pickled to ``DISK_CACHE_DIR`` (``$DASHBOARD_CACHE_DIR``, default
+``.cache/dashboard``) under a key made of the function's file, name and source
+code, an explicit ``version``, the Python, pandas and NumPy versions, the
+content hash of its source files and its arguments, so replicas and restarts reuse one parse of the raw data. Entries
+are written to a temporary file and renamed into place, so readers never see a
+partial file; the oldest entries are evicted once the directory exceeds
+``DISK_CACHE_MAX_BYTES``. Stack it under ``@cached``, which keeps the
+per-process in-memory copy.
+"""
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import platform
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from streamlit.logger import get_logger
+
+DISK_CACHE_DIR = Path(os.environ.get("DASHBOARD_CACHE_DIR", ".cache/dashboard"))
+DISK_CACHE_MAX_BYTES = int(float(os.environ.get("DASHBOARD_CACHE_MAX_MB", 512)) * 1024 ** 2)
+
+# Pickled frames are only readable by compatible library versions
+RUNTIME_VERSIONS = (platform.python_version(), pd.__version__, np.__version__)
+
+_LOGGER = get_logger(__name__)
+
+
+def _fingerprint(paths):
+    stats = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            stats.append((str(path), stat.st_size, stat.st_mtime_ns))
+        except FileNotFoundError:
+            stats.append((str(path), None, None))
+    return tuple(stats)
+
+
+@functools.lru_cache(maxsize=128)
+def _content_hash(paths, fingerprint):
+    digest = hashlib.sha1()
+    for path, (_, size, _) in zip(paths, fingerprint):
+        digest.update(str(path).encode())
+        digest.update(Path(path).read_bytes() if size is not None else b"<missing>")
+    return digest.hexdigest()[:16]
+
+
+def source_hash(*paths):
+    """Hash of the files' contents (missing files included); only re-read when their size or mtime changes."""
+    return _content_hash(paths, _fingerprint(paths))
+
+
+def _entries():
+    try:
+        return [entry for entry in os.scandir(DISK_CACHE_DIR) if entry.name.endswith(".pkl")]
+    except FileNotFoundError:
+        return []
+
+
+def _evict(max_bytes):
+    """Delete least recently used entries (by mtime, bumped on every hit) until under ``max_bytes``."""
+    entries = []
+    for entry in _entries():
+        try:
+            stat = entry.stat()
+        except FileNotFoundError:  # evicted by another process
+            continue
+        entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+
+
+def cache_usage():
+    """Number of entries and bytes currently on disk."""
+    sizes = []
+    for entry in _entries():
+        try:
+            sizes.append(entry.stat().st_size)
+        except FileNotFoundError:
+            continue
+    return len(sizes), sum(sizes)
+
+
+def clear():
+    for entry in _entries():
+        try:
+            os.remove(entry.path)
+        except FileNotFoundError:
+            pass
+
+
+def _source_files(sources, args, kwargs):
+    # Arguments naming existing files (e.g. a dataset path) are sources too
+    paths = list(sources)
+    for value in [*args, *kwargs.values()]:
+        if isinstance(value, (str, Path)) and os.path.isfile(value):
+            paths.append(str(value))
+    return tuple(paths)
+
+
+def disk_cache(*sources, version=1):
+    """Persist a function's results on disk, keyed by ``sources`` contents, code, ``version`` and arguments.
+
+    Bump ``version`` when something the function calls changes its output;
+    edits to the function itself already change the key.
+    """
+    def decorator(func):
+        try:
+            code = inspect.getsource(func).encode()
+        except OSError:  # defined in code without a source file
+            code = func.__code__.co_code
+        code_hash = hashlib.sha1(code).hexdigest()
+        name = f"{Path(func.__code__.co_filename).stem}.{func.__qualname__}"
+
+        def cache_key(*args, **kwargs):
+            digest = hashlib.sha1(repr((
+                name, code_hash, version, RUNTIME_VERSIONS, source_hash(*_source_files(sources, args, kwargs)), args,
+                sorted(kwargs.items())
+            )).encode())
+            return f"{func.__name__}-{digest.hexdigest()[:20]}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            path = DISK_CACHE_DIR / f"{cache_key(*args, **kwargs)}.pkl"
+            try:
+                with open(path, "rb") as file:
+                    result = pickle.load(file)
+                os.utime(path)
+                return result
+            except FileNotFoundError:
+                pass
+            except Exception as error:
+                # Truncated, corrupt or written by incompatible libraries: drop it and recompute
+                _LOGGER.warning("Discarding unreadable cache entry %s: %s", path.name, error)
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+            result = func(*args, **kwargs)
+            try:
+                DISK_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                fd, tmp = tempfile.mkstemp(dir=DISK_CACHE_DIR, prefix=f".{path.name}.", suffix=".tmp")
+                try:
+                    with os.fdopen(fd, "wb") as file:
+                        pickle.dump(result, file, protocol=pickle.HIGHEST_PROTOCOL)
+                    os.chmod(tmp, 0o644)  # mkstemp creates it owner-only
+                    os.replace(tmp, path)
+                except BaseException:
+                    os.remove(tmp)
+                    raise
+                _evict(DISK_CACHE_MAX_BYTES)
+            except (OSError, pickle.PicklingError, TypeError) as error:
+                _LOGGER.warning("Could not write cache entry %s: %s", path.name, error)
+            return result
+        wrapper.cache_key = cache_key
+        return wrapper
+    return decorator
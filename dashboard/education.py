@@ -0,0 +1,32 @@
+import streamlit as st
+
+from dashboard.data import EDUCATION_FILES, data_version, load_education_cube
+from dashboard.figures import cached_figure
+from dashboard.plotting import small_multiples
+
+
+def indicator_data(indicator):
+    """Rows of one indicator from the education cube, or None (with an error) if its workbook is missing."""
+    cube = load_education_cube()
+    data = cube[cube["Indicator"] == indicator]
+    if data.empty:
+        st.error(f"Error: '{EDUCATION_FILES[indicator].split('/')[-1]}' not found. Did you upload it?")
+        return None
+    return data
+
+
+def education_figure(indicator, series, value_label, y_range=None, title=None):
+    """Small multiples (one panel per country) of one indicator series, memoized."""
+    def build():
+        cube = load_education_cube()
+        data = cube[(cube["Indicator"] == indicator) & (cube["Series"] == series)]
+        return small_multiples(
+            data, x="Year", y="Value", facet="Country", y_range=y_range, title=title,
+            labels={"Value": value_label}
+        )
+
+    return cached_figure(
+        "education_small_multiples", build,
+        version=data_version(EDUCATION_FILES[indicator]),
+        indicator=indicator, series=series, y_range=y_range, title=title
+    )
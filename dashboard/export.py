@@ -0,0 +1,77 @@
+import gzip
+import io
+
+import streamlit as st
+
+from dashboard.cache import MANAGER, normalize_widget_value
+
+# Label -> (file extension, MIME type)
+EXPORT_FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "CSV (gzip)": ("csv.gz", "application/gzip"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+    "Excel": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
+}
+
+MAX_CACHED_EXPORTS = 32
+# Exports are large and mostly downloaded once, so they are not kept past an hour
+EXPORT_TTL_SECONDS = 3600
+
+
+def to_bytes(df, fmt):
+    """Serialize a frame in one of the ``EXPORT_FORMATS``."""
+    if fmt == "CSV":
+        return df.to_csv(index=False).encode()
+    if fmt == "CSV (gzip)":
+        return gzip.compress(df.to_csv(index=False).encode())
+    buffer = io.BytesIO()
+    if fmt == "Parquet":
+        df.to_parquet(buffer, index=False)
+    elif fmt == "Excel":
+        df.to_excel(buffer, index=False)
+    else:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    return buffer.getvalue()
+
+
+def export_cache():
+    """Process-wide LRU of exported files, shared by every session."""
+    return MANAGER.cache("exports", max_entries=MAX_CACHED_EXPORTS, ttl=EXPORT_TTL_SECONDS)
+
+
+def export_bytes(df, name, fmt, version, **filters):
+    """File contents for ``df``, cached by export ``name``, format, dataset version and filter state.
+
+    ``name`` tells apart exports of different frames with the same filters
+    (e.g. the global and ASEAN views of one dataset).
+    """
+    key = (name, fmt, version, normalize_widget_value(filters))
+    cache = export_cache()
+    data = cache.get(key)
+    if data is None:
+        data = to_bytes(df, fmt)
+        cache.put(key, data)
+    return data
+
+
+@st.fragment
+def download_data(df, file_stem, version, key, label="Download data", **filters):
+    """Format picker and download button; the file is only built when clicked.
+
+    ``filters`` must describe how ``df`` was derived from the dataset, since
+    they (with ``file_stem`` and ``version``) are the cache key for the
+    exported bytes.
+    """
+    format_col, button_col = st.columns([1, 2], vertical_alignment="bottom")
+    with format_col:
+        fmt = st.selectbox("Format", list(EXPORT_FORMATS), key=f"{key}_format")
+    extension, mime = EXPORT_FORMATS[fmt]
+    with button_col:
+        st.download_button(
+            label=f"{label} ({len(df):,} rows)",
+            data=lambda: export_bytes(df, file_stem, fmt, version, **filters),
+            file_name=f"{file_stem}.{extension}",
+            mime=mime,
+            key=key,
+            on_click="ignore"
+        )
@@ -0,0 +1,28 @@
+import plotly.io as pio
+
+from dashboard.cache import MANAGER, normalize_widget_value
+
+MAX_CACHED_FIGURES = 256
+
+
+def figure_cache():
+    """Process-wide LRU of built figures as Plotly JSON, shared by every session."""
+    return MANAGER.cache("figures", max_entries=MAX_CACHED_FIGURES)
+
+
+def cached_figure(name, build, version, **widgets):
+    """Return the figure ``build()`` makes for these widget values, building it only once.
+
+    Figures are keyed by chart name, dataset ``version`` and the normalized
+    widget values, so returning to an earlier selection skips the build. The
+    cache holds the serialized figure and every call returns a new Figure
+    parsed from it, so a caller can change its copy without affecting other
+    sessions.
+    """
+    key = (name, version, normalize_widget_value(widgets))
+    cache = figure_cache()
+    spec = cache.get(key)
+    if spec is None:
+        spec = build().to_json()
+        cache.put(key, spec, size=len(spec))
+    return pio.from_json(spec)
@@ -0,0 +1,80 @@
+"""Run a page script headless, and read the elements a headless run produced.
+
+Streamlit has no public API for either. ``AppTest`` cannot be used inside a
+running server because it replaces the global runtime while it runs, so this
+module drives the script runner ``AppTest`` is built on directly; the static
+export reads ``AppTest``'s element tree and the message fields behind it.
+Those internals are kept here in one place and checked against
+:data:`STREAMLIT_VERSION`, the release pinned in ``requirements.txt``: another
+release that moves them fails with a clear error instead of somewhere in a
+page run.
+"""
+import streamlit
+
+try:
+    from streamlit.runtime.pages_manager import PagesManager
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    from streamlit.runtime.state.common import user_key_from_element_id
+    from streamlit.runtime.state.safe_session_state import SafeSessionState
+    from streamlit.runtime.state.session_state import SessionState
+    from streamlit.testing.v1.local_script_runner import LocalScriptRunner
+except ImportError as error:
+    LocalScriptRunner = None
+    _IMPORT_ERROR = error
+
+# Release the internals below are written against; requirements.txt pins it
+STREAMLIT_VERSION = "1.66"
+RUN_TIMEOUT = 300
+
+
+class HeadlessUnavailable(RuntimeError):
+    pass
+
+
+def unsupported(reason):
+    """The error for internals this Streamlit release doesn't have."""
+    return HeadlessUnavailable(
+        f"Streamlit {streamlit.__version__} does not provide {reason}; "
+        f"headless runs need Streamlit {STREAMLIT_VERSION}.x as pinned in requirements.txt"
+    )
+
+
+def _require():
+    if LocalScriptRunner is None:
+        raise unsupported(f"the script runner used for headless runs ({_IMPORT_ERROR})")
+
+
+def run_script(path, session_state=None, timeout=RUN_TIMEOUT):
+    """Run ``path`` once in a new session whose state starts as ``session_state``.
+
+    Returns the messages' element tree (``tree.exception`` lists uncaught errors).
+    """
+    _require()
+    state = SafeSessionState(SessionState(), lambda: None)
+    for key, value in (session_state or {}).items():
+        state[key] = value
+    pages_manager = PagesManager(str(path), ScriptCache(), setup_watcher=False)
+    return LocalScriptRunner(str(path), state, pages_manager).run(timeout=timeout)
+
+
+def element_tree(app):
+    """Root of an ``AppTest`` run's elements; child 0 is the main area, child 1 the sidebar."""
+    _require()
+    try:
+        return app._tree
+    except AttributeError:
+        raise unsupported("AppTest's element tree") from None
+
+
+def tab_container_id(node):
+    """Element ID of a tab container, the same across runs of a page."""
+    try:
+        return node.proto.tab_container.id
+    except AttributeError:
+        raise unsupported("tab container IDs") from None
+
+
+def tab_key(node):
+    """The ``key`` a page gave a tab container, under which session state holds the open tab; None if unkeyed."""
+    _require()
+    return user_key_from_element_id(tab_container_id(node))
@@ -0,0 +1,93 @@
+"""Import-time report for the dashboard pages.
+
+Each page's top-level imports are replayed in a fresh interpreter under
+``python -X importtime``, after the baseline module (Streamlit, which the
+server has always loaded before a page runs). Imports inside functions are
+not replayed: they are only paid on the code paths that use them.
+
+    python -m dashboard.importtime                  # every page
+    python -m dashboard.importtime pages/3_*.py --top 10
+"""
+import argparse
+import ast
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+BASELINE = "streamlit"
+_MARKER = "--- page imports ---"
+
+
+def page_files():
+    return [ROOT / "streamlit_app.py", ROOT / "home.py", *sorted(ROOT.glob("[0-9]*.py")), *sorted((ROOT / "pages").glob("*.py"))]
+
+
+def top_level_imports(path):
+    """Source of the import statements that run when ``path`` is executed."""
+    tree = ast.parse(Path(path).read_text(encoding="utf-8"))
+    return [ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+
+
+def _parse(stderr):
+    """Top-level modules and their cumulative import time (ms) from ``-X importtime`` output."""
+    modules = []
+    seen_marker = False
+    for line in stderr.splitlines():
+        if line == _MARKER:
+            seen_marker = True
+            continue
+        if not seen_marker or not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|", 2)
+        if cumulative.strip().isdigit() and not name[1:].startswith(" "):
+            modules.append((name.strip(), int(cumulative) / 1000))
+    return modules
+
+
+def measure(path, baseline=BASELINE):
+    """Import cost of one page on top of ``baseline``: (total ms, [(module, ms)] slowest first)."""
+    code = "\n".join([
+        f"import sys{', ' + baseline if baseline else ''}",
+        f"sys.stderr.write({_MARKER!r} + '\\n')",
+        *top_level_imports(path)
+    ])
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [str(ROOT), os.environ.get("PYTHONPATH")]))}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    modules = sorted(_parse(result.stderr), key=lambda item: item[1], reverse=True)
+    return sum(ms for _, ms in modules), modules
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("pages", nargs="*", type=Path, help="page scripts (default: all)")
+    parser.add_argument("--top", type=int, default=5, help="slowest modules to list per page")
+    parser.add_argument("--baseline", default=BASELINE, help="module loaded before timing (empty for none)")
+    args = parser.parse_args(argv)
+
+    rows = []
+    for path in args.pages or page_files():
+        name = Path(path).resolve().relative_to(ROOT)
+        try:
+            total, modules = measure(path, args.baseline)
+        except RuntimeError as error:
+            print(f"{name}: failed ({error})")
+            continue
+        rows.append((total, name))
+        print(f"{name}: {total:,.0f} ms")
+        for module, ms in modules[:args.top]:
+            print(f"    {module:<40} {ms:>8,.0f} ms")
+
+    if len(rows) > 1:
+        print(f"\nSlowest: {max(rows)[1]} ({max(rows)[0]:,.0f} ms); "
+              f"total across {len(rows)} pages: {sum(total for total, _ in rows):,.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
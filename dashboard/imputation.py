@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+
+# Gap-filling methods, applied to a whole country x year matrix at once
+FILL_METHODS = {
+    "None (observed only)": None,
+    "Linear interpolation": "linear",
+    "Carry forward": "carry_forward",
+    "Model-based (country trend)": "model"
+}
+
+# Years the model-based fill may extend a country's trend past its first and last observation
+MODEL_HORIZON_YEARS = 2
+
+
+def to_matrix(df, id_col, year_col, value_col):
+    """Pivot one series to a country x year matrix covering every country and year in the data."""
+    wide = df.pivot_table(index=id_col, columns=year_col, values=value_col, aggfunc="mean")
+    ids = sorted(df[id_col].unique())
+    years = range(int(df[year_col].min()), int(df[year_col].max()) + 1)
+    return wide.reindex(index=ids, columns=years)
+
+
+def _linear(wide):
+    # Interpolate between observed years only; no extrapolation past the ends
+    return wide.interpolate(axis=1, limit_area="inside")
+
+
+def _carry_forward(wide):
+    return wide.ffill(axis=1)
+
+
+def _model(wide):
+    """Fill with each country's own least-squares linear trend over the years.
+
+    Only countries with at least two observations are filled, and only from
+    ``MODEL_HORIZON_YEARS`` before their first observation to that many after
+    their last.
+    """
+    values = wide.to_numpy(dtype=float)
+    observed = ~np.isnan(values)
+    t = np.asarray(wide.columns, dtype=float)
+    t = t - t.mean()
+
+    y = np.where(observed, values, 0.0)
+    n = observed.sum(axis=1)
+    sx = (observed * t).sum(axis=1)
+    sy = y.sum(axis=1)
+    sxx = (observed * t ** 2).sum(axis=1)
+    sxy = (y * t).sum(axis=1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = (sxy - sx * sy / n) / (sxx - sx ** 2 / n)
+        intercept = (sy - slope * sx) / n
+    trend = (intercept[:, None] + slope[:, None] * t[None, :]).clip(min=0)
+
+    columns = np.arange(values.shape[1])
+    first = observed.argmax(axis=1)
+    last = values.shape[1] - 1 - observed[:, ::-1].argmax(axis=1)
+    in_range = ((columns[None, :] >= (first - MODEL_HORIZON_YEARS)[:, None])
+                & (columns[None, :] <= (last + MODEL_HORIZON_YEARS)[:, None])
+                & (n >= 2)[:, None])
+    filled = np.where(observed, values, np.where(in_range, trend, np.nan))
+    return pd.DataFrame(filled, index=wide.index, columns=wide.columns)
+
+
+_FILLERS = {
+    "linear": _linear,
+    "carry_forward": _carry_forward,
+    "model": _model
+}
+
+
+def impute(df, id_col, year_col, value_cols, method):
+    """Gap-fill ``value_cols`` over the full country x year grid.
+
+    Returns a long frame with one row per country and year that has at least
+    one value, plus a boolean ``"<column> imputed"`` mask per value column.
+    ``method=None`` returns the observed values on the same layout.
+    """
+    filled_columns = {}
+    for col in value_cols:
+        wide = to_matrix(df, id_col, year_col, col)
+        filled = wide if method is None else _FILLERS[method](wide)
+        filled_columns[col] = filled.to_numpy(dtype=float).ravel()
+        filled_columns[f"{col} imputed"] = (wide.isna() & filled.notna()).to_numpy().ravel()
+
+    index = pd.MultiIndex.from_product([wide.index, wide.columns], names=[id_col, year_col])
+    result = pd.DataFrame(filled_columns, index=index)
+    return result.dropna(subset=list(value_cols), how="all").reset_index()
@@ -0,0 +1,150 @@
+import numpy as np
+import pandas as pd
+
+# Candidate curves for the optimal-spend fit: (label, kind, parameter)
+CANDIDATES = [
+    ("Polynomial (degree 1)", "poly", 1),
+    ("Polynomial (degree 2)", "poly", 2),
+    ("Polynomial (degree 3)", "poly", 3),
+    ("Smoothing spline (λ = 0.01)", "spline", 0.01),
+    ("Smoothing spline (λ = 0.1)", "spline", 0.1),
+    ("Smoothing spline (λ = 1)", "spline", 1.0),
+    ("Smoothing spline (λ = 10)", "spline", 10.0)
+]
+
+GRID_POINTS = 100
+# Fewer interior resamples can't put the 2.5th and 97.5th percentiles between distinct values
+MIN_BAND_RESAMPLES = 40
+
+
+def fit_curve(kind, param, x, y):
+    """Fit one candidate curve; returns a callable, or None if it cannot be fitted."""
+    # Repeated x values (from bootstrap resampling) are collapsed into weighted means
+    x_unique, inverse, counts = np.unique(x, return_inverse=True, return_counts=True)
+    y_mean = np.bincount(inverse, weights=y) / counts
+
+    if kind == "poly":
+        if len(x_unique) <= param:
+            return None
+        return np.poly1d(np.polyfit(x, y, param))
+    if kind == "spline":
+        if len(x_unique) < 5:
+            return None
+        from scipy.interpolate import make_smoothing_spline
+
+        return make_smoothing_spline(x_unique, y_mean, w=counts.astype(float), lam=param)
+    raise ValueError(f"Unknown curve type: {kind}")
+
+
+def interior_argmax(values):
+    """Index of the maximum, or None when it lies at either end (the curve peaks outside the data)."""
+    best = int(np.argmax(values))
+    return best if 0 < best < len(values) - 1 else None
+
+
+def _poly_fits(x, y, weights, degree, points):
+    """Weighted least-squares polynomials for every row of ``weights``, evaluated at ``points``.
+
+    All fits come from one stacked solve: a row of weights is a training fold
+    (0/1) or a bootstrap resample (how often each point was drawn). Returns a
+    ``(len(weights), len(points))`` array, NaN for rows with too few distinct
+    x values to fit the degree.
+    """
+    root = np.sqrt(weights)[:, :, None]
+    coefs = np.linalg.pinv(np.vander(x, degree + 1) * root) @ (y[:, None] * root)
+    values = (np.vander(points, degree + 1) @ coefs)[..., 0]
+    distinct = np.array([len(np.unique(x[row > 0])) for row in weights])
+    values[distinct <= degree] = np.nan
+    return values
+
+
+def _fold_errors(x, y, folds):
+    """Squared prediction error of every candidate (columns) on every held-out fold (rows)."""
+    train = np.zeros((len(folds), len(x)))
+    for i, (rows, _) in enumerate(folds):
+        train[i, rows] = 1
+    errors = np.full((len(folds), len(CANDIDATES)), np.nan)
+    for j, (_, kind, param) in enumerate(CANDIDATES):
+        if kind == "poly":
+            # The folds partition the data, so each point is held out exactly once
+            predicted = _poly_fits(x, y, train, param, x)
+            errors[:, j] = np.sum((y - predicted) ** 2 * (1 - train), axis=1)
+            continue
+        for i, (rows, test) in enumerate(folds):
+            curve = fit_curve(kind, param, x[rows], y[rows])
+            if curve is not None:
+                errors[i, j] = np.sum((y[test] - curve(x[test])) ** 2)
+    return errors
+
+
+def _bootstrap_optima(x, y, grid, seed, n_resamples, kind, param):
+    """Arg-max of one candidate curve on ``n_resamples`` bootstrap resamples (NaN if not interior)."""
+    draws = np.random.default_rng(seed).integers(0, len(x), (n_resamples, len(x)))
+    if kind == "poly":
+        counts = np.stack([np.bincount(idx, minlength=len(x)) for idx in draws]).astype(float)
+        curves = _poly_fits(x, y, counts, param, grid)
+    else:
+        curves = np.full((n_resamples, len(grid)), np.nan)
+        for b, idx in enumerate(draws):
+            curve = fit_curve(kind, param, x[idx], y[idx])
+            if curve is not None:
+                curves[b] = curve(grid)
+    optima = np.full(n_resamples, np.nan)
+    for b, values in enumerate(curves):
+        best = None if np.isnan(values).any() else interior_argmax(values)
+        if best is not None:
+            optima[b] = grid[best]
+    return optima
+
+
+def k_folds(n, k, seed=0):
+    """Shuffled (train, test) index pairs; k is capped at n (leave-one-out)."""
+    k = min(k, n)
+    order = np.random.default_rng(seed).permutation(n)
+    folds = np.array_split(order, k)
+    return [(np.setdiff1d(order, test), test) for test in folds]
+
+
+def select_curve(x, y, k=5, n_boot=200, seed=0):
+    """Choose the curve by k-fold CV and bootstrap the location of its maximum.
+
+    A monotone fit (e.g. a straight line) has no maximum inside the data;
+    then ``optimal_x``, ``optimal_y`` and ``band`` are None rather than a grid
+    endpoint. ``band`` is also None when fewer than :data:`MIN_BAND_RESAMPLES`
+    resamples have an interior maximum, i.e. the optimum is unstable. Only the chosen curve is bootstrapped, and only when it has an
+    interior maximum. Polynomial folds and resamples are each fitted in one
+    batched solve rather than a process pool: with a handful of points per
+    year, starting workers would cost more than all the fits.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    grid = np.linspace(x.min(), x.max(), GRID_POINTS)
+    fold_errors = _fold_errors(x, y, k_folds(len(x), k, seed))
+
+    # A candidate that cannot be fitted on some fold is not eligible
+    cv_mse = np.sum(fold_errors, axis=0) / len(x)
+    scores = pd.DataFrame({
+        "Model": [label for label, _, _ in CANDIDATES],
+        "CV MSE": cv_mse
+    })
+    best = int(np.nanargmin(cv_mse))
+    label, kind, param = CANDIDATES[best]
+
+    curve = fit_curve(kind, param, x, y)
+    y_grid = curve(grid)
+    peak = interior_argmax(y_grid)
+    band = None
+    if peak is not None:
+        optima = _bootstrap_optima(x, y, grid, seed + 1, n_boot, kind, param)
+        # Resamples without an interior maximum do not count towards the band
+        optima = optima[~np.isnan(optima)]
+        band = tuple(np.percentile(optima, [2.5, 97.5])) if len(optima) >= MIN_BAND_RESAMPLES else None
+    return {
+        "model": label,
+        "scores": scores,
+        "x_grid": grid,
+        "y_grid": y_grid,
+        "optimal_x": None if peak is None else grid[peak],
+        "optimal_y": None if peak is None else y_grid[peak],
+        "band": band
+    }
@@ -0,0 +1,213 @@
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from dashboard.stats import confidence_band, fit
+
+# Above this many points scatters are drawn with WebGL (Scattergl) instead of SVG
+WEBGL_THRESHOLD = 1000
+
+
+def _normalize(values, log):
+    values = np.log10(values.clip(lower=np.finfo(float).tiny)) if log else values.astype(float)
+    span = values.max() - values.min()
+    return (values - values.min()) / span if span > 0 else values * 0.0
+
+
+def decimate(df, x, y, max_points, log_x=False, log_y=False, color=None, keep=None):
+    """Thin overlapping points on a screen-space grid, keeping outliers and extremes.
+
+    The plot area is split into roughly ``max_points`` cells and one point is
+    kept per occupied cell (per colour group for discrete colours), so sparse
+    outliers always survive. The rows holding the minimum and maximum of x
+    and y, and rows where the boolean column ``keep`` is True, are always kept.
+    """
+    df = df.dropna(subset=[x, y])
+    if len(df) <= max_points:
+        return df
+
+    groups = pd.Series(0, index=df.index)
+    if color is not None and not pd.api.types.is_numeric_dtype(df[color]):
+        groups = pd.Series(pd.factorize(df[color])[0], index=df.index)
+    n_groups = max(groups.nunique(), 1)
+    cells_per_axis = max(int(np.sqrt(max_points / n_groups)), 1)
+
+    u = np.minimum((_normalize(df[x], log_x) * cells_per_axis).astype(int), cells_per_axis - 1)
+    v = np.minimum((_normalize(df[y], log_y) * cells_per_axis).astype(int), cells_per_axis - 1)
+    cell = (groups.to_numpy() * cells_per_axis + u.to_numpy()) * cells_per_axis + v.to_numpy()
+    _, first = np.unique(cell, return_index=True)
+
+    kept = np.zeros(len(df), dtype=bool)
+    kept[first] = True
+    positions = [df.index.get_loc(i) for i in (df[x].idxmin(), df[x].idxmax(), df[y].idxmin(), df[y].idxmax())]
+    kept[positions] = True
+    if keep is not None:
+        kept |= df[keep].to_numpy(dtype=bool)
+    return df[kept]
+
+
+def _ols_lines(df, x, y, color, log_x):
+    """OLS trend line per colour group, fitted on the full (undecimated) data."""
+    discrete = color is not None and not pd.api.types.is_numeric_dtype(df[color])
+    by = color if discrete else None
+    coefs = fit(df.dropna(subset=[x, y]), x, y, by=by)
+    lines = []
+    for group, row in coefs.iterrows():
+        subset = df if by is None else df[df[color] == group]
+        lo, hi = subset[x].min(), subset[x].max()
+        grid = np.geomspace(lo, hi, 50) if log_x and lo > 0 else np.linspace(lo, hi, 50)
+        lines.append((group if by is not None else None, grid, row))
+    return lines
+
+
+def scatter(df, x, y, color=None, trendline=None, log_x=False, log_y=False, max_points=None,
+            keep=None, webgl_threshold=WEBGL_THRESHOLD, color_discrete_map=None, ci=None, **px_kwargs):
+    """``px.scatter`` that switches to WebGL for large data and can decimate server-side.
+
+    Trend lines are fitted on the full data even when points are decimated;
+    ``ci`` (e.g. 0.95) shades an analytic confidence band around each line.
+    Returns the figure and a dict describing what was sent (points, render
+    mode, payload size, build time).
+    """
+    start = time.perf_counter()
+    plot_df = df if max_points is None else decimate(df, x, y, max_points, log_x, log_y, color, keep)
+    render_mode = "webgl" if len(plot_df) > webgl_threshold else "svg"
+
+    fig = px.scatter(
+        plot_df, x=x, y=y, color=color, log_x=log_x, log_y=log_y, render_mode=render_mode,
+        color_discrete_map=color_discrete_map, **px_kwargs
+    )
+
+    if trendline == "ols":
+        colors = {trace.name: trace.marker.color for trace in fig.data}
+        for group, x_line, coefs in _ols_lines(df, x, y, color, log_x):
+            line_color = colors.get(group, "red") if group is not None else "red"
+            if ci is not None:
+                lower, upper = confidence_band(coefs, x_line, ci)
+                fig.add_trace(go.Scatter(
+                    x=np.concatenate([x_line, x_line[::-1]]), y=np.concatenate([upper, lower[::-1]]),
+                    fill="toself", fillcolor=line_color, opacity=0.2, line=dict(width=0),
+                    hoverinfo="skip", name=f"{ci:.0%} confidence band", showlegend=group is None
+                ))
+            fig.add_trace(go.Scatter(
+                x=x_line, y=coefs["intercept"] + coefs["slope"] * x_line, mode="lines",
+                name=f"{group} trend" if group is not None else "OLS trendline",
+                line=dict(color=line_color),
+                showlegend=group is None
+            ))
+    elif trendline is not None:
+        raise ValueError(f"Unsupported trendline: {trendline}")
+
+    info = {
+        "points": len(df),
+        "shown": len(plot_df),
+        "render_mode": render_mode,
+        "build_ms": (time.perf_counter() - start) * 1000
+    }
+    return fig, info
+
+
+def payload_report(fig, info):
+    """One-line summary of a scatter's size on the wire, for st.caption."""
+    payload_kb = len(fig.to_json()) / 1024
+    shown = f"{info['shown']:,} of {info['points']:,} points" if info["shown"] < info["points"] \
+        else f"{info['points']:,} points"
+    return (f"{shown} · {'WebGL' if info['render_mode'] == 'webgl' else 'SVG'} · "
+            f"payload {payload_kb:,.0f} KB · built in {info['build_ms']:.0f} ms")
+
+
+# Point budget for 3D trajectory charts (lines x years); Scatter3d slows down well before WebGL 2D does
+MAX_3D_POINTS = 1500
+
+
+def _with_breaks(df, line, columns):
+    """Concatenate every line's rows into flat arrays with a NaN gap between lines."""
+    df = df.sort_values([line, columns[0]])
+    codes = pd.factorize(df[line])[0]
+    # Insert one gap before each new line (after the first)
+    starts = np.flatnonzero(np.diff(codes)) + 1
+    arrays = {}
+    for col in columns:
+        values = df[col].to_numpy(dtype=object if col == line else float)
+        arrays[col] = np.insert(values, starts, None if col == line else np.nan)
+    return arrays
+
+
+def trajectories_3d(df, x, y, z, line, color, summary=None, max_points=MAX_3D_POINTS, labels=None, title=None):
+    """3D trajectories drawn as one ``Scatter3d`` trace per colour.
+
+    Lines are joined into a single trace with gaps between them instead of
+    one trace each, and hover labels come straight from the ``line`` column.
+    ``summary`` rows (e.g. group averages, same columns) are drawn thicker and
+    always shown. When the lines in ``df`` would exceed ``max_points``, the
+    lines past the budget are averaged per colour into one
+    "Other selected" line each. Returns the figure and a dict with the number
+    of lines requested, shown individually and aggregated.
+    """
+    labels = labels or {}
+    summary = summary if summary is not None else df.iloc[0:0]
+    lines = list(dict.fromkeys(df[line]))
+    points_per_line = max(df.groupby(line).size().max(), 1) if len(df) else 1
+    budget = max((max_points - len(summary)) // points_per_line, 0)
+
+    shown, folded = lines[:budget], lines[budget:]
+    detail = df[df[line].isin(shown)]
+    if folded:
+        other = df[df[line].isin(folded)].groupby([color, x], as_index=False)[[y, z]].mean()
+        other[line] = "Other selected (" + other[color].astype(str) + ")"
+        detail = pd.concat([detail, other], ignore_index=True)
+
+    palette = px.colors.qualitative.Plotly
+    categories = sorted(pd.concat([detail[color], summary[color]]).dropna().unique())
+    fig = go.Figure()
+    for i, category in enumerate(categories):
+        first = True
+        for part, width in ((detail, 3), (summary, 7)):
+            rows = part[part[color] == category]
+            if rows.empty:
+                continue
+            arrays = _with_breaks(rows, line, [x, y, z, line])
+            fig.add_trace(go.Scatter3d(
+                x=arrays[x], y=arrays[y], z=arrays[z], hovertext=arrays[line],
+                mode="lines", line=dict(color=palette[i % len(palette)], width=width),
+                name=str(category), legendgroup=str(category), showlegend=first,
+                hovertemplate=f"<b>%{{hovertext}}</b><br>{labels.get(x, x)}: %{{x}}<br>"
+                              f"{labels.get(y, y)}: %{{y:,.1f}}<br>{labels.get(z, z)}: %{{z:.1f}}<extra></extra>"
+            ))
+            first = False
+
+    fig.update_layout(
+        title=title,
+        template="plotly_white",
+        legend_title_text=labels.get(color, color),
+        scene=dict(
+            xaxis=dict(title=labels.get(x, x)),
+            yaxis=dict(title=labels.get(y, y)),
+            zaxis=dict(title=labels.get(z, z))
+        )
+    )
+    info = {"lines": len(lines), "shown": len(shown), "aggregated": len(folded)}
+    return fig, info
+
+
+def small_multiples(df, x, y, facet, facet_col_wrap=3, y_range=None, title=None, labels=None, panel_height=250):
+    """One faceted line chart with a panel per ``facet`` value on shared axes.
+
+    Each panel is a single trace (coloured by panel), so the figure costs one
+    trace per facet rather than a hand-placed subplot per value.
+    """
+    order = sorted(df[facet].unique())
+    fig = px.line(
+        df.sort_values(x), x=x, y=y, facet_col=facet, color=facet, facet_col_wrap=facet_col_wrap,
+        category_orders={facet: order}, markers=True, title=title, labels=labels,
+        height=panel_height * -(-len(order) // facet_col_wrap) + 100
+    )
+    # "Country=Cambodia" -> "Cambodia"
+    fig.for_each_annotation(lambda annotation: annotation.update(text=annotation.text.split("=", 1)[-1]))
+    if y_range is not None:
+        fig.update_yaxes(range=y_range)
+    fig.update_layout(showlegend=False, hovermode="x unified")
+    return fig
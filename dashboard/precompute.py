@@ -0,0 +1,41 @@
+"""Build the derived tables in ``data/derived`` without starting the app.
+
+    python -m dashboard.precompute                  # build what is missing or stale
+    python -m dashboard.precompute --force          # rebuild everything
+    python -m dashboard.precompute --check          # report only; exit 1 if anything needs a build
+    python -m dashboard.precompute optimal_spend    # one artifact
+
+Run from the repository root, like ``streamlit run``.
+"""
+import argparse
+import sys
+
+from dashboard import derived
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("artifacts", nargs="*", metavar="artifact",
+                        help=f"artifacts to build (default: all of {', '.join(derived.ARTIFACTS)})")
+    parser.add_argument("--force", action="store_true", help="rebuild even if the tables are fresh")
+    parser.add_argument("--check", action="store_true", help="only report what needs building")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.artifacts if name not in derived.ARTIFACTS]
+    if unknown:
+        parser.error(f"unknown artifact: {', '.join(unknown)}")
+
+    needs_build = False
+    for name in args.artifacts or derived.ARTIFACTS:
+        state = derived.status(name)
+        if args.check or (state == "fresh" and not args.force):
+            print(f"{name}: {state}")
+            needs_build |= state != "fresh"
+            continue
+        entry = derived.build(name)
+        tables = ", ".join(f"{table} ({rows:,} rows)" for table, rows in entry["tables"].items())
+        print(f"{name}: built in {entry['build_seconds']:.1f} s -> {tables}")
+    return 1 if args.check and needs_build else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
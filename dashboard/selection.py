@@ -0,0 +1,110 @@
+"""Country, year and income-group selection shared by every page of a session.
+
+The selection widgets below start from the session's current
+:class:`Selection` and write changes back to it, so countries picked on one
+page are already selected on the next. Each page still offers only the
+options its own data has. Country names are stored as the World Bank spells
+them, using :data:`dashboard.data.WHO_TO_WDI_NAMES` for the WHO datasets.
+
+:func:`subset` keeps the rows matching a selection in the shared cache
+manager, so coming back to a page with the same selection reuses the
+filtered frame.
+"""
+from dataclasses import dataclass, replace
+
+import streamlit as st
+
+from dashboard.cache import MANAGER, normalize_widget_value
+from dashboard.data import WHO_TO_WDI_NAMES
+
+MAX_SUBSETS = 64
+
+
+@dataclass(frozen=True)
+class Selection:
+    """Countries, inclusive year range and income groups; empty/None means not chosen yet."""
+    countries: tuple = ()
+    years: tuple = None
+    income_groups: tuple = None
+
+
+def canonical(country):
+    return WHO_TO_WDI_NAMES.get(country, country)
+
+
+def current():
+    return st.session_state.setdefault("selection", Selection())
+
+
+def update(**changes):
+    st.session_state["selection"] = replace(current(), **changes)
+
+
+def _store_countries(key, options):
+    # Countries this page doesn't offer stay selected for the pages that do
+    offered = {canonical(option) for option in options}
+    kept = [country for country in current().countries if country not in offered]
+    update(countries=tuple(kept + [canonical(country) for country in st.session_state[key]]))
+
+
+def initial_countries(options, default):
+    """The selected countries among ``options``, in their spelling, or ``default`` if there are none."""
+    by_name = {canonical(option): option for option in options}
+    # In selection order, which some pages use to order their traces
+    return [by_name[country] for country in current().countries if country in by_name] or list(default)
+
+
+def initial_years(min_year, max_year):
+    """The selected year range clipped to ``min_year``-``max_year``, or all of it if none is selected."""
+    min_year, max_year = int(min_year), int(max_year)
+    start, end = current().years or (min_year, max_year)
+    return min(max(start, min_year), max_year), max(min(end, max_year), min_year)
+
+
+def country_select(label, options, default, key, **kwargs):
+    """Multiselect of countries that starts from, and updates, the shared selection."""
+    options = list(options)
+    return st.multiselect(label, options, default=initial_countries(options, default), key=key,
+                          on_change=_store_countries, args=(key, options), **kwargs)
+
+
+def year_range_slider(label, min_year, max_year, key, **kwargs):
+    """Year range slider that starts from, and updates, the shared selection (clipped to this data)."""
+    return st.slider(label, int(min_year), int(max_year), initial_years(min_year, max_year), key=key,
+                     on_change=lambda: update(years=tuple(st.session_state[key])), **kwargs)
+
+
+def income_group_select(label, options, default, key, **kwargs):
+    """Multiselect of income groups that starts from, and updates, the shared selection."""
+    options = list(options)
+    chosen = current().income_groups
+    initial = [option for option in options if option in chosen] if chosen is not None else list(default)
+    return st.multiselect(label, options, default=initial, key=key,
+                          on_change=lambda: update(income_groups=tuple(st.session_state[key])), **kwargs)
+
+
+def _subsets():
+    return MANAGER.cache("subsets", max_entries=MAX_SUBSETS)
+
+
+def subset(df, dataset, version, countries=None, years=None, income_groups=None,
+           country_col="Country Name", year_col="Year", group_col="IncomeGroup"):
+    """Rows of ``df`` in the given countries, year range and income groups (None skips a filter).
+
+    Cached by ``dataset`` name, ``version`` and the filters, so
+    ``version`` must change whenever ``df`` does.
+    """
+    key = (dataset, version, normalize_widget_value([countries, years, income_groups]))
+    cache = _subsets()
+    rows = cache.get(key)
+    if rows is None:
+        mask = True
+        if countries is not None:
+            mask = df[country_col].isin(list(countries))
+        if years is not None:
+            mask = mask & df[year_col].between(*years)
+        if income_groups is not None:
+            mask = mask & df[group_col].isin(list(income_groups))
+        rows = df if mask is True else df[mask]
+        cache.put(key, rows)
+    return rows.copy(deep=False)
@@ -0,0 +1,29 @@
+"""Start the dashboard with its caches warmed in the background.
+
+    python -m dashboard.serve [streamlit run options, e.g. --server.port 8502]
+
+Equivalent to ``streamlit run streamlit_app.py`` except that every page is
+pre-run as soon as the server is up (see :mod:`dashboard.warmup`), so the
+first visitor after a deploy or restart gets cache hits. Readiness is logged
+and shown in the app's sidebar. With ``DASHBOARD_API_PORT`` set, the HTTP API
+(:mod:`dashboard.api`) is served on that port from the same process and caches.
+"""
+import os
+import sys
+
+from streamlit.web import cli
+
+from dashboard import api, warmup
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    warmup.start()
+    if os.environ.get("DASHBOARD_API_PORT"):
+        api.start(os.environ.get("DASHBOARD_API_HOST", "127.0.0.1"), int(os.environ["DASHBOARD_API_PORT"]))
+    sys.argv = ["streamlit", "run", str(warmup.ROOT / "streamlit_app.py"), *argv]
+    return cli.main()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
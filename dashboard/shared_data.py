@@ -0,0 +1,189 @@
+"""Zero-copy datasets shared by every Streamlit process on the host.
+
+With ``DASHBOARD_SHARED_DATA=1``, a :func:`shared_dataset` loader publishes its
+result once as Arrow IPC files under ``SHARED_DIR`` (``/dev/shm`` when it
+exists) and every process memory-maps them. Numeric columns come back as
+read-only views of the mapping and strings stay Arrow-backed, so all workers
+share one copy in the page cache instead of each holding its own; pandas'
+copy-on-write copies only what a page modifies. Without the setting the
+loaders are unchanged.
+
+A dataset's key changes with its source data and code. Publishing a new key
+removes the files of the keys it replaces (same loader and arguments), and a
+process drops its mapping of the old key when it attaches the new one;
+processes still holding the old mapping keep reading it until then.
+"""
+import functools
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+
+SHARED_DATA = os.environ.get("DASHBOARD_SHARED_DATA", "") not in ("", "0")
+SHARED_DIR = Path(os.environ.get(
+    "DASHBOARD_SHARED_DIR",
+    "/dev/shm/dashboard" if os.path.isdir("/dev/shm") else Path(tempfile.gettempdir()) / "dashboard-shared"
+))
+
+# Frames mapped by this process, by dataset key, and the key currently mapped
+# for each loader call (slot); the lock is reentrant because a shared loader
+# may call others (load_workforce_panel reads two of them)
+_attached = {}
+_slots = {}
+_lock = threading.RLock()
+
+
+def _to_table(df):
+    """Arrow table of ``df`` that keeps NaN as a value, so float columns map back without a copy."""
+    table = pa.Table.from_pandas(df)
+    columns = [
+        pa.array(df[name].to_numpy(), type=field.type, from_pandas=False)
+        if pa.types.is_floating(field.type) and name in df.columns and not isinstance(df[name], pd.DataFrame)
+        else table.column(name)
+        for name, field in zip(table.column_names, table.schema)
+    ]
+    return pa.Table.from_arrays(columns, schema=table.schema)
+
+
+def _write_atomic(path, write):
+    fd, tmp = tempfile.mkstemp(dir=SHARED_DIR, prefix=f".{path.name}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        os.remove(tmp)
+        raise
+
+
+def _indexes():
+    try:
+        return [entry for entry in os.scandir(SHARED_DIR) if entry.name.endswith(".json")]
+    except FileNotFoundError:
+        return []
+
+
+def _remove(key):
+    """Delete a dataset's files, the index first so no reader starts on a half-removed set."""
+    for path in [SHARED_DIR / f"{key}.json", *SHARED_DIR.glob(f"{key}.*.arrow")]:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def remove_replaced(key, slot):
+    """Delete the published datasets of ``slot`` other than ``key``."""
+    for entry in _indexes():
+        other = entry.name.removesuffix(".json")
+        if other == key:
+            continue
+        try:
+            index = json.loads(Path(entry.path).read_text())
+        except (FileNotFoundError, ValueError):
+            continue
+        if index.get("slot") == slot:
+            _remove(other)
+
+
+def publish(key, result, slot=None):
+    """Write a frame (or tuple of frames) as Arrow IPC files; the index file is written last."""
+    frames = result if isinstance(result, tuple) else (result,)
+    SHARED_DIR.mkdir(parents=True, exist_ok=True)
+    for i, df in enumerate(frames):
+        table = _to_table(df)
+
+        def write(path, table=table):
+            with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        _write_atomic(SHARED_DIR / f"{key}.{i}.arrow", write)
+    index = {"parts": len(frames), "tuple": isinstance(result, tuple), "slot": slot}
+    _write_atomic(SHARED_DIR / f"{key}.json", lambda path: Path(path).write_text(json.dumps(index)))
+    if slot is not None:
+        remove_replaced(key, slot)
+
+
+def attach(key):
+    """Memory-map a published dataset, or None if it has not been published."""
+    try:
+        index = json.loads((SHARED_DIR / f"{key}.json").read_text())
+        frames = tuple(
+            pa.ipc.open_file(pa.memory_map(str(SHARED_DIR / f"{key}.{i}.arrow"))).read_all().to_pandas(split_blocks=True)
+            for i in range(index["parts"])
+        )
+    except FileNotFoundError:  # not published, or removed while being read
+        return None
+    return frames if index["tuple"] else frames[0]
+
+
+def _shallow_copy(result):
+    # Callers may rename or add columns in place; they get their own frame over the shared buffers
+    if isinstance(result, tuple):
+        return tuple(df.copy(deep=False) for df in result)
+    return result.copy(deep=False)
+
+
+def shared_dataset(loader):
+    """Serve a ``disk_cache``-keyed loader's frames from shared memory when ``SHARED_DATA`` is on.
+
+    Goes outermost, above ``@cached`` (whose entries are per process); the
+    loader chain must contain a ``@disk_cache`` function, whose key also
+    names the shared files.
+    """
+    if not SHARED_DATA:
+        return loader
+    inner = loader
+    while not hasattr(inner, "cache_key"):
+        inner = inner.__wrapped__
+
+    name = f"{inner.__module__}.{inner.__qualname__}"
+
+    @functools.wraps(loader)
+    def wrapper(*args, **kwargs):
+        key = inner.cache_key(*args, **kwargs)
+        result = _attached.get(key)
+        if result is None:
+            slot = hashlib.sha1(repr((name, args, sorted(kwargs.items()))).encode()).hexdigest()[:20]
+            with _lock:
+                result = _attached.get(key)
+                if result is None:
+                    result = attach(key)
+                    if result is None:
+                        publish(key, loader(*args, **kwargs), slot)
+                        result = attach(key)
+                    _attached[key] = result
+                    replaced = _slots.get(slot)
+                    _slots[slot] = key
+                    if replaced is not None and replaced != key:
+                        _attached.pop(replaced, None)
+        return _shallow_copy(result)
+    return wrapper
+
+
+def shared_usage():
+    """Datasets and bytes currently published in ``SHARED_DIR``."""
+    try:
+        files = [entry for entry in os.scandir(SHARED_DIR) if entry.name.endswith(".arrow")]
+    except FileNotFoundError:
+        return 0, 0
+    return len({entry.name.rsplit(".", 2)[0] for entry in files}), sum(entry.stat().st_size for entry in files)
+
+
+def clear():
+    try:
+        entries = list(os.scandir(SHARED_DIR))
+    except FileNotFoundError:
+        return
+    for entry in entries:
+        try:
+            os.remove(entry.path)
+        except FileNotFoundError:
+            pass
+    _attached.clear()
+    _slots.clear()
@@ -0,0 +1,485 @@
+"""Export every page, run headless with its default settings, as a static HTML site.
+
+    python -m dashboard.static_site                     # every page into site/
+    python -m dashboard.static_site --out /srv/www      # elsewhere
+    python -m dashboard.static_site --no-variants       # default settings only
+    python -m dashboard.static_site "13_Life expectancy - Healthcare expenditure Introduction"
+
+Run from the repository root, like ``streamlit run``. Each page is executed
+with Streamlit's headless test runner and its elements are written out as one
+self-contained HTML file: narrative, metrics, tables and interactive Plotly
+charts (the Plotly library is copied into ``assets/``, so the site needs no
+network access or Python to serve). Widgets are shown with the value the page
+ran with. Tabs that only compute when opened are exported by re-running the
+page with each tab open.
+
+For the widgets in :data:`VARIANTS`, every value (up to
+:data:`MAX_VARIANTS`) is also pre-rendered as its own file, and the exported
+widget links between them, e.g. each year of page 13's map.
+"""
+import argparse
+import html
+import json
+import re
+import shutil
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+from plotly.offline import get_plotlyjs
+from streamlit.testing.v1 import AppTest
+
+from dashboard import headless
+from dashboard.app_pages import HOME_SCRIPT, page_scripts
+
+OUT_DIR = Path("site")
+PAGE_TIMEOUT = 300
+
+# Page -> label of the widget whose values are pre-rendered as separate files
+VARIANTS = {
+    "13_Life expectancy - Healthcare expenditure Introduction": "Select Year",
+    "14_Life expectancy - Healthcare expenditure Relationship": "Select Year for Analysis",
+    "1_Manpower - Introduction": "Choose a Financial Year:",
+    "4_Manpower - Optimal Healthcare Spending": "📅 Select Year:"
+}
+MAX_VARIANTS = 25
+
+WIDGET_TYPES = {"slider", "select_slider", "selectbox", "multiselect", "radio", "toggle", "checkbox",
+                "number_input", "text_input", "date_input"}
+# Interactive-only elements with nothing to show in a static page
+SKIPPED_TYPES = {"button", "download_button", "progress", "empty", "spinner", "toast", "balloons", "snow"}
+
+STYLE = """
+body { margin: 0; display: flex; font-family: "Source Sans Pro", system-ui, sans-serif; color: #31333f; }
+nav { width: 260px; flex-shrink: 0; min-height: 100vh; padding: 1.5rem 1rem; background: #f0f2f6;
+      box-sizing: border-box; font-size: 0.92rem; }
+nav a { display: block; padding: 0.25rem 0.5rem; border-radius: 0.3rem; color: inherit; text-decoration: none; }
+nav a.current, nav a:hover { background: #e0e3ea; }
+main { flex: 1; min-width: 0; padding: 2rem 3rem; }
+.row { display: flex; gap: 1rem; flex-wrap: wrap; }
+.row > .column { min-width: 0; }
+.caption { color: #6b6f7b; font-size: 0.85rem; }
+.metric .label { font-size: 0.9rem; }
+.metric .value { font-size: 2rem; }
+.metric .delta.up { color: #09ab3b; } .metric .delta.down { color: #ff2b2b; } .metric .delta.off { color: #6b6f7b; }
+.alert { padding: 0.8rem 1rem; border-radius: 0.5rem; margin: 0.5rem 0; }
+.alert.info { background: #e8f0fb; } .alert.success { background: #e6f5ea; }
+.alert.warning { background: #fff8e1; } .alert.error { background: #fdecea; }
+.widget { margin: 0.5rem 0; font-size: 0.92rem; }
+.widget .label { color: #6b6f7b; margin-right: 0.5rem; }
+.widget .value { font-weight: 600; }
+.widget a { margin-right: 0.35rem; }
+.widget a.current { font-weight: 700; text-decoration: none; color: inherit; }
+.tabs > h4 { border-bottom: 2px solid #ff4b4b; display: inline-block; margin-bottom: 0.5rem; }
+.table-wrap { overflow-x: auto; max-height: 420px; }
+table { border-collapse: collapse; font-size: 0.85rem; }
+th, td { border: 1px solid #e6e9ef; padding: 0.2rem 0.5rem; text-align: right; }
+pre { background: #f6f7f9; padding: 0.8rem; overflow-x: auto; }
+details { border: 1px solid #e6e9ef; border-radius: 0.5rem; padding: 0.5rem 1rem; margin: 0.5rem 0; }
+.exception { color: #b00020; }
+"""
+
+_PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{title}</title>
+<link rel="stylesheet" href="assets/style.css">
+<script src="assets/plotly.min.js"></script>
+</head>
+<body>
+<nav>
+{nav}
+{sidebar}
+</nav>
+<main>
+{body}
+<p class="caption">Static snapshot exported {exported}.</p>
+</main>
+</body>
+</html>
+"""
+
+
+# --- Markdown (the subset the pages use) ---
+_INLINE = [
+    (re.compile(r"\*\*\*(.+?)\*\*\*"), r"<strong><em>\1</em></strong>"),
+    (re.compile(r"\*\*(.+?)\*\*"), r"<strong>\1</strong>"),
+    (re.compile(r"__(.+?)__"), r"<strong>\1</strong>"),
+    (re.compile(r"(?<![*\w])\*(?=\S)(.+?)(?<=\S)\*(?!\*)"), r"<em>\1</em>"),
+    (re.compile(r"(?<!\w)_(?=\S)(.+?)(?<=\S)_(?!\w)"), r"<em>\1</em>"),
+    (re.compile(r"\[([^\]]+)\]\(([^)\s]+)\)"), r'<a href="\2">\1</a>')
+]
+_CODE_SPAN = re.compile(r"`([^`]+)`")
+_LIST_ITEM = re.compile(r"^(\s*)([-*+]|\d+[.)])\s+(.*)$")
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*$")
+
+
+def inline_markdown(text, allow_html=False):
+    """Bold, italics, links and code spans of one block of text."""
+    parts = _CODE_SPAN.split(text)
+    for i, part in enumerate(parts):
+        if i % 2:
+            parts[i] = f"<code>{html.escape(part)}</code>"
+            continue
+        part = part if allow_html else html.escape(part, quote=False)
+        for pattern, replacement in _INLINE:
+            part = pattern.sub(replacement, part)
+        parts[i] = part
+    return "".join(parts)
+
+
+def markdown_html(text, allow_html=False):
+    """HTML for the Markdown the pages write: headings, paragraphs, lists, rules, code blocks and raw HTML."""
+    out, paragraph, lists = [], [], []  # lists: stack of (indent, tag)
+
+    def close_paragraph():
+        if paragraph:
+            # Two trailing spaces or a backslash end a line within a paragraph
+            lines = [re.sub(r"( {2,}|\\)$", "\0", line) for line in paragraph[:-1]] + paragraph[-1:]
+            text = inline_markdown("\n".join(lines).strip(), allow_html).replace("\0", "<br>")
+            out.append(f"<p>{text}</p>")
+            paragraph.clear()
+
+    def close_lists(indent=-1):
+        while lists and lists[-1][0] > indent:
+            out.append(f"</li></{lists.pop()[1]}>")
+
+    lines = iter(text.splitlines())
+    for line in lines:
+        stripped = line.strip()
+        item = _LIST_ITEM.match(line)
+        heading = _HEADING.match(stripped)
+        if not stripped:
+            close_paragraph()
+        elif stripped.startswith("```"):
+            close_paragraph()
+            close_lists()
+            code = []
+            for code_line in lines:
+                if code_line.strip().startswith("```"):
+                    break
+                code.append(code_line)
+            out.append(f"<pre><code>{html.escape(chr(10).join(code))}</code></pre>")
+        elif heading and not lists:
+            close_paragraph()
+            level = len(heading.group(1))
+            out.append(f"<h{level}>{inline_markdown(heading.group(2), allow_html)}</h{level}>")
+        elif re.fullmatch(r"(-{3,}|\*{3,}|_{3,})", stripped):
+            close_paragraph()
+            close_lists()
+            out.append("<hr>")
+        elif item:
+            close_paragraph()
+            indent, marker, content = len(item.group(1)), item.group(2), item.group(3)
+            tag = "ol" if marker[0].isdigit() else "ul"
+            close_lists(indent)
+            if lists and lists[-1][0] == indent:
+                out.append("</li>")
+            else:
+                out.append(f"<{tag}>")
+                lists.append((indent, tag))
+            out.append(f"<li>{inline_markdown(content, allow_html)}")
+        elif allow_html and stripped.startswith("<") and not paragraph:
+            close_lists()
+            out.append(stripped)
+        elif lists and not paragraph:
+            # Continuation of the last list item
+            out.append(" " + inline_markdown(stripped, allow_html))
+        else:
+            close_lists()
+            paragraph.append(line)
+    close_paragraph()
+    close_lists()
+    return "\n".join(out)
+
+
+# --- Pages ---
+def page_label(path):
+    return "Home" if path == HOME_SCRIPT else re.sub(r"^\d+_", "", path.stem).replace("_", " ")
+
+
+def page_file(path, variant=None):
+    name = "index" if path == HOME_SCRIPT else re.sub(r"[^a-z0-9]+", "-", path.stem.lower()).strip("-")
+    if variant is not None:
+        name += "--" + re.sub(r"[^A-Za-z0-9]+", "-", str(variant)).strip("-")
+    return f"{name}.html"
+
+
+def walk(node):
+    yield node
+    for child in getattr(node, "children", {}).values():
+        yield from walk(child)
+
+
+def find_widget(at, label):
+    return next((node for node in walk(headless.element_tree(at))
+                 if node.type in WIDGET_TYPES and node.label == label), None)
+
+
+def widget_options(widget):
+    """Values a variant widget can take, or None if it has no finite set."""
+    if widget.type == "slider" and not isinstance(widget.value, tuple):
+        return list(range(int(widget.min), int(widget.max) + 1, int(widget.step or 1)))
+    if widget.type in ("selectbox", "radio", "select_slider"):
+        return list(widget.options)
+    return None
+
+
+def run_page(path, tabs=(), variant=None):
+    """The page run headless, with the given (tab key, label) pairs open and the variant widget set."""
+    at = AppTest.from_file(str(path), default_timeout=PAGE_TIMEOUT)
+    for key, label in tabs:
+        at.session_state[key] = label
+    at.run()
+    if variant is not None:
+        label, value = variant
+        find_widget(at, label).set_value(value)
+        at.run()
+    return at
+
+
+class PageRenderer:
+    """Renders one page run; lazily computed tabs are filled in from re-runs with them open."""
+
+    def __init__(self, path, variant=None, variant_links=None):
+        self.path = path
+        self.variant = variant
+        self.variant_links = variant_links or {}
+        self.runs = {}
+        self.charts = 0
+        self.skipped = set()
+
+    def run(self, tabs=()):
+        if tabs not in self.runs:
+            self.runs[tabs] = run_page(self.path, tabs, self.variant)
+        return self.runs[tabs]
+
+    def render(self):
+        at = self.run()
+        tree = headless.element_tree(at)
+        main, sidebar = tree.children[0], tree.children.get(1)
+        try:
+            body = self.children(main, ())
+            # The home page's sidebar only reports the live server's cache warm-up
+            side = self.children(sidebar, ()) if sidebar is not None and self.path != HOME_SCRIPT else ""
+        except AttributeError as error:
+            # Element fields are read straight from Streamlit's messages
+            raise headless.unsupported(f"an element field the export reads ({error})") from error
+        return body, side, [error.value for error in at.exception]
+
+    def children(self, node, tabs):
+        return "\n".join(self.element(child, tabs) for child in node.children.values())
+
+    def element(self, node, tabs):
+        kind = node.type
+        proto = getattr(node, "proto", None)
+        if kind in ("flex_container", "vertical", "horizontal", "form", "chat_message", "popover"):
+            if is_download_control(node):
+                return ""
+            css = "row" if any(child.type == "column" for child in node.children.values()) else "stack"
+            return f'<div class="{css}">{self.children(node, tabs)}</div>'
+        if kind == "column":
+            weight = node.weight or 1
+            return f'<div class="column" style="flex: {weight:g} 1 0">{self.children(node, tabs)}</div>'
+        if kind in ("expander", "expandable"):
+            opened = " open" if proto.expanded else ""
+            label = inline_markdown(proto.label)
+            return f"<details{opened}><summary>{label}</summary>{self.children(node, tabs)}</details>"
+        if kind == "tab_container":
+            return self.tab_container(node, tabs)
+        if kind in ("title", "header", "subheader", "heading"):
+            return f"<{proto.tag}>{inline_markdown(proto.body)}</{proto.tag}>"
+        if kind in ("markdown", "caption", "divider", "latex"):
+            return self.markdown(proto)
+        if kind in ("info", "success", "warning", "error"):
+            return f'<div class="alert {kind}">{markdown_html(proto.body)}</div>'
+        if kind == "metric":
+            return self.metric(proto)
+        if kind in ("dataframe", "table"):
+            return self.table(proto)
+        if kind == "plotly_chart":
+            return self.plotly_chart(proto)
+        if kind == "code":
+            return f"<pre><code>{html.escape(proto.code_text)}</code></pre>"
+        if kind == "json":
+            return f"<pre><code>{html.escape(json.dumps(json.loads(proto.body), indent=2))}</code></pre>"
+        if kind == "iframe":
+            source = f'srcdoc="{html.escape(proto.srcdoc)}"' if proto.srcdoc else f'src="{html.escape(proto.src)}"'
+            return f'<iframe {source} style="width: 100%; height: 600px; border: 0"></iframe>'
+        if kind == "exception":
+            return f'<pre class="exception">{html.escape(proto.message)}</pre>'
+        if kind in WIDGET_TYPES:
+            return self.widget(node)
+        if kind not in SKIPPED_TYPES:
+            self.skipped.add(kind)
+        return ""
+
+    def tab_container(self, node, tabs):
+        element_id = headless.tab_container_id(node)
+        key = headless.tab_key(node)
+        sections = []
+        for index, tab in node.children.items():
+            if not tab.children and key is not None:
+                # Only the open tab ran; take this one from a run with it open
+                tab_state = tabs + ((key, tab.label),)
+                twin = next((other for other in walk(headless.element_tree(self.run(tab_state)))
+                             if other.type == "tab_container" and headless.tab_container_id(other) == element_id),
+                            None)
+                content = "" if twin is None else self.children(twin.children[index], tab_state)
+            else:
+                content = self.children(tab, tabs)
+            sections.append(f"<section><h4>{inline_markdown(tab.label)}</h4>{content}</section>")
+        return f'<div class="tabs">{"".join(sections)}</div>'
+
+    def markdown(self, proto):
+        if proto.element_type == proto.Type.DIVIDER:
+            return "<hr>"
+        if proto.element_type == proto.Type.CAPTION:
+            return f'<div class="caption">{markdown_html(proto.body, proto.allow_html)}</div>'
+        return markdown_html(proto.body, proto.allow_html)
+
+    def metric(self, proto):
+        delta = ""
+        if proto.delta:
+            color = {proto.MetricColor.RED: "down", proto.MetricColor.GREEN: "up"}.get(proto.color, "off")
+            delta = f'<div class="delta {color}">{html.escape(proto.delta)}</div>'
+        return (f'<div class="metric"><div class="label">{inline_markdown(proto.label)}</div>'
+                f'<div class="value">{html.escape(proto.body)}</div>{delta}</div>')
+
+    def table(self, proto):
+        df = pa.ipc.open_stream(proto.arrow_data.data).read_pandas()
+        hide_index = getattr(proto, "hide_index", False) or (
+            isinstance(df.index, pd.RangeIndex) and df.index.name is None)
+        return f'<div class="table-wrap">{df.to_html(index=not hide_index, na_rep="", border=0)}</div>'
+
+    def plotly_chart(self, proto):
+        self.charts += 1
+        chart_id = f"chart-{self.charts}"
+        # Streamlit's spec already escapes "<"; this also guards "</script>" in raw strings
+        spec = proto.spec.replace("</", "<\\/")
+        return (f'<div id="{chart_id}" class="chart"></div>\n'
+                f"<script>(function () {{ const spec = {spec}; "
+                f'Plotly.newPlot("{chart_id}", spec.data, spec.layout, '
+                f"{{responsive: true, displaylogo: false}}); }})();</script>")
+
+    def widget(self, node):
+        label = f'<span class="label">{inline_markdown(node.label)}</span>'
+        links = self.variant_links.get(node.label)
+        if links:
+            value = "".join(
+                f'<a class="current">{html.escape(str(option))}</a>' if option == node.value
+                else f'<a href="{href}">{html.escape(str(option))}</a>'
+                for option, href in links
+            )
+            return f'<div class="widget">{label}{value}</div>'
+        return f'<div class="widget">{label}<span class="value">{html.escape(format_value(node))}</span></div>'
+
+
+def is_download_control(node):
+    """A block of only a download button and its settings (e.g. file format)."""
+    leaves = [n for n in walk(node) if not getattr(n, "children", None)]
+    return (any(leaf.type == "download_button" for leaf in leaves)
+            and all(leaf.type == "download_button" or leaf.type in WIDGET_TYPES for leaf in leaves))
+
+
+def format_value(widget):
+    value = widget.value
+    if widget.type in ("toggle", "checkbox"):
+        return "On" if value else "Off"
+    if isinstance(value, (list, tuple)):
+        return (" – " if widget.type in ("slider", "select_slider") else ", ").join(map(str, value)) or "None"
+    return str(value)
+
+
+def navigation(scripts, current):
+    return "\n".join(
+        f'<a href="{page_file(path)}"{" class=current" if path == current else ""}>{html.escape(page_label(path))}</a>'
+        for path in scripts
+    )
+
+
+def export_page(path, scripts, out_dir, variants=True):
+    """Write the page (and its variants); returns (files written, errors, skipped element types)."""
+    renderer = PageRenderer(path)
+    label = VARIANTS.get(path.stem) if variants else None
+    options = None
+    if label is not None:
+        widget = find_widget(renderer.run(), label)
+        options = widget_options(widget) if widget is not None else None
+    jobs = [(None, renderer)]
+    if options:
+        options = options[:MAX_VARIANTS]
+        default = widget.value
+        links = [(option, page_file(path, None if option == default else option)) for option in options]
+        renderer.variant_links = {label: links}
+        jobs += [(option, PageRenderer(path, (label, option), {label: links}))
+                 for option in options if option != default]
+
+    written, errors, skipped = [], [], set()
+    exported = time.strftime("%Y-%m-%d %H:%M")
+    for option, page in jobs:
+        body, sidebar, page_errors = page.render()
+        title = page_label(path) if option is None else f"{page_label(path)} ({option})"
+        target = out_dir / page_file(path, option)
+        target.write_text(_PAGE.format(title=html.escape(title), nav=navigation(scripts, path), sidebar=sidebar,
+                                       body=body, exported=exported), encoding="utf-8")
+        written.append(target)
+        errors += page_errors
+        skipped |= page.skipped
+    return written, errors, skipped
+
+
+def write_assets(out_dir):
+    assets = out_dir / "assets"
+    assets.mkdir(parents=True, exist_ok=True)
+    (assets / "plotly.min.js").write_text(get_plotlyjs(), encoding="utf-8")
+    (assets / "style.css").write_text(STYLE.lstrip(), encoding="utf-8")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("pages", nargs="*", metavar="page", help="page names to export (default: all)")
+    parser.add_argument("--out", type=Path, default=OUT_DIR, help="output directory (default: %(default)s)")
+    parser.add_argument("--no-variants", dest="variants", action="store_false",
+                        help="only export each page's default settings")
+    parser.add_argument("--clean", action="store_true", help="empty the output directory first")
+    args = parser.parse_args(argv)
+
+    scripts = [HOME_SCRIPT, *page_scripts()]
+    by_name = {path.stem: path for path in scripts}
+    unknown = [name for name in args.pages if name not in by_name]
+    if unknown:
+        parser.error(f"unknown page: {', '.join(unknown)}")
+
+    if args.clean and args.out.exists():
+        shutil.rmtree(args.out)
+    args.out.mkdir(parents=True, exist_ok=True)
+    write_assets(args.out)
+
+    failed = []
+    # The home page starts the background cache warm-up, so it goes last
+    pages = [by_name[name] for name in args.pages] or scripts
+    for path in sorted(pages, key=lambda path: path == HOME_SCRIPT):
+        start = time.perf_counter()
+        try:
+            written, errors, skipped = export_page(path, scripts, args.out, args.variants)
+        except Exception as error:
+            print(f"{path.stem}: failed: {error}")
+            failed.append(path.stem)
+            continue
+        note = f"; not exported: {', '.join(sorted(skipped))}" if skipped else ""
+        print(f"{path.stem}: {len(written)} file(s) in {time.perf_counter() - start:.1f} s{note}")
+        if errors:
+            print(f"  raised: {errors[0]}")
+            failed.append(path.stem)
+    print(f"Site written to {args.out}/ ({len(scripts) - len(failed)} of {len(scripts)} pages clean)"
+          if not args.pages else f"Written to {args.out}/")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,243 @@
+import numpy as np
+import pandas as pd
+
+# Simple (one predictor) least squares is fitted from per-group sufficient
+# statistics, so every group is solved in one groupby pass and removing a point
+# is a rank-one downdate of the sums instead of a refit.
+
+
+def _t_distribution():
+    # Deferred: scipy.stats costs about a second on a cold import
+    from scipy import stats
+    return stats.t
+
+
+def _group_keys(df, by):
+    if by is None:
+        return [pd.Series("All", index=df.index, name="Group")]
+    if isinstance(by, str):
+        by = [by]
+    return [df[col] for col in by]
+
+
+def _row_sums(x, y):
+    return pd.DataFrame({
+        "n": 1.0,
+        "sx": x,
+        "sy": y,
+        "sxx": x * x,
+        "sxy": x * y,
+        "syy": y * y
+    })
+
+
+def group_sums(df, x, y, by=None):
+    """Sufficient statistics (n, Σx, Σy, Σx², Σxy, Σy²) per group."""
+    sums = _row_sums(df[x].astype(float), df[y].astype(float))
+    return sums.groupby(_group_keys(df, by)).sum()
+
+
+def coefficients(sums):
+    """OLS intercept, slope, standard error, p-value and R² from group sums."""
+    n = sums["n"]
+    sxx = sums["sxx"] - sums["sx"] ** 2 / n
+    sxy = sums["sxy"] - sums["sx"] * sums["sy"] / n
+    syy = sums["syy"] - sums["sy"] ** 2 / n
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = sxy / sxx
+        intercept = (sums["sy"] - slope * sums["sx"]) / n
+        dof = n - 2
+        sse = (syy - slope * sxy).clip(lower=0)
+        sigma2 = sse / dof
+        se_slope = np.sqrt(sigma2 / sxx)
+        t_value = slope / se_slope
+        r_squared = sxy ** 2 / (sxx * syy)
+
+    p_value = pd.Series(2 * _t_distribution().sf(np.abs(t_value), dof), index=sums.index)
+    coefs = pd.DataFrame({
+        "n": n.astype(int),
+        "intercept": intercept,
+        "slope": slope,
+        "se_slope": se_slope,
+        "t_value": t_value,
+        "p_value": p_value,
+        "r_squared": r_squared,
+        "sigma2": sigma2,
+        "x_mean": sums["sx"] / n,
+        "sxx": sxx
+    })
+    # Fewer than three points leaves no residual degrees of freedom
+    coefs.loc[dof <= 0, ["se_slope", "t_value", "p_value", "sigma2"]] = np.nan
+    return coefs
+
+
+def fit(df, x, y, by=None):
+    """Fit y = intercept + slope * x for every group at once."""
+    return coefficients(group_sums(df, x, y, by))
+
+
+def confidence_band(coefs, grid, level=0.95):
+    """Analytic confidence band for the fitted mean of one group's line.
+
+    ``coefs`` is one row of :func:`coefficients`; returns ``(lower, upper)``
+    over ``grid`` from the usual t-based standard error of the mean response.
+    """
+    fitted = coefs["intercept"] + coefs["slope"] * grid
+    dof = coefs["n"] - 2
+    if dof <= 0:
+        return np.full_like(fitted, np.nan), np.full_like(fitted, np.nan)
+    se = np.sqrt(coefs["sigma2"] * (1 / coefs["n"] + (grid - coefs["x_mean"]) ** 2 / coefs["sxx"]))
+    half_width = _t_distribution().ppf((1 + level) / 2, dof) * se
+    return fitted - half_width, fitted + half_width
+
+
+def prediction_interval(coefs, x, level=0.95):
+    """Fitted value and t-based prediction interval for a new observation at ``x``.
+
+    ``coefs`` holds rows of :func:`coefficients` aligned with ``x`` (one row
+    per value); rows without residual degrees of freedom get NaN bounds.
+    """
+    fitted = coefs["intercept"] + coefs["slope"] * x
+    dof = (coefs["n"] - 2).where(coefs["n"] > 2)
+    se = np.sqrt(coefs["sigma2"] * (1 + 1 / coefs["n"] + (x - coefs["x_mean"]) ** 2 / coefs["sxx"]))
+    half_width = _t_distribution().ppf((1 + level) / 2, dof) * se
+    return fitted, fitted - half_width, fitted + half_width
+
+
+def cooks_threshold(n):
+    """Conventional 4/n cut-off above which a point is treated as influential."""
+    return 4 / n
+
+
+def influence(df, x, y, by=None, coefs=None):
+    """Per-observation leverage, studentized residuals and Cook's distance.
+
+    Returns a frame aligned with ``df``. ``coefs`` can be passed in when the
+    groups have already been fitted.
+    """
+    if coefs is None:
+        coefs = fit(df, x, y, by)
+    keys = _group_keys(df, by)
+    group = pd.MultiIndex.from_arrays(keys) if len(keys) > 1 else pd.Index(keys[0])
+    per_row = coefs.reindex(group)
+    per_row.index = df.index
+
+    x_values = df[x].astype(float)
+    fitted = per_row["intercept"] + per_row["slope"] * x_values
+    residual = df[y].astype(float) - fitted
+    n = per_row["n"]
+    dof = n - 2
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        leverage = 1 / n + (x_values - per_row["x_mean"]) ** 2 / per_row["sxx"]
+        one_minus_h = 1 - leverage
+        # Leave-one-out residual variance, without refitting
+        sigma2_i = (dof * per_row["sigma2"] - residual ** 2 / one_minus_h) / (dof - 1)
+        student_resid = residual / np.sqrt(sigma2_i.clip(lower=0) * one_minus_h)
+        cooks_d = residual ** 2 * leverage / (2 * per_row["sigma2"] * one_minus_h ** 2)
+
+    result = pd.DataFrame({
+        "fitted": fitted,
+        "residual": residual,
+        "leverage": leverage,
+        "student_resid": student_resid,
+        "cooks_d": cooks_d
+    })
+    result["influential"] = result["cooks_d"] > cooks_threshold(n)
+    return result
+
+
+def refit_without(df, x, y, drop, by=None, sums=None):
+    """Coefficients after removing the rows where ``drop`` is True.
+
+    The dropped rows' contributions are subtracted from the group sums
+    (a rank-one downdate per row), so the other observations are not revisited.
+    """
+    if sums is None:
+        sums = group_sums(df, x, y, by)
+    dropped = df[drop]
+    if dropped.empty:
+        return coefficients(sums)
+    removed = group_sums(dropped, x, y, by)
+    remaining = sums.sub(removed.reindex(sums.index, fill_value=0))
+    return coefficients(remaining)
+
+
+def design_matrices(df, x_cols, y_col, by):
+    """Stack one design matrix per group into padded arrays for a batched solve.
+
+    Returns ``(groups, X, y, present)`` where ``X`` has shape
+    (groups, rows, 1 + len(x_cols)) with a leading intercept column, ``y`` has
+    shape (groups, rows) and ``present`` flags which predictor cells and
+    responses were observed. Missing cells are stored as zero.
+    """
+    df = df.reset_index()
+    codes, groups = pd.factorize(df[by], sort=True)
+    position = df.groupby(codes).cumcount().to_numpy()
+    n_groups, n_rows = len(groups), int(position.max()) + 1 if len(df) else 0
+
+    values = df[x_cols].to_numpy(dtype=float)
+    response = df[y_col].to_numpy(dtype=float)
+
+    X = np.zeros((n_groups, n_rows, len(x_cols) + 1))
+    X[codes, position, 0] = 1.0
+    X[codes, position, 1:] = np.nan_to_num(values)
+    present = np.zeros((n_groups, n_rows, len(x_cols)), dtype=bool)
+    present[codes, position] = ~np.isnan(values)
+    y = np.zeros((n_groups, n_rows))
+    y[codes, position] = np.nan_to_num(response)
+    y_present = np.zeros((n_groups, n_rows), dtype=bool)
+    y_present[codes, position] = ~np.isnan(response)
+    return groups, X, y, np.concatenate([y_present[..., None], present], axis=2)
+
+
+def batched_ols(groups, X, y, present, x_cols, selected=None):
+    """Multiple regression for every group in one batched solve.
+
+    ``selected`` picks a subset of ``x_cols``; rows missing any selected
+    predictor (or the response) are dropped group by group. Returns a long
+    frame with one row per group and term.
+    """
+    selected = list(x_cols) if selected is None else list(selected)
+    columns = [0] + [x_cols.index(col) + 1 for col in selected]
+    Xs = X[:, :, columns]
+    # present[..., 0] is the response, present[..., i] the i-th predictor
+    weights = present[:, :, [0] + columns[1:]].all(axis=2).astype(float)
+
+    Xw = Xs * weights[..., None]
+    xtx = np.einsum("grp,grq->gpq", Xw, Xs)
+    xty = np.einsum("grp,gr->gp", Xw, y)
+    xtx_inv = np.linalg.pinv(xtx)
+    beta = np.einsum("gpq,gq->gp", xtx_inv, xty)
+
+    n = weights.sum(axis=1)
+    k = Xs.shape[2]
+    dof = n - k
+    residual = (y - np.einsum("grp,gp->gr", Xs, beta)) * weights
+    sse = (residual ** 2).sum(axis=1)
+    y_mean = (y * weights).sum(axis=1) / np.where(n > 0, n, 1)
+    sst = (((y - y_mean[:, None]) * weights) ** 2).sum(axis=1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sigma2 = np.where(dof > 0, sse / dof, np.nan)
+        se = np.sqrt(sigma2[:, None] * np.diagonal(xtx_inv, axis1=1, axis2=2))
+        t_value = beta / se
+        r_squared = 1 - sse / sst
+    p_value = 2 * _t_distribution().sf(np.abs(t_value), np.where(dof > 0, dof, np.nan)[:, None])
+
+    # Groups without enough complete rows to identify every coefficient
+    beta[dof <= 0] = np.nan
+
+    terms = ["Intercept"] + selected
+    result = pd.DataFrame({
+        "group": np.repeat(np.asarray(groups), k),
+        "term": np.tile(terms, len(groups)),
+        "coefficient": beta.ravel(),
+        "std_error": se.ravel(),
+        "t_value": t_value.ravel(),
+        "p_value": p_value.ravel(),
+        "n": np.repeat(n.astype(int), k),
+        "r_squared": np.repeat(r_squared, k)
+    })
+    return result
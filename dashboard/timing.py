@@ -0,0 +1,58 @@
+import functools
+import time
+from collections import deque
+
+import pandas as pd
+import streamlit as st
+
+# Rerun durations are kept per section in the session, newest last
+MAX_SAMPLES = 50
+FULL_PAGE = "Full page"
+
+
+def _samples():
+    return st.session_state.setdefault("rerun_timings", {})
+
+
+def record(section, ms):
+    _samples().setdefault(section, deque(maxlen=MAX_SAMPLES)).append(ms)
+
+
+def timed(section):
+    """Decorator recording how long a page section takes and captioning it.
+
+    Meant to sit under ``@st.fragment``: when the section's own widgets
+    trigger a fragment rerun, the caption compares that rerun with the last
+    full page run, which is what every interaction used to cost.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            record(section, (time.perf_counter() - start) * 1000)
+            st.caption(rerun_caption(section))
+            return result
+        return wrapper
+    return decorator
+
+
+def rerun_caption(section):
+    samples = _samples()
+    text = f"⏱️ {section} ran in {samples[section][-1]:,.0f} ms"
+    if FULL_PAGE in samples:
+        text += f" · last full page run: {samples[FULL_PAGE][-1]:,.0f} ms"
+    return text
+
+
+def rerun_report():
+    """Median and last duration of every timed section in this session."""
+    return pd.DataFrame([
+        {
+            "Section": section,
+            "Runs": len(values),
+            "Median (ms)": round(pd.Series(values).median()),
+            "Last (ms)": round(values[-1])
+        }
+        for section, values in _samples().items()
+    ])
@@ -0,0 +1,99 @@
+"""Warm the shared caches in the server process before the first visitor.
+
+Each page script is run once from a background thread, in a headless session
+of its own (see :mod:`dashboard.headless`): widgets return their defaults and
+the output goes nowhere, so a page fills exactly the data, statistics and
+figure caches that a first visit with the default settings would. The session
+is marked as the warm-up's, and :func:`tab_open` treats every lazily computed
+tab as open in it, so their caches are filled as well. Admin pages are not run.
+"""
+import threading
+import time
+
+import streamlit as st
+from streamlit import runtime
+from streamlit.logger import get_logger
+
+from dashboard import headless
+from dashboard.app_pages import ROOT, page_scripts
+
+_LOGGER = get_logger(__name__)
+# Session state key marking the warm-up's own session
+WARMUP_KEY = "dashboard_warmup"
+
+
+class WarmupStatus:
+    """Progress of the warm-up run, readable from any session."""
+
+    def __init__(self):
+        self.state = "idle"  # idle -> running -> ready
+        self.pages = {}  # page name -> seconds, or the error it raised
+        self.started = None
+        self.finished = None
+
+    @property
+    def ready(self):
+        return self.state == "ready"
+
+    @property
+    def failed(self):
+        return [page for page, result in self.pages.items() if isinstance(result, Exception)]
+
+    def summary(self):
+        if self.state == "idle":
+            return "Cache warm-up has not started."
+        if self.state == "running":
+            return f"Warming caches: {len(self.pages)} pages done…"
+        text = f"Caches warm: {len(self.pages)} pages in {self.finished - self.started:.1f} s"
+        if self.failed:
+            text += f" ({len(self.failed)} failed: {', '.join(self.failed)})"
+        return text
+
+
+_status = WarmupStatus()
+_lock = threading.Lock()
+
+
+def status():
+    return _status
+
+
+def tab_open(tab):
+    """Whether to compute a lazily rendered tab: ``tab.open``, or any tab in the warm-up session."""
+    return bool(tab.open) or st.session_state.get(WARMUP_KEY, False)
+
+
+def warm_up(pages=None):
+    """Run every page once in this thread, recording how long each took."""
+    _status.state, _status.started = "running", time.perf_counter()
+    try:
+        for path in pages or page_scripts():
+            start = time.perf_counter()
+            try:
+                tree = headless.run_script(path, {WARMUP_KEY: True})
+                if tree.exception:
+                    raise RuntimeError(tree.exception[0].message)
+                _status.pages[path.stem] = time.perf_counter() - start
+            except Exception as error:
+                _LOGGER.warning("Warm-up of %s failed: %s", path.name, error)
+                _status.pages[path.stem] = error
+    finally:
+        _status.state, _status.finished = "ready", time.perf_counter()
+    _LOGGER.info(_status.summary())
+    return _status
+
+
+def _run_when_server_is_up():
+    # Caches created before the runtime exists would not use its storage manager
+    while not runtime.exists():
+        time.sleep(0.1)
+    warm_up()
+
+
+def start():
+    """Start the warm-up in a daemon thread, once per process."""
+    with _lock:
+        if _status.state == "idle":
+            _status.state = "running"
+            threading.Thread(target=_run_when_server_is_up, name="cache-warmup", daemon=True).start()
+    return _status
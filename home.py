@@ -0,0 +1,60 @@
+import streamlit as st
+
+from dashboard import warmup
+
+st.set_page_config(
+    page_title="Analysis of Healthcare Expenditure and Its Impact",
+    page_icon="🌍",
+    layout="wide"
+)
+
+# Pre-run every page in the background once per server process, so later
+# first visits hit warm caches (python -m dashboard.serve starts it at launch)
+st.sidebar.caption(warmup.start().summary())
+
+st.title("ICT305 Assignment 2 Group 2")
+
+st.write("**Topic: The Foundational Role of Healthcare in Societal Well-being**")
+
+st.markdown("""
+## 🏥 Introduction
+
+Healthcare is more than just the treatment of illness; it is a fundamental pillar that underpins the well-being of individuals, communities, and entire societies, reaching to the very health of our global population. At its core, robust healthcare ensures access to essential services, promotes preventive care, and mitigates the spread of disease, leading to healthier populations and increased life expectancy. The impact of healthcare extends far beyond the realm of medicine, profoundly influencing economic productivity, social equity, and overall quality of life.
+
+On an individual level, access to quality healthcare empowers people to live healthier, more fulfilling lives. It allows them to manage chronic conditions, recover from illness and injury, and maintain their physical and mental well-being. Healthy individuals are more likely to be productive members of society, pursue education and personal growth, and contribute to their communities. The impact of this manifests in greater personal happiness, reduced suffering, and the ability to live a full and active life.
+
+## 🔑 Key Factors Influencing Healthcare Impact
+
+### 👩‍⚕️ 1. Importance of Manpower in Healthcare
+For the healthcare system to provide prompt and efficient care, it must have an adequate amount of employees. The availability of qualified medical personnel guarantees that patients will receive high-quality care, appropriate treatment, and accurate diagnoses. Delays, higher death rates, and lower patient satisfaction can result from a shortage of healthcare workers.
+
+### 📚 2. Literacy Rate and Health Education
+The results of healthcare are greatly impacted by a higher literacy rate. People with higher levels of education are more likely to adopt healthier lifestyles, seek medical attention when needed, and comprehend disease prevention strategies. Early healthcare education in schools can result in a population that values health and well-being and is well-informed, which will ultimately ease the strain on healthcare systems.
+
+### ⏳ 3. Life Expectancy and Healthcare Investment
+The effectiveness and accessibility of a country's healthcare system have a direct impact on life expectancy. Longer, healthier lives are a result of investments in medical research, preventive care, and cutting-edge therapies. Higher healthcare spending is typically associated with better public health overall and lower mortality rates.
+
+### 💉 4. Healthcare Expenditure on Vaccination
+In order to control infectious diseases and stop outbreaks, vaccination is essential. More funding for immunization campaigns results in lower medical expenses, herd immunity, and fewer deaths from disease. Countries that invest significantly in immunization programs typically see a decrease in avoidable illnesses, which improves the general well-being of their populations.
+
+## 🌎 Global and Community-Level of Impact
+
+Strong healthcare systems at level with the community support economic stability, social cohesion, and the reduction of disparities in medical care. Communities prosper when healthcare is equitable and available. Adults can work, children can go to school, and senior citizens can age with reverence. Furthermore, entire communities are shielded from the spread of infectious diseases by efficient public health measures like immunizations and sanitation. Stronger social ties, lower crime rates, and a more thriving local economy are all results of the implications.
+
+Globally, healthcare plays a vital role in economic growth, security, and international development. Global issues that necessitate international cooperation include the spread of infectious diseases across national boundaries, the difficulties of delivering healthcare in environments with limited resources, and the growing expense of healthcare. Countries can lay the groundwork for sustainable development, prosperity, and a more just and equitable future for all by investing in and bolstering healthcare systems around the world. In addition to improving health outcomes, this cooperative strategy boosts world economies and advances stability and peace. A more secure and connected world with more economic opportunity and less human suffering is the result of global healthcare initiatives.
+
+## 👥 Group Members for Group 2
+
+**Muhammad Syafiq Bin Wahinudin**  
+*Student ID: 35279456*
+
+**Davern Zhilong Sim**  
+*Student ID: 35245935*
+
+**Pang Damian Ze Yu**  
+*Student ID: 35214879*
+
+**Tuan An Truong**  
+*Student ID: 35304835*
+
+""")
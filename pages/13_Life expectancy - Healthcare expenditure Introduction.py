@@ -1,7 +1,9 @@
-import pandas as pd
 import plotly.express as px
 import streamlit as st
 
+from dashboard.data import LIFE_EXP_FILE, LIFE_METADATA_FILE, data_version, load_life_expectancy
+from dashboard.derived import load_derived, show_status
+from dashboard.figures import cached_figure
 
 
 # App title
@@ -48,23 +50,8 @@ st.markdown("---")
 st.header("Life Expectancy Data Exploration (2000–2022)")
 st.markdown("Visualize global life expectancy trends by country and region.")
 
-# Load life expectancy data
-life_expectancy_df = pd.read_csv('data/API_SP.DYN.LE00.IN_DS2_en_CSV_v2_76065.csv', skiprows=4)
-metadata_df = pd.read_csv("data/Metadata_Country_API_SP.DYN.LE00.IN_DS2_en_CSV_v2_76065.csv")
-
-# Clean and reshape
-life_expectancy_df = life_expectancy_df[['Country Name', 'Country Code'] + [str(year) for year in range(2000, 2023)]]
-df_long = life_expectancy_df.melt(
-    id_vars=["Country Name", "Country Code"],
-    value_vars=[str(year) for year in range(2000, 2023)],
-    var_name="Year",
-    value_name="Life Expectancy"
-)
-df_long.dropna(subset=["Life Expectancy"], inplace=True)
-df_long["Year"] = df_long["Year"].astype(int)
-
-# Merge region info
-df_long = df_long.merge(metadata_df[["Country Code", "Region"]], on="Country Code", how="left")
+# Load life expectancy data, reshaped to one row per country and year with its region
+df_long = load_life_expectancy()
 
 # --- Choropleth Map ---
 st.subheader("Global Life Expectancy: A World of Inequality")
@@ -75,19 +62,62 @@ st.markdown("The choropleth map serves to visually represent the global distribu
             "differences between country, regions and those facing economic and "
             "healthcare challenges, thus setting the stage for further analysis into "
             "the factors driving these disparities")
-selected_year = st.slider("Select Year", 2000, 2022, 2010)
-map_df = df_long[df_long["Year"] == selected_year]
-
-choropleth_map = px.choropleth(
-    map_df,
-    locations="Country Code",
-    color="Life Expectancy",
-    hover_name="Country Name",
-    color_continuous_scale="Viridis",
-    projection="natural earth",
-    title=f"Regional Disparities in Life Expectancy in {selected_year}"
+animate_years = st.toggle(
+    "Animate all years (scrub without reloading)",
+    help="Sends every year as an animation frame once; the play button and slider under the map then switch years in the browser."
 )
-choropleth_map.update_layout(margin={"r": 0, "t": 40, "l": 0, "b": 0})
+selected_year = 2010 if animate_years else st.slider("Select Year", 2000, 2022, 2010)
+
+
+def build_choropleth():
+    map_df = df_long[df_long["Year"] == selected_year]
+    fig = px.choropleth(
+        map_df,
+        locations="Country Code",
+        color="Life Expectancy",
+        hover_name="Country Name",
+        color_continuous_scale="Viridis",
+        projection="natural earth",
+        title=f"Regional Disparities in Life Expectancy in {selected_year}"
+    )
+    fig.update_layout(margin={"r": 0, "t": 40, "l": 0, "b": 0})
+    return fig
+
+
+def build_animated_choropleth():
+    # One frame per year on a fixed colour scale, so years can be compared
+    frames_df = df_long.sort_values(["Year", "Country Code"])
+    years = sorted(frames_df["Year"].unique())
+    fig = px.choropleth(
+        frames_df,
+        locations="Country Code",
+        color="Life Expectancy",
+        hover_name="Country Name",
+        animation_frame="Year",
+        range_color=(frames_df["Life Expectancy"].min(), frames_df["Life Expectancy"].max()),
+        color_continuous_scale="Viridis",
+        projection="natural earth",
+        title="Regional Disparities in Life Expectancy, 2000–2022"
+    )
+    # Open on the same year as the static map
+    start = years.index(selected_year)
+    fig.data[0].update(fig.frames[start].data[0])
+    fig.layout.sliders[0].active = start
+    fig.update_layout(margin={"r": 0, "t": 40, "l": 0, "b": 0})
+    return fig
+
+
+if animate_years:
+    choropleth_map = cached_figure(
+        "life_expectancy_choropleth_animated", build_animated_choropleth,
+        version=data_version(LIFE_EXP_FILE, LIFE_METADATA_FILE)
+    )
+else:
+    choropleth_map = cached_figure(
+        "life_expectancy_choropleth", build_choropleth,
+        version=data_version(LIFE_EXP_FILE, LIFE_METADATA_FILE),
+        selected_year=selected_year
+    )
 st.plotly_chart(choropleth_map, use_container_width=True)
 
 st.markdown("""
@@ -114,8 +144,10 @@ emphasizing the need for targeted interventions and investments to improve life
 st.subheader("Life Expectancy Trends: Regional Progress and Persistent Disparities (2000–2022)")
 st.markdown(" This line chart shows how average life expectancy changed from 2000 to 2022 across different global regions. "
             "The purpose is to compare life expectancy trends and disparities between regions over time.")
-region_df = df_long.dropna(subset=["Region"])
-region_avg = region_df.groupby(["Region", "Year"])["Life Expectancy"].mean().reset_index()
+# Region and income-group averages are precomputed (python -m dashboard.precompute)
+show_status("wdi_group_averages")
+group_averages = load_derived("wdi_group_averages")
+region_avg = group_averages["region_life_expectancy"]
 
 line_chart = px.line(
     region_avg,
@@ -164,28 +196,7 @@ import plotly.express as px
 import streamlit as st
 
 # --- Load Data ---
-life_expectancy_df = pd.read_csv('data/API_SP.DYN.LE00.IN_DS2_en_CSV_v2_76065.csv', skiprows=4)
-metadata_df = pd.read_csv("data/Metadata_Country_API_SP.DYN.LE00.IN_DS2_en_CSV_v2_76065.csv")
-
-# --- Process Data ---
-life_expectancy_df = life_expectancy_df[['Country Name', 'Country Code'] + [str(year) for year in range(2000, 2023)]]
-life_expectancy_df_long = life_expectancy_df.melt(
-    id_vars=["Country Name", "Country Code"],
-    value_vars=[str(year) for year in range(2000, 2023)],
-    var_name="Year",
-    value_name="Life Expectancy"
-)
-
-life_expectancy_df_long = life_expectancy_df_long.merge(
-    metadata_df[["Country Code", "IncomeGroup"]],
-    on="Country Code",
-    how="left"
-)
-
-life_expectancy_df_long.dropna(subset=["Life Expectancy", "IncomeGroup"], inplace=True)
-life_expectancy_df_long["Year"] = life_expectancy_df_long["Year"].astype(int)
-
-income_avg = life_expectancy_df_long.groupby(["Year", "IncomeGroup"])["Life Expectancy"].mean().reset_index()
+income_avg = group_averages["income_life_expectancy"]
 
 # color map
 color_map = {
@@ -271,31 +282,8 @@ and low-income countries. This analysis aims to set the stage for exploring the
 between healthcare expenditure and life expectancy, a central question in our investigation.
 """)
 
-# Load healthcare expenditure data
-health_exp_df = pd.read_csv("data/API_SH.XPD.CHEX.PC.CD_DS2_en_csv_v2_75935.csv", skiprows=4)
-metadata_df = pd.read_csv("data/Metadata_Country_API_SH.XPD.CHEX.PC.CD_DS2_en_csv_v2_75935.csv")
-
-# Reshape to long format
-health_exp_long = health_exp_df.melt(
-    id_vars=["Country Name", "Country Code"],
-    value_vars=[str(year) for year in range(2000, 2023)],
-    var_name="Year",
-    value_name="Health Expenditure"
-)
-
-# Merge with income group info
-merged_df = pd.merge(
-    health_exp_long,
-    metadata_df[["Country Code", "IncomeGroup"]],
-    on="Country Code",
-    how="left"
-)
-
-# Clean and group
-merged_df.dropna(subset=["Health Expenditure", "IncomeGroup"], inplace=True)
-merged_df["Year"] = merged_df["Year"].astype(int)
-
-income_trend = merged_df.groupby(["IncomeGroup", "Year"])["Health Expenditure"].mean().reset_index()
+# Average healthcare expenditure per income group and year
+income_trend = group_averages["income_health_expenditure"]
 
 # Define a custom color sequence (high contrast, colorblind-friendly)
 custom_colors = px.colors.qualitative.Set2
@@ -1,72 +1,60 @@
-import pandas as pd
-import plotly.express as px
+import plotly.graph_objects as go
 import streamlit as st
-import statsmodels.api as sm
-
-# --- Load Datasets ---
-health_exp_df = pd.read_csv("data/API_SH.XPD.CHEX.PC.CD_DS2_en_csv_v2_75935.csv", skiprows=4)
-life_expectancy_df = pd.read_csv("data/API_SP.DYN.LE00.IN_DS2_en_CSV_v2_76065.csv", skiprows=4)
-
-# --- Reshape Both to Long Format ---
-health_exp_long = health_exp_df.melt(
-    id_vars=["Country Name", "Country Code"],
-    value_vars=[str(year) for year in range(2000, 2023)],
-    var_name="Year",
-    value_name="Health Expenditure"
-)
 
-life_exp_long = life_expectancy_df.melt(
-    id_vars=["Country Name", "Country Code"],
-    value_vars=[str(year) for year in range(2000, 2023)],
-    var_name="Year",
-    value_name="Life Expectancy"
-)
+from dashboard.cache import cached
+from dashboard.data import load_wdi_panel
+from dashboard.plotting import payload_report, scatter
+from dashboard.stats import fit, influence, refit_without
+
+X_COL = "Health Expenditure"
+Y_COL = "Life Expectancy"
+
+
+@cached("statistics")
+def pooled_regression(selected_year):
+    """OLS fit plus per-observation influence statistics for one year (or all years)."""
+    panel = load_wdi_panel()
+    data = panel if selected_year == "All Years" else panel[panel["Year"] == selected_year]
+    coefs = fit(data, X_COL, Y_COL)
+    data = data.join(influence(data, X_COL, Y_COL, coefs=coefs))
+    refit = refit_without(data, X_COL, Y_COL, data["influential"])
+    return data, coefs.iloc[0], refit.iloc[0]
 
-# --- Merge on Country Code and Year ---
-merged_long = pd.merge(
-    health_exp_long,
-    life_exp_long,
-    on=["Country Code", "Year"],
-    suffixes=("_Health", "_Life")
-)
 
 st.header("The Link: Healthcare Spending and Life Expectancy")
 st.markdown("""
  The scatter plot under is to assess directly the relationship between healthcare expenditure and life expectancy, we performed a regression analysis.
 This allows us to quantify the impact of healthcare spending on life expectancy, controlling for other factors.
 """)
-# --- Clean ---
-merged_long.dropna(subset=["Health Expenditure", "Life Expectancy"], inplace=True)
-merged_long["Year"] = merged_long["Year"].astype(int)
 
 # --- Year Selection ---
 year_options = ["All Years"] + list(range(2000, 2023))
 selected_year = st.selectbox("Select Year for Analysis", year_options, index=0)
 
-# --- Analysis Based on Year Selection ---
-if selected_year == "All Years":
-    data_to_use = merged_long
-else:
-    data_to_use = merged_long[merged_long["Year"] == selected_year]
+influence_cols = st.columns(2)
+with influence_cols[0]:
+    highlight_influential = st.toggle("Highlight high-influence countries", value=False)
+with influence_cols[1]:
+    exclude_influential = st.toggle("Refit without high-influence countries", value=False)
+decimate_points = st.toggle("Thin overlapping points (faster chart)", value=True,
+                            help="Keeps outliers, extremes and high-influence points; the trendline still uses every point.")
 
-# --- Regression with statsmodels ---
-X = data_to_use['Health Expenditure']
-y = data_to_use['Life Expectancy']
-X = sm.add_constant(X)
-model = sm.OLS(y, X).fit()
+# --- Analysis Based on Year Selection ---
+data_to_use, model, refit_model = pooled_regression(selected_year)
+influential_points = data_to_use[data_to_use["influential"]]
 
 # --- Extract values ---
-slope = model.params['Health Expenditure']
-r_squared = model.rsquared
-p_value = model.pvalues['Health Expenditure']
-correlation = data_to_use['Health Expenditure'].corr(data_to_use['Life Expectancy'])
+slope = model["slope"]
+r_squared = model["r_squared"]
+p_value = model["p_value"]
+correlation = data_to_use[X_COL].corr(data_to_use[Y_COL])
 
 # --- Create Scatter Plot with Color ---
 plot_title = f"Regression: Health Expenditure vs Life Expectancy ({selected_year})" \
     if selected_year != "All Years" \
     else "Regression: Health Expenditure vs Life Expectancy (2000–2022, All Countries)"
 
-regression_plot = px.scatter(
+regression_plot, scatter_info = scatter(
     data_to_use,
     x="Health Expenditure",
     y="Life Expectancy",
@@ -79,8 +67,32 @@ regression_plot = px.scatter(
     log_x=True,
     template="plotly_dark",  # Use a dark template for better color contrast
     color="Year" if selected_year == "All Years" else None, #add color for all years
+    max_points=2000 if decimate_points else None,
+    keep="influential"
 )
 
+if highlight_influential and not influential_points.empty:
+    regression_plot.add_trace(go.Scatter(
+        x=influential_points[X_COL],
+        y=influential_points[Y_COL],
+        mode="markers",
+        name="High influence (Cook's D > 4/n)",
+        marker=dict(symbol="circle-open", size=12, color="red", line=dict(width=2)),
+        customdata=influential_points[["Country Name", "Year", "cooks_d", "leverage"]].values,
+        hovertemplate="<b>%{customdata[0]}</b> (%{customdata[1]})<br>"
+                      "Cook's D: %{customdata[2]:.4f}<br>Leverage: %{customdata[3]:.4f}<extra></extra>"
+    ))
+
+if exclude_influential:
+    x_line = data_to_use[X_COL].sort_values()
+    regression_plot.add_trace(go.Scatter(
+        x=x_line,
+        y=refit_model["intercept"] + refit_model["slope"] * x_line,
+        mode="lines",
+        name="Refit without high-influence points",
+        line=dict(color="orange", dash="dash")
+    ))
+
 regression_plot.update_layout(
     xaxis_title="Health Expenditure per Capita (USD, Log Scale)",
     yaxis_title="Life Expectancy (Years)",
@@ -91,6 +103,7 @@ regression_plot.update_layout(
 
 # --- Display in Streamlit ---
 st.plotly_chart(regression_plot, use_container_width=True)
+st.caption(payload_report(regression_plot, scatter_info))
 
 st.markdown(f"""
 **Regression Analysis ({selected_year}):**
@@ -101,6 +114,25 @@ st.markdown(f"""
 * **Correlation:** {correlation:.4f}
 """)
 
+if exclude_influential:
+    st.markdown(f"""
+**Refit without {len(influential_points)} high-influence points:**
+
+* **Slope:** {refit_model["slope"]:.4f}
+* **R-squared:** {refit_model["r_squared"]:.4f}
+* **P-value:** {refit_model["p_value"]:.4f}
+""")
+
+if highlight_influential:
+    st.markdown("**Most influential observations (Cook's distance):**")
+    st.dataframe(
+        influential_points.nlargest(10, "cooks_d")[
+            ["Country Name", "Year", X_COL, Y_COL, "leverage", "student_resid", "cooks_d"]
+        ],
+        hide_index=True,
+        use_container_width=True
+    )
+
 st.markdown("**Key Observations:**")
 
 st.markdown("""
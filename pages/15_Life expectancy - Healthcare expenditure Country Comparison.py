@@ -1,84 +1,89 @@
-import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
 import streamlit as st
-import statsmodels.api as sm
 
+from dashboard.data import HEALTH_EXP_FILE, LIFE_EXP_FILE, METADATA_FILE, data_version, load_wdi_panel
+from dashboard.derived import load_derived, show_status
+from dashboard.selection import country_select, subset
 
+X_COL = "Health Expenditure"
+Y_COL = "Life Expectancy"
+COUNTRY_COL = "Country Name"
 
 
+def country_regressions(selected_countries):
+    """Per-country OLS fits and influence statistics, from the precomputed tables."""
+    tables = load_derived("country_regressions")
+    observations = tables["country_observations"]
+    data = subset(observations, "country_observations", data_version(HEALTH_EXP_FILE, LIFE_EXP_FILE, METADATA_FILE),
+                  countries=selected_countries)
+    coefs = tables["country_fits"]
+    refit = tables["country_refits"]
+    return data, coefs[coefs.index.isin(selected_countries)], refit[refit.index.isin(selected_countries)]
 
-# --- Load Datasets ---
-health_exp_df = pd.read_csv('data/API_SH.XPD.CHEX.PC.CD_DS2_en_csv_v2_75935.csv', skiprows=4)
-life_expectancy_df = pd.read_csv('data/API_SP.DYN.LE00.IN_DS2_en_CSV_v2_76065.csv', skiprows=4)
 
-# --- Reshape Both to Long Format ---
-health_exp_long = health_exp_df.melt(
-    id_vars=["Country Name", "Country Code"],
-    value_vars=[str(year) for year in range(2000, 2023)],
-    var_name="Year",
-    value_name="Health Expenditure"
-)
-
-life_exp_long = life_expectancy_df.melt(
-    id_vars=["Country Name", "Country Code"],
-    value_vars=[str(year) for year in range(2000, 2023)],
-    var_name="Year",
-    value_name="Life Expectancy"
-)
-
-# --- Merge datasets ---
-merged_long = pd.merge(
-    health_exp_long,
-    life_exp_long,
-    on=["Country Code", "Year"],
-    suffixes=("_Health", "_Life")
-)
-
-# --- Drop missing values and convert year to int ---
-merged_long.dropna(subset=["Health Expenditure", "Life Expectancy"], inplace=True)
-merged_long["Year"] = merged_long["Year"].astype(int)
+# --- Load Dataset ---
+merged_long = load_wdi_panel()
 
 # --- Country Selection ---
-all_countries = sorted(merged_long["Country Name_Life"].unique())
+all_countries = sorted(merged_long[COUNTRY_COL].unique())
 default_countries = ["Australia","India", "China", "Japan", "Indonesia", "Algeria"]
-selected_countries = st.multiselect("Select Countries for Analysis", all_countries, default=default_countries)
+selected_countries = country_select("Select Countries for Analysis", all_countries, default=default_countries,
+                                    key="comparison_countries")
 
-# --- Filter for selected countries ---
-filtered_df = merged_long[merged_long["Country Name_Life"].isin(selected_countries)].copy()
+influence_cols = st.columns(2)
+with influence_cols[0]:
+    highlight_influential = st.toggle("Highlight high-influence years", value=False)
+with influence_cols[1]:
+    exclude_influential = st.toggle("Refit without high-influence years", value=False)
 
-# --- Calculate regression statistics for each country ---
-regression_results = {}
-for country in selected_countries:
-    country_data = filtered_df[filtered_df["Country Name_Life"] == country]
-    if not country_data.empty:  # check if the country has data
-        X = country_data["Health Expenditure"]
-        y = country_data["Life Expectancy"]
-        X = sm.add_constant(X)
-        model = sm.OLS(y, X).fit()
-        regression_results[country] = {
-            "slope": model.params["Health Expenditure"],
-            "r_squared": model.rsquared,
-            "p_value": model.pvalues["Health Expenditure"]
-        }
-    else:
-        regression_results[country] = None
+# --- Regression statistics for each selected country ---
+show_status("country_regressions")
+filtered_df, regression_results, refit_results = country_regressions(tuple(selected_countries))
+if exclude_influential:
+    regression_results = refit_results
 
 # --- Plot with trendline for each country ---
 fig = px.scatter(
     filtered_df,
     x="Health Expenditure",
     y="Life Expectancy",
-    color="Country Name_Life",
+    color=COUNTRY_COL,
     trendline="ols",
     title="Country-Specific Trends: Healthcare Expenditure vs. Life Expectancy",
     labels={
         "Health Expenditure": "Health Expenditure per Capita (USD)",
         "Life Expectancy": "Life Expectancy (Years)",
-        "Country Name_Life": "Country"
+        COUNTRY_COL: "Country"
     },
     log_x=True,
     template="plotly_white"
 )
+
+influential_points = filtered_df[filtered_df["influential"]]
+if highlight_influential and not influential_points.empty:
+    fig.add_trace(go.Scatter(
+        x=influential_points[X_COL],
+        y=influential_points[Y_COL],
+        mode="markers",
+        name="High influence (Cook's D > 4/n)",
+        marker=dict(symbol="circle-open", size=12, color="red", line=dict(width=2)),
+        customdata=influential_points[[COUNTRY_COL, "Year", "cooks_d", "leverage"]].values,
+        hovertemplate="<b>%{customdata[0]}</b> (%{customdata[1]})<br>"
+                      "Cook's D: %{customdata[2]:.4f}<br>Leverage: %{customdata[3]:.4f}<extra></extra>"
+    ))
+
+if exclude_influential:
+    for country, stats in refit_results.iterrows():
+        x_line = filtered_df.loc[filtered_df[COUNTRY_COL] == country, X_COL].sort_values()
+        fig.add_trace(go.Scatter(
+            x=x_line,
+            y=stats["intercept"] + stats["slope"] * x_line,
+            mode="lines",
+            name=f"{country} (refit)",
+            line=dict(dash="dash")
+        ))
+
 st.header("Comparative Analysis: Healthcare Spending vs Life Expectancy (Selected Countries, 2000-2022)")
 st.markdown("""
 This plot compares the relationship between healthcare expenditure per capita 
@@ -92,24 +97,29 @@ and effectiveness of healthcare investments.
 st.plotly_chart(fig, use_container_width=True)
 
 # --- Display regression statistics in a table ---
-st.markdown("**Regression Analysis: Statistical Summary**")
+st.markdown("**Regression Analysis: Statistical Summary**"
+            + (" (refit without high-influence years)" if exclude_influential else ""))
+
+influence_counts = filtered_df.groupby(COUNTRY_COL)["influential"].sum()
 
 table_data = []
 for country in selected_countries:
-    if regression_results[country] is not None:
-        stats = regression_results[country]
+    if country in regression_results.index:
+        stats = regression_results.loc[country]
         table_data.append({
             "Country": country,
             "Slope": f"{stats['slope']:.4f}",
             "R-squared": f"{stats['r_squared']:.4f}",
-            "P-value": f"{stats['p_value']:.4f}"
+            "P-value": f"{stats['p_value']:.4f}",
+            "High-influence years": int(influence_counts.get(country, 0))
         })
     else:
         table_data.append({
             "Country": country,
             "Slope": "N/A",
             "R-squared": "N/A",
-            "P-value": "N/A"
+            "P-value": "N/A",
+            "High-influence years": "N/A"
         })
 
 st.table(table_data)
@@ -1,37 +1,17 @@
-
-import pandas as pd
 import plotly.express as px
 import streamlit as st
 
+from dashboard.data import load_wdi_panel
+from dashboard.derived import load_derived, show_status
+from dashboard.plotting import payload_report, scatter
+
 # Load data
-health_exp_df = pd.read_csv('data/API_SH.XPD.CHEX.PC.CD_DS2_en_csv_v2_75935.csv', skiprows=4)
-life_exp_df = pd.read_csv('data/API_SP.DYN.LE00.IN_DS2_en_CSV_v2_76065.csv', skiprows=4)
-metadata_df = pd.read_csv('data/Metadata_Country_API_SH.XPD.CHEX.PC.CD_DS2_en_csv_v2_75935.csv')
-
-# Reshape
-health_long = health_exp_df.melt(id_vars=["Country Name", "Country Code"],
-                                  value_vars=[str(y) for y in range(2000, 2023)],
-                                  var_name="Year", value_name="Health Expenditure")
-
-life_long = life_exp_df.melt(id_vars=["Country Name", "Country Code"],
-                              value_vars=[str(y) for y in range(2000, 2023)],
-                              var_name="Year", value_name="Life Expectancy")
-
-# Merge
-df = pd.merge(health_long, life_long, on=["Country Code", "Year"])
-df = pd.merge(df, metadata_df[["Country Code", "IncomeGroup"]], on="Country Code", how="left")
-df.dropna(subset=["Health Expenditure", "Life Expectancy", "IncomeGroup"], inplace=True)
-df["Year"] = df["Year"].astype(int)
-
-# Calculate correlation per income group (all years)
-correlation_data = []
-for group in df["IncomeGroup"].unique():
-    subset = df[df["IncomeGroup"] == group]
-    if len(subset) > 2:
-        r = subset["Health Expenditure"].corr(subset["Life Expectancy"])
-        correlation_data.append({"IncomeGroup": group, "Correlation": r})
-
-correlation_df = pd.DataFrame(correlation_data)
+df = load_wdi_panel().dropna(subset=["IncomeGroup"])
+
+# Correlation per income group (all years) and per-year elasticities are precomputed
+show_status("income_group_statistics")
+income_group_statistics = load_derived("income_group_statistics")
+correlation_df = income_group_statistics["income_group_correlations"]
 
 # Plot with trendlines (all years, grouped by income)
 color_map = {
@@ -41,20 +21,21 @@ color_map = {
     'Upper middle income': '#FAC0BE'
 }
 
-fig_scatter = px.scatter(
+fig_scatter, scatter_info = scatter(
     df,
     x="Health Expenditure",
     y="Life Expectancy",
     color="IncomeGroup",
     trendline="ols",
-    hover_name="Country Name_x",
+    hover_name="Country Name",
     title="Healthcare Spending and Life Expectancy by Income Level (2000-2022)",
     labels={
         "Health Expenditure": "Health Expenditure per Capita (USD)",
         "Life Expectancy": "Life Expectancy (Years)"
     },
     log_x=True,
-    color_discrete_map=color_map
+    color_discrete_map=color_map,
+    max_points=2000
 )
 
 fig_scatter.update_layout(template="plotly_white")
@@ -87,8 +68,41 @@ expectancy. This aims to highlight the systemic impact of economic status
 on health outcomes and to inform targeted interventions.
 """)
 st.plotly_chart(fig_scatter, use_container_width=True)
+st.caption(payload_report(fig_scatter, scatter_info) + " · trendlines fitted on all points")
 st.plotly_chart(fig_corr, use_container_width=True)
 
+# Elasticity of life expectancy to spending, per income group and year
+st.subheader("Elasticity Over Time: How Much Does 1% More Spending Buy?")
+st.markdown("""
+The correlation above pools all 23 years together. The small multiples below instead show, for every income 
+group and year, the slope of log life expectancy on log healthcare expenditure. This elasticity is the 
+percentage change in life expectancy associated with a 1% increase in spending per capita. Error bars mark 
+the 95% confidence interval (±1.96 standard errors).
+""")
+
+elasticity_df = income_group_statistics["income_group_elasticities"]
+
+fig_elasticity = px.line(
+    elasticity_df,
+    x="Year",
+    y="Elasticity",
+    error_y="95% CI",
+    color="IncomeGroup",
+    facet_col="IncomeGroup",
+    facet_col_wrap=2,
+    markers=True,
+    hover_data={"Standard Error": ":.4f", "Countries": True, "R-squared": ":.3f", "95% CI": False},
+    title="Log-Log Elasticity of Life Expectancy to Health Expenditure by Income Group (2000-2022)",
+    labels={"Elasticity": "Elasticity"},
+    color_discrete_map=color_map
+)
+fig_elasticity.for_each_annotation(lambda a: a.update(text=a.text.split("=")[-1]))
+fig_elasticity.update_layout(template="plotly_white", showlegend=False, height=600)
+st.plotly_chart(fig_elasticity, use_container_width=True)
+
+with st.expander("Elasticity estimates (table)"):
+    st.dataframe(elasticity_df.drop(columns="95% CI"), hide_index=True, use_container_width=True)
+
 # Interpretation and Call to Actions
 st.markdown("**Key Observations:**")
 
@@ -1,27 +1,13 @@
-
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-
-# Load data
-health_exp_df = pd.read_csv('data/API_SH.XPD.CHEX.PC.CD_DS2_en_csv_v2_75935.csv', skiprows=4)
-life_exp_df = pd.read_csv('data/API_SP.DYN.LE00.IN_DS2_en_CSV_v2_76065.csv', skiprows=4)
-metadata_df = pd.read_csv('data/Metadata_Country_API_SH.XPD.CHEX.PC.CD_DS2_en_csv_v2_75935.csv')
 
-# Reshape
-health_long = health_exp_df.melt(id_vars=["Country Name", "Country Code"],
-                                  value_vars=[str(y) for y in range(2000, 2023)],
-                                  var_name="Year", value_name="Health Expenditure")
+from dashboard.data import HEALTH_EXP_FILE, LIFE_EXP_FILE, METADATA_FILE, data_version, load_wdi_panel
+from dashboard.figures import cached_figure
+from dashboard.plotting import trajectories_3d
+from dashboard.selection import country_select, income_group_select
 
-life_long = life_exp_df.melt(id_vars=["Country Name", "Country Code"],
-                              value_vars=[str(y) for y in range(2000, 2023)],
-                              var_name="Year", value_name="Life Expectancy")
-
-# Merge
-df = pd.merge(health_long, life_long, on=["Country Code", "Year"])
-df = pd.merge(df, metadata_df[["Country Code", "IncomeGroup", "Region"]], on="Country Code", how="left")
-df.dropna(subset=["Health Expenditure", "Life Expectancy", "IncomeGroup", "Region"], inplace=True)
-df["Year"] = df["Year"].astype(int)
+# Load data
+df = load_wdi_panel().dropna(subset=["IncomeGroup", "Region"])
+wdi_version = data_version(HEALTH_EXP_FILE, LIFE_EXP_FILE, METADATA_FILE)
 
 # --- 3D Line Plot ---
 st.title("Comprehensive Conclusion: Healthcare Expenditure and Life Expectancy Analysis")
@@ -33,54 +19,61 @@ It allows for an interactive exploration of how these variables evolve together.
 """)
 
 # Default countries and income groups
-all_countries = sorted(df["Country Name_x"].unique())
+all_countries = sorted(df["Country Name"].unique())
 all_groups = sorted(df["IncomeGroup"].unique())
 default_countries = ["Australia", "India", "China", "Japan", "Indonesia", "Algeria"]
 default_groups = all_groups
 
 # Multiselect for countries and income groups
-selected_countries = st.multiselect("Select Countries", all_countries, default=default_countries)
-selected_groups = st.multiselect("Select Income Groups", all_groups, default=default_groups)
-
-# Average data by income group
-avg_group_data = df.groupby(["IncomeGroup", "Year"])[["Health Expenditure", "Life Expectancy"]].mean().reset_index()
-
-# Filter data for countries
-filtered_country_data = df[df["Country Name_x"].isin(selected_countries)]
-
-# Combine data for plotting
-plot_data = pd.concat([
-    filtered_country_data[filtered_country_data["IncomeGroup"].isin(selected_groups)],
-    avg_group_data[avg_group_data["IncomeGroup"].isin(selected_groups)]
-])
-
-# 3D line plot
-fig_3d_line = px.line_3d(
-    plot_data,
-    x="Year",
-    y="Health Expenditure",
-    z="Life Expectancy",
-    color="IncomeGroup",
-    line_group=plot_data.apply(lambda row: row['Country Name_x'] if 'Country Name_x' in row else row['IncomeGroup'], axis=1),
-    hover_name=plot_data.apply(lambda row: row['Country Name_x'] if 'Country Name_x' in row else row['IncomeGroup'], axis=1),
-    title="3D Line Plot: Healthcare Spending, Life Expectancy, and Year",
-    labels={
-        "Health Expenditure": "Health Expenditure (USD)",
-        "Life Expectancy": "Life Expectancy (Years)",
-        "Year": "Year"
-    },
-    template="plotly_white"
-)
-
-fig_3d_line.update_layout(
-    scene=dict(
-        xaxis=dict(title="Year"),
-        yaxis=dict(title="Health Expenditure (USD)"),
-        zaxis=dict(title="Life Expectancy (Years)")
+selected_countries = country_select("Select Countries", all_countries, default=default_countries,
+                                    key="conclusion_countries")
+selected_groups = income_group_select("Select Income Groups", all_groups, default=default_groups,
+                                      key="conclusion_income_groups")
+
+def build_3d_line():
+    # Average data by income group, labelled by group for hover
+    avg_group_data = df.groupby(["IncomeGroup", "Year"])[["Health Expenditure", "Life Expectancy"]].mean().reset_index()
+    avg_group_data["Label"] = avg_group_data["IncomeGroup"] + " (average)"
+
+    # Filter data for countries, keeping the selection order
+    filtered_country_data = df[df["Country Name"].isin(selected_countries) & df["IncomeGroup"].isin(selected_groups)]
+    filtered_country_data = filtered_country_data.assign(Label=filtered_country_data["Country Name"])
+    order = {country: i for i, country in enumerate(selected_countries)}
+    filtered_country_data = filtered_country_data.sort_values("Country Name", key=lambda names: names.map(order))
+
+    # 3D line plot; countries beyond the point budget are averaged per income group
+    fig, info = trajectories_3d(
+        filtered_country_data,
+        x="Year",
+        y="Health Expenditure",
+        z="Life Expectancy",
+        line="Label",
+        color="IncomeGroup",
+        summary=avg_group_data[avg_group_data["IncomeGroup"].isin(selected_groups)],
+        title="3D Line Plot: Healthcare Spending, Life Expectancy, and Year",
+        labels={
+            "Health Expenditure": "Health Expenditure (USD)",
+            "Life Expectancy": "Life Expectancy (Years)",
+            "Year": "Year"
+        }
     )
+    # Kept on the figure so it survives the figure cache
+    fig.update_layout(meta=info)
+    return fig
+
+
+fig_3d_line = cached_figure(
+    "trajectory_3d", build_3d_line,
+    version=wdi_version,
+    selected_countries=selected_countries,
+    selected_groups=selected_groups
 )
 
 st.plotly_chart(fig_3d_line, use_container_width=True)
+trajectory_info = fig_3d_line.layout.meta
+if trajectory_info["aggregated"]:
+    st.caption(f"Showing {trajectory_info['shown']} of {trajectory_info['lines']} selected countries individually; "
+               f"the other {trajectory_info['aggregated']} are averaged per income group as \"Other selected\" lines.")
 
 st.markdown("""
 **Key Observations from the 3D Plot:**
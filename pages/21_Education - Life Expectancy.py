@@ -1,20 +1,9 @@
 import streamlit as st
-import pandas as pd
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import plotly.express as px
 
-# --- Data Loading ---
-@st.cache_data
-def load_data(file_path):
-    try:
-        df = pd.read_excel("data/ASEAN average life expectancy.xlsx")
-        return df
-    except FileNotFoundError:
-        st.error("Error: 'ASEAN average life expectancy.xlsx' not found. Did you upload it?")
-        return None
+from dashboard.education import education_figure, indicator_data
 
-df = load_data("data/ASEAN average life expectancy.xlsx")
+# --- Data Loading ---
+df = indicator_data("Life expectancy")
 
 if df is not None:
     # --- Website Content ---
@@ -29,103 +18,22 @@ if df is not None:
     # --- Graph 1: Overall Literacy Rates ---
     st.header("Combined average life expectancy in ASEAN Countries (2013-2022)")
 
-    # 2. Select Combined Data (Rows 0 to 6)
-    df_combined = df.iloc[0:6].copy()
-
-    # 3. Clean the data (replace hyphens with NaN)
-    df_combined.replace({"-": pd.NA, "-.0": pd.NA}, inplace=True)  # Replace both "-" and "-.0"
-
-    # 4. Melt the DataFrame to long format for easier plotting
-    df_melted = pd.melt(df_combined, id_vars='Country', value_vars=df_combined.columns[1:],
-                        var_name='Year', value_name='Life Expectancy')
-
-    # 5. Convert 'Year' and 'Life Expectancy' to numeric
-    df_melted['Year'] = pd.to_numeric(df_melted['Year'], errors='coerce')
-    df_melted['Life Expectancy'] = pd.to_numeric(df_melted['Life Expectancy'], errors='coerce')
-
-    # 6. Remove rows with NaN values (optional, but good practice)
-    df_melted.dropna(subset=['Life Expectancy'], inplace=True)
-
-    # 7. Create the line graph
-    fig = px.line(df_melted, x='Year', y='Life Expectancy', color='Country',
-                    title='Life Expectancy by Country (Combined Data)')
-
-    # 8. Customize the layout (optional)
-    fig.update_layout(
-        xaxis_title="Year",
-        yaxis_title="Life Expectancy",
-        yaxis_range=[60, 90]  # Or a more appropriate range for your data
-    )
-
-    # 9. Display the Plotly figure in Streamlit
+    fig = education_figure("Life expectancy", "Total", "Life Expectancy", y_range=[60, 90],
+                           title="Life Expectancy by Country (Combined Data)")
     st.plotly_chart(fig)
 
     # --- Graph 2: Individual Country Life Expectancy Trends ---
     st.header("Life Expectancy Trends in Individual ASEAN Countries (2013-2022)")
 
-    # 1. Select Individual Country Data (Rows 7 onwards)
-    df_individual = df.iloc[7:14].copy() #changed the rows to 7:15 to match the original data
-
-    # 2. Clean the data (replace hyphens with NaN)
-    df_individual.replace({"-": pd.NA, "-.0": pd.NA}, inplace=True)
-
-    # 3. Melt the DataFrame to long format for easier plotting
-    df_melted_individual = pd.melt(df_individual, id_vars='Country', value_vars=df_individual.columns[1:],
-                                    var_name='Year', value_name='Life Expectancy')
-
-    # 4. Convert 'Year' and 'Life Expectancy' to numeric
-    df_melted_individual['Year'] = pd.to_numeric(df_melted_individual['Year'], errors='coerce')
-    df_melted_individual['Life Expectancy'] = pd.to_numeric(df_melted_individual['Life Expectancy'], errors='coerce')
-
-    # 5. Remove rows with NaN values (optional, but good practice)
-    df_melted_individual.dropna(subset=['Life Expectancy'], inplace=True)
-
-    # 6. Create the line graph
-    fig_individual = px.line(df_melted_individual, x='Year', y='Life Expectancy', color='Country',
-                                title='Life Expectancy by Country (Individual Data)')
-
-    # 7. Customize the layout (optional)
-    fig_individual.update_layout(
-        xaxis_title="Year",
-        yaxis_title="Life Expectancy",
-        yaxis_range=[60, 90]  # Or a more appropriate range for your data
-    )
-
-    # 8. Display the Plotly figure in Streamlit
+    fig_individual = education_figure("Life expectancy", "Male", "Life Expectancy", y_range=[60, 90],
+                                      title="Male Life Expectancy by Country")
     st.plotly_chart(fig_individual)
 
     # --- Graph 3: Female Life Expectancy ---
     st.header("Female Life Expectancy by Country (Combined Data)")
 
-    # 2. Select Combined Data (Rows 15 to 22)
-    df_combined_female = df.iloc[15:22].copy()
-
-    # 3. Clean the data (replace hyphens with NaN)
-    df_combined_female.replace({"-": pd.NA, "-.0": pd.NA}, inplace=True)
-
-    # 4. Melt the DataFrame to long format for easier plotting
-    df_melted_female = pd.melt(df_combined_female, id_vars='Country', value_vars=df_combined_female.columns[1:],
-                                var_name='Year', value_name='Life Expectancy')
-
-    # 5. Convert 'Year' and 'Life Expectancy' to numeric
-    df_melted_female['Year'] = pd.to_numeric(df_melted_female['Year'], errors='coerce')
-    df_melted_female['Life Expectancy'] = pd.to_numeric(df_melted_female['Life Expectancy'], errors='coerce')
-
-    # 6. Remove rows with NaN values (optional, but good practice)
-    df_melted_female.dropna(subset=['Life Expectancy'], inplace=True)
-
-    # 7. Create the line graph
-    fig_female = px.line(df_melted_female, x='Year', y='Life Expectancy', color='Country',
-                            title='Female Life Expectancy by Country (Combined Data)')
-
-    # 8. Customize the layout (optional)
-    fig_female.update_layout(
-        xaxis_title="Year",
-        yaxis_title="Life Expectancy",
-        yaxis_range=[60, 90]  # Or a more appropriate range for your data
-    )
-
-    # 9. Display the Plotly figure in Streamlit
+    fig_female = education_figure("Life expectancy", "Female", "Life Expectancy", y_range=[60, 90],
+                                  title="Female Life Expectancy by Country (Combined Data)")
     st.plotly_chart(fig_female)
 
     # --- Graph Analysis ---
@@ -1,19 +1,9 @@
 import streamlit as st
-import pandas as pd
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 
-# --- Data Loading ---
-@st.cache_data
-def load_data(file_path):
-    try:
-        df = pd.read_excel("data/ASEAN adult literacy rate.xlsx")
-        return df
-    except FileNotFoundError:
-        st.error("Error: 'ASEAN adult literacy rate.xlsx' not found. Did you upload it?")
-        return None
+from dashboard.education import education_figure, indicator_data
 
-df = load_data("ASEAN adult literacy rate.xlsx")
+# --- Data Loading ---
+df = indicator_data("Adult literacy rate")
 
 if df is not None:
     # --- Website Content ---
@@ -32,76 +22,20 @@ A high literacy rate is foundational for individual empowerment and societal pro
     # --- Graph 1: Overall Literacy Rates ---
     st.header("Overall Literacy Rates in ASEAN Countries (2013-2022)")
 
-    df_countries1 = df.iloc[0:6].copy()
-    df_countries1.replace("-", pd.NA, inplace=True)
-    for col in df_countries1.columns[1:]:
-        df_countries1[col] = pd.to_numeric(df_countries1[col], errors='coerce')
-    df_long1 = pd.melt(df_countries1, id_vars=['Country'], value_vars=df_countries1.columns[1:], var_name='Year', value_name='Literacy Rate')
-    df_long1.dropna(subset=['Literacy Rate'], inplace=True)
-    df_long1['Year'] = df_long1['Year'].astype(str)
-    year_order1 = sorted(df_long1['Year'].unique())
-    df_long1['Year'] = pd.Categorical(df_long1['Year'], categories=year_order1, ordered=True)
-    fig1 = make_subplots(rows=2, cols=3, subplot_titles=df_long1['Country'].unique())
-    row1 = 1
-    col1 = 1
-    for country in df_long1['Country'].unique():
-        data1 = df_long1[df_long1['Country'] == country]
-        fig1.add_trace(go.Scatter(x=data1['Year'], y=data1['Literacy Rate'], name=country, mode='lines+markers', hoverinfo='x+y', customdata=data1[['Country', 'Literacy Rate']].values, hovertemplate=None), row=row1, col=col1)
-        col1 += 1
-        if col1 > 3:
-            col1 = 1
-            row1 += 1
-    fig1.update_layout(title_text="", yaxis_range=[75, 100], hovermode="x unified")
+    fig1 = education_figure("Adult literacy rate", "Total", "Literacy Rate", y_range=[75, 100])
     st.plotly_chart(fig1)
 
     # --- Graph 2: Male Literacy Rates ---
     st.header("Male Literacy Rates in ASEAN Countries (2013-2022)")
 
-    df_countries2 = df.iloc[8:14].copy()  # Select rows for Male data
-    df_countries2.replace("-", pd.NA, inplace=True)
-    for col in df_countries2.columns[1:]:
-        df_countries2[col] = pd.to_numeric(df_countries2[col], errors='coerce')
-    df_long2 = pd.melt(df_countries2, id_vars=['Country'], value_vars=df_countries2.columns[1:], var_name='Year', value_name='Literacy Rate')
-    df_long2.dropna(subset=['Literacy Rate'], inplace=True)
-    df_long2['Year'] = df_long2['Year'].astype(str)
-    year_order2 = sorted(df_long2['Year'].unique())
-    df_long2['Year'] = pd.Categorical(df_long2['Year'], categories=year_order2, ordered=True)
-    fig2 = make_subplots(rows=2, cols=3, subplot_titles=df_long2['Country'].unique())
-    row2 = 1
-    col2 = 1
-    for country in df_long2['Country'].unique():
-        data2 = df_long2[df_long2['Country'] == country]
-        fig2.add_trace(go.Scatter(x=data2['Year'], y=data2['Literacy Rate'], name=country, mode='lines+markers', hoverinfo='x+y', customdata=data2[['Country', 'Literacy Rate']].values, hovertemplate=None), row=row2, col=col2)
-        col2 += 1
-        if col2 > 3:
-            col2 = 1
-            row2 += 1
-    fig2.update_layout(title_text="", yaxis_range=[75, 100], hovermode="x unified")
+    fig2 = education_figure("Adult literacy rate", "Male", "Literacy Rate", y_range=[75, 100])
     st.plotly_chart(fig2)
 
         # --- Graph 3: Female Literacy Rates ---
     st.header("Female Literacy Rates in ASEAN Countries (2013-2022)")
 
-    df_countries3 = df.iloc[16:22].copy()  # Select rows for Female data
-    df_countries3.replace("-", pd.NA, inplace=True)
-    for col in df_countries3.columns[1:]:
-        df_countries3[col] = pd.to_numeric(df_countries3[col], errors='coerce')
-    df_long3 = pd.melt(df_countries3, id_vars=['Country'], value_vars=df_countries3.columns[1:], var_name='Year', value_name='Literacy Rate')
-    df_long3.dropna(subset=['Literacy Rate'], inplace=True)
-    df_long3['Year'] = df_long3['Year'].astype(str)
-    year_order3 = sorted(df_long3['Year'].unique())
-    df_long3['Year'] = pd.Categorical(df_long3['Year'], categories=year_order3, ordered=True)
-    fig3 = make_subplots(rows=2, cols=3, subplot_titles=df_long3['Country'].unique())
-    row3 = 1
-    col3 = 1
-    for country in df_long3['Country'].unique():
-        data3 = df_long3[df_long3['Country'] == country]
-        fig3.add_trace(go.Scatter(x=data3['Year'], y=data3['Literacy Rate'], name=country, mode='lines+markers', hoverinfo='x+y', customdata=data3[['Country', 'Literacy Rate']].values, hovertemplate=None), row=row3, col=col3)
-        col3 += 1
-        if col3 > 3:
-            col3 = 1
-            row3 += 1
-    fig3.update_layout(title_text="", yaxis_range=[75, 100], hovermode="x unified")
+    # Female rates go below 75% (Cambodia, 2013-2014), so this axis starts lower
+    fig3 = education_figure("Adult literacy rate", "Female", "Literacy Rate", y_range=[70, 100])
     st.plotly_chart(fig3)
 
 
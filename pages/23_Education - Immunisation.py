@@ -1,18 +1,9 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
 
-# --- Data Loading ---
-@st.cache_data
-def load_data(file_path):
-    try:
-        df = pd.read_excel("data/ASEAN immunisation against measles and DPT.xlsx")
-        return df
-    except FileNotFoundError:
-        st.error("Error: 'ASEAN immunisation against measles and DPT.xlsx' not found. Did you upload it?")
-        return None
+from dashboard.education import education_figure, indicator_data
 
-df = load_data("ASEAN immunisation against measles and DPT.xlsx")
+# --- Data Loading ---
+df = indicator_data("Immunisation coverage")
 
 if df is not None:
     # --- Website Content ---
@@ -40,45 +31,10 @@ if df is not None:
     )
 
     # --- Graphs ---
-    # Define row ranges for each graph and their titles
-    graph_info = [(1,8 , "Measles"), (9, 17, "DPT")]  # (start_row, end_row, title)
-
-    for start_row, end_row, title in graph_info:  # Iterate with title
-        # Select data for the current graph
-        df_subset = df.iloc[start_row - 1:end_row].copy()
-
-        # Extract Vaccine type (now unused, but kept for consistency)
-        vaccine_type = df_subset.iloc[0, 0]
-
-        # Set column names (years) from the second row onwards
-        df_subset.columns = ['Country'] + [str(year) for year in range(2013, 2020)]
-
-        # Melt the DataFrame for Plotly
-        df_melted = pd.melt(df_subset, id_vars=['Country'],
-                            value_vars=[str(year) for year in range(2013, 2020)],
-                            var_name='Year', value_name='Percentage')
-
-        # Add Vaccine column (now unused, but kept for consistency)
-        df_melted['Vaccine'] = vaccine_type
-
-        # Replace hyphens with NaN BEFORE converting to numeric
-        df_melted['Percentage'] = df_melted['Percentage'].replace('-', pd.NA)
-
-        # Convert Year and Percentage to numeric
-        df_melted['Year'] = pd.to_numeric(df_melted['Year'])
-        df_melted['Percentage'] = pd.to_numeric(df_melted['Percentage'])
-
-        # Create the line plot
-        fig = px.line(df_melted, x='Year', y='Percentage', color='Country',
-                      title=f'Immunisation Rates Over Time by Country ({title})')  # Use title variable
-
-        # Update layout for better readability
-        fig.update_layout(
-            xaxis_title="Year",
-            yaxis_title="Percentage",
-            yaxis_range=[60, 100]  # Set y-axis range from 70 to 100
-        )
-
+    # One small-multiples figure (a panel per country) for each vaccine
+    for vaccine in ["Measles", "DPT"]:
+        fig = education_figure("Immunisation coverage", vaccine, "Percentage", y_range=[60, 100],
+                               title=f'Immunisation Rates Over Time by Country ({vaccine})')
         st.plotly_chart(fig)
 
         # --- Graph Analysis ---
@@ -1,18 +1,9 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
 
-# --- Data Loading ---
-@st.cache_data
-def load_data(file_path):
-    try:
-        df = pd.read_excel("data/ASEAN pri sch enrolment rate.xlsx")
-        return df
-    except FileNotFoundError:
-        st.error("Error: 'ASEAN pri sch enrolment rate.xlsx' not found. Did you upload it?")
-        return None
+from dashboard.education import education_figure, indicator_data
 
-df = load_data("ASEAN pri sch enrolment rate.xlsx")
+# --- Data Loading ---
+df = indicator_data("Primary school enrolment rate")
 
 if df is not None:
     # --- Website Content ---
@@ -40,40 +31,14 @@ if df is not None:
     )
 
     # --- Graphs ---
-    # Define row ranges and titles for each graph
-    graph_info = [(1, 8, "Primary School Enrolment Rate (Total)"),
-                  (10, 17, "Primary School Enrolment Rate (Male)"),
-                  (18, 25, "Primary School Enrolment Rate (Female)")]
-
-    for start_row, end_row, title in graph_info:
-        df_subset = df.iloc[start_row - 1:end_row].copy()
-
-        # Set column names (years)
-        df_subset.columns = ['Country'] + [str(year) for year in range(2013, 2023)]
-
-        # Melt the DataFrame
-        df_melted = pd.melt(df_subset, id_vars=['Country'],
-                            value_vars=[str(year) for year in range(2013, 2023)],
-                            var_name='Year', value_name='Enrolment Rate')
-
-        # Replace hyphens with NaN BEFORE converting to numeric
-        df_melted['Enrolment Rate'] = df_melted['Enrolment Rate'].replace('-', pd.NA)
-
-        # Convert Year and Enrolment Rate to numeric
-        df_melted['Year'] = pd.to_numeric(df_melted['Year'])
-        df_melted['Enrolment Rate'] = pd.to_numeric(df_melted['Enrolment Rate'])
-
-        # Create the line plot
-        fig = px.line(df_melted, x='Year', y='Enrolment Rate', color='Country',
-                      title=title)  # Use dynamic title
-
-        # Update layout
-        fig.update_layout(
-            xaxis_title="Year",
-            yaxis_title="Enrolment Rate",
-            yaxis_range=[80, 100]  # Adjust range as needed
-        )
-
+    # One small-multiples figure (a panel per country) for each series
+    graph_info = [("Total", "Primary School Enrolment Rate (Total)"),
+                  ("Male", "Primary School Enrolment Rate (Male)"),
+                  ("Female", "Primary School Enrolment Rate (Female)")]
+
+    for series, title in graph_info:
+        fig = education_figure("Primary school enrolment rate", series, "Enrolment Rate",
+                               y_range=[80, 100], title=title)
         st.plotly_chart(fig) # Display the plot in Streamlit
 
         # --- Text Analysis below Graphs ---
@@ -1,19 +1,20 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
+
+from dashboard.client_chart import client_chart
+from dashboard.data import WORKFORCE_EXPENDITURE_FILE, data_version, load_workforce_expenditure
+from dashboard.imputation import FILL_METHODS
+from dashboard.selection import country_select, initial_countries, initial_years, subset, year_range_slider
+
 st.set_page_config(
     page_title="Manpower costs",
    # page_icon="💰",
     layout="centered"
 )
 # Load the dataset
-@st.cache_data
-def load_data():
-    file_path = "data/workforce_expenditure.csv"
-    df = pd.read_csv(file_path)
-    return df
-
-df = load_data()
+df = load_workforce_expenditure()
 
 # Title
 st.title("Healthcare Expenditure vs Workforce Analysis (ASEAN/Asia)")
@@ -25,24 +26,82 @@ In this section, we analyze how higher healthcare spending contributes to an imp
             """)
 
 
+def add_imputed_markers(fig, data, x, y):
+    """Overlay open markers on points where x or y was filled in rather than observed."""
+    flags = [f"{col} imputed" for col in (x, y) if f"{col} imputed" in data.columns]
+    if not flags:
+        return
+    imputed = data[data[flags].any(axis=1)].dropna(subset=[x, y])
+    if imputed.empty:
+        return
+    fig.add_trace(go.Scatter(
+        x=imputed[x], y=imputed[y], mode="markers", name="Imputed",
+        marker=dict(symbol="circle-open", size=11, color="black"),
+        customdata=imputed[["Country"]].values,
+        hovertemplate="<b>%{customdata[0]}</b> (imputed)<br>%{x}: %{y:.2f}<extra></extra>"
+    ))
+
+
+def imputed_flag(data, x, y):
+    """True where x or y was filled in, for the in-browser charts."""
+    flags = [f"{col} imputed" for col in (x, y) if f"{col} imputed" in data.columns]
+    return data[flags].any(axis=1) if flags else pd.Series(False, index=data.index)
+
+
 # Filters (On Main Page)
 countries = df["Country"].unique()
 years = sorted(df["Year"].unique())
 
 st.header("Analysis of the correlations between healthcare expenditure and manpower in healthcare")
 
-selected_countries = st.multiselect("Select Country/Countries", countries, default=["Singapore", "Malaysia"])
-selected_years = st.slider("Select Year Range", min(years), max(years), (min(years), max(years)))
-
-# Filter data based on selection
-df_filtered = df[(df["Country"].isin(selected_countries)) & (df["Year"].between(*selected_years))]
+in_browser = st.toggle(
+    "Filter in the browser",
+    help="Send every country and year to the charts once and filter them there, "
+         "so changing countries or years does not rerun the page."
+)
+default_countries = ["Singapore", "Malaysia"]
+if in_browser:
+    # The charts filter themselves; start them from the countries and years chosen on other pages
+    selected_countries = initial_countries(countries, default_countries)
+    selected_years = initial_years(min(years), max(years))
+else:
+    selected_countries = country_select("Select Country/Countries", countries, default=default_countries,
+                                        key="manpower_countries")
+    selected_years = year_range_slider("Select Year Range", min(years), max(years), key="manpower_years")
+fill_choice = st.selectbox(
+    "Fill missing values",
+    list(FILL_METHODS),
+    help="Missing years and cadres are dropped by default. Filled values are shown as open markers."
+)
 
-fig1 = px.scatter(
-    df_filtered, x="Health Expenditure (% GDP)", y="Medical doctors (per 10 000 population)",
-    color="Country", trendline="ols",
-    title="Healthcare Expenditure vs Medical Doctors"
+# Gap-fill the whole country x year matrix (cached per method)
+observed_points = len(df)
+df = load_workforce_expenditure(FILL_METHODS[fill_choice])
+if FILL_METHODS[fill_choice] is not None:
+    st.caption(f"{len(df) - observed_points} country-years added by {fill_choice.lower()}; "
+               f"{len(df)} country-years in total.")
+
+# Filter data based on selection (kept per session, so returning to the page reuses it)
+df_filtered = subset(
+    df, f"workforce_expenditure_{FILL_METHODS[fill_choice]}", data_version(WORKFORCE_EXPENDITURE_FILE),
+    countries=selected_countries, years=selected_years, country_col="Country"
 )
-st.plotly_chart(fig1)
+
+if in_browser:
+    client_chart(
+        df.assign(Imputed=imputed_flag(df, "Health Expenditure (% GDP)", "Medical doctors (per 10 000 population)")),
+        x="Health Expenditure (% GDP)", y="Medical doctors (per 10 000 population)",
+        group="Country", year="Year", initial_groups=selected_countries, initial_years=selected_years,
+        imputed="Imputed", trendline=True, correlation=True, title="Healthcare Expenditure vs Medical Doctors"
+    )
+else:
+    fig1 = px.scatter(
+        df_filtered, x="Health Expenditure (% GDP)", y="Medical doctors (per 10 000 population)",
+        color="Country", trendline="ols",
+        title="Healthcare Expenditure vs Medical Doctors"
+    )
+    add_imputed_markers(fig1, df_filtered, "Health Expenditure (% GDP)", "Medical doctors (per 10 000 population)")
+    st.plotly_chart(fig1)
 st.markdown("<p style='text-align: center; font-weight: bold;'>Source: Graph showing relationship between health expenditure and medical doctors</p>", unsafe_allow_html=True)
  
 st.subheader("🔍 Key Insights")
@@ -93,7 +152,15 @@ selected_y = st.selectbox("Select a Healthcare Worker Type:", y_options)
 
 chart_type = st.radio("Select Chart Type:", ["Line Chart", "Bar Chart"])
 # Create the line chart based on the selected metric
-if chart_type == "Line Chart":
+if in_browser:
+    client_chart(
+        df.assign(Imputed=imputed_flag(df, "Year", selected_y)),
+        x="Year", y=selected_y, group="Country", year="Year", initial_groups=selected_countries,
+        initial_years=selected_years, kind="line" if chart_type == "Line Chart" else "bar", imputed="Imputed",
+        title=f"Trend of {selected_y} Over Time" if chart_type == "Line Chart"
+        else f"{selected_y} Per 10,000 Population by Year"
+    )
+elif chart_type == "Line Chart":
     fig2 = px.line(
         df_filtered, x="Year", y=selected_y, color="Country",
         title=f"Trend of {selected_y} Over Time",
@@ -105,7 +172,9 @@ else:
         title=f"{selected_y} Per 10,000 Population by Year",
         barmode="group"
     )
-st.plotly_chart(fig2)
+if not in_browser:
+    add_imputed_markers(fig2, df_filtered, "Year", selected_y)
+    st.plotly_chart(fig2)
 st.markdown("<p style='text-align: center; font-weight: bold;'>Source: Chart showing trend of  </p>", unsafe_allow_html=True)
  
 st.write("""
@@ -135,5 +204,8 @@ st.write("""
 """)
 # Correlation Analysis
 st.write("### Correlation Between Healthcare Spending and Workforce")
-correlation = df_filtered[["Health Expenditure (% GDP)", "Medical doctors (per 10 000 population)"]].corr().iloc[0,1]
-st.write(f"**Correlation Coefficient:** {correlation:.2f} (Closer to 1 means strong positive correlation)")
+if in_browser:
+    st.write("The correlation coefficient for the selected countries and years is shown under the first chart.")
+else:
+    correlation = df_filtered[["Health Expenditure (% GDP)", "Medical doctors (per 10 000 population)"]].corr().iloc[0,1]
+    st.write(f"**Correlation Coefficient:** {correlation:.2f} (Closer to 1 means strong positive correlation)")
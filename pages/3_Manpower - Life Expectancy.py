@@ -1,9 +1,18 @@
 import streamlit as st
 import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
-from scipy.stats import pearsonr
 from pathlib import Path
+
+import plotly.express as px
+
+from dashboard.cache import cached
+from dashboard.data import data_version, load_workforce_panel
+from dashboard.disk_cache import disk_cache
+from dashboard.figures import cached_figure
+from dashboard.imputation import FILL_METHODS
+from dashboard.plotting import scatter
+from dashboard.shared_data import shared_dataset
+from dashboard.stats import batched_ols, design_matrices
+
 st.set_page_config(
     page_title="Healthcare Spending Breakdown",
    # page_icon="💰",
@@ -25,22 +34,42 @@ elif dataset_choice == "Life Expectancy at 60":
     title = "📊 Healthcare Workforce vs Life Expectancy at 60"
     ylabel = "Life Expectancy at 60 (Years)"
 
-# Load the selected dataset
-df = pd.read_csv(file_path)
 
-# Ensure relevant columns are numeric
-df["Total Healthcare Workers per 10,000 Population"] = pd.to_numeric(df["Total Healthcare Workers per 10,000 Population"], errors="coerce")
-df["Value"] = pd.to_numeric(df["Value"], errors="coerce")  # "Value" represents the chosen Life Expectancy metric
+@shared_dataset
+@cached("data")
+@disk_cache()
+def load_life_workforce(file_path):
+    df = pd.read_csv(file_path)
+
+    # Ensure relevant columns are numeric
+    df["Total Healthcare Workers per 10,000 Population"] = pd.to_numeric(df["Total Healthcare Workers per 10,000 Population"], errors="coerce")
+    df["Value"] = pd.to_numeric(df["Value"], errors="coerce")  # "Value" represents the chosen Life Expectancy metric
+
+    # Remove NaN values
+    return df.dropna(subset=["Total Healthcare Workers per 10,000 Population", "Value", "Year"])
+
 
-# Remove NaN values
-df.dropna(subset=["Total Healthcare Workers per 10,000 Population", "Value", "Year"], inplace=True)
+# Load the selected dataset
+df = load_life_workforce(file_path)
 
 selected_year=2015
 # Filter data for the selected year
 df_filtered = df[df["Year"] == selected_year]
 
+
+@cached("statistics")
+def workforce_correlation(file_path, year):
+    """Pearson r and p-value across countries for one year."""
+    from scipy.stats import pearsonr
+
+    data = load_life_workforce(file_path)
+    data = data[data["Year"] == year]
+    result = pearsonr(data["Total Healthcare Workers per 10,000 Population"], data["Value"])
+    return float(result.statistic), float(result.pvalue)
+
+
 # Compute Correlation Coefficient
-correlation, p_value = pearsonr(df_filtered["Total Healthcare Workers per 10,000 Population"], df_filtered["Value"])
+correlation, p_value = workforce_correlation(file_path, selected_year)
 
 # Streamlit Title & Introduction
 st.title(title)
@@ -53,25 +82,25 @@ and **{ylabel}** for the selected year **{selected_year}**.
 - The **correlation coefficient (r)** quantifies the strength of the relationship.
 """)
 
-# Seaborn Scatter Plot with Regression Line and Confidence Interval
-fig, ax = plt.subplots(figsize=(8, 6))
-sns.regplot(
-    data=df_filtered, 
-    x="Total Healthcare Workers per 10,000 Population", 
-    y="Value", 
-    scatter_kws={"s": 50, "alpha": 0.7},  # Adjust point size and transparency
-    line_kws={"color": "red"},             # Trendline color
-    ci=95,                                 # 95% Confidence Interval
-    ax=ax
-)
+# Scatter Plot with Regression Line and 95% Confidence Interval
+def build_regplot():
+    fig, _ = scatter(
+        df_filtered,
+        x="Total Healthcare Workers per 10,000 Population",
+        y="Value",
+        trendline="ols",
+        ci=0.95,
+        hover_name="Location",
+        opacity=0.7,
+        labels={"Value": ylabel},
+        title=f"Healthcare Workforce vs {ylabel} ({selected_year})"
+    )
+    return fig
 
-ax.set_title(f"Healthcare Workforce vs {ylabel} ({selected_year})", fontsize=14)
-ax.set_xlabel("Total Healthcare Workers per 10,000 Population", fontsize=12)
-ax.set_ylabel(ylabel, fontsize=12)  # Dynamic label
-ax.grid(True)
 
-# Display the plot in Streamlit
-st.pyplot(fig)
+fig = cached_figure("workforce_regplot", build_regplot, version=data_version(file_path),
+                    dataset=dataset_choice, selected_year=selected_year)
+st.plotly_chart(fig, use_container_width=True)
 
 # Display correlation analysis
 st.subheader("📌 Correlation Analysis")
@@ -102,3 +131,79 @@ st.markdown("""
   Develop policies that aim to increase the number of healthcare workers per 10,000 population while ensuring quality training and continuous professional development. This approach directly supports improved life expectancy.
 
 """)
+
+# --- Joint workforce + expenditure model ---
+JOINT_PREDICTORS = ["Doctors", "Nurses", "Dentists", "Pharmacists", "Health Expenditure"]
+
+
+@cached("statistics")
+def workforce_design(fill_method=None):
+    """Per-year design matrices from the WHO workforce x WDI join, built once per fill method."""
+    return design_matrices(load_workforce_panel(fill_method), JOINT_PREDICTORS, "Life Expectancy", "Year")
+
+
+@cached("statistics")
+def joint_model(selected_predictors, fill_method=None):
+    """Life expectancy regressed on the selected predictors, all years in one batched solve."""
+    return batched_ols(*workforce_design(fill_method), JOINT_PREDICTORS, selected_predictors)
+
+
+st.markdown("---")
+st.header("🧮 Joint Model: Workforce Cadres and Health Expenditure")
+st.write("""
+The scatter plot above looks at the total workforce on its own. Here life expectancy at birth is modelled on 
+**doctors, nurses, dentists and pharmacists (per 10,000 population)** together with **health expenditure per capita (USD)**, 
+using the full WHO workforce dataset joined with the World Bank panel. A separate regression is fitted for every year; 
+countries missing any selected predictor in a year are left out of that year's fit.
+""")
+
+selected_predictors = st.multiselect(
+    "Select predictors:",
+    JOINT_PREDICTORS,
+    default=JOINT_PREDICTORS
+)
+joint_fill = st.selectbox(
+    "Fill missing workforce values:",
+    list(FILL_METHODS),
+    help="Without filling, a country is dropped from a year's fit if any selected cadre is missing."
+)
+
+if not selected_predictors:
+    st.info("Select at least one predictor to fit the model.")
+else:
+    joint_results = joint_model(tuple(selected_predictors), FILL_METHODS[joint_fill])
+    joint_results = joint_results.rename(columns={"group": "Year", "term": "Predictor"})
+    joint_results["95% CI"] = 1.96 * joint_results["std_error"]
+    coefficient_trends = joint_results[
+        (joint_results["Predictor"] != "Intercept") & joint_results["coefficient"].notna()
+    ]
+
+    fig_joint = px.line(
+        coefficient_trends,
+        x="Year",
+        y="coefficient",
+        error_y="95% CI",
+        facet_col="Predictor",
+        facet_col_wrap=3,
+        markers=True,
+        hover_data={"n": True, "p_value": ":.4f", "r_squared": ":.3f", "95% CI": False},
+        labels={"coefficient": "Coefficient", "n": "Countries", "p_value": "P-value", "r_squared": "R-squared"},
+        title="Effect on Life Expectancy at Birth by Year (holding the other predictors fixed)"
+    )
+    fig_joint.for_each_annotation(lambda a: a.update(text=a.text.split("=")[-1]))
+    fig_joint.update_yaxes(matches=None)
+    st.plotly_chart(fig_joint, use_container_width=True)
+
+    fitted_years = sorted(coefficient_trends["Year"].unique())
+    if fitted_years:
+        model_year = st.select_slider("Select Year for Coefficient Table:", fitted_years, value=fitted_years[-1])
+        year_results = joint_results[joint_results["Year"] == model_year]
+        st.write(f"**{model_year}:** {year_results['n'].iloc[0]} countries, "
+                 f"R-squared = {year_results['r_squared'].iloc[0]:.3f}")
+        st.dataframe(
+            year_results[["Predictor", "coefficient", "std_error", "t_value", "p_value"]].rename(columns={
+                "coefficient": "Coefficient", "std_error": "Std. Error", "t_value": "t", "p_value": "P-value"
+            }),
+            hide_index=True,
+            use_container_width=True
+        )
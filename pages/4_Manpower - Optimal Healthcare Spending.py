@@ -5,6 +5,8 @@ import plotly.express as px
 import plotly.graph_objects as go
 from pathlib import Path
 
+from dashboard.derived import load_derived, show_status
+
 st.set_page_config(
     page_title="Healthcare Spending Breakdown",
     layout="centered"
@@ -14,13 +16,37 @@ st.set_page_config(
 file_path = Path("data/merged_lifeBirth_spend.csv")  # Ensure the file is in the correct directory
 df = pd.read_csv(file_path)
 
+
+def optimal_spend(selected_year):
+    """Cross-validated curve and bootstrap band for the optimal expenditure in one year.
+
+    Every year is fitted once, into the derived tables (see :mod:`dashboard.derived`).
+    """
+    tables = load_derived("optimal_spend")
+    summary = tables["optimal_spend"].set_index("Year").loc[selected_year]
+    curve = tables["optimal_spend_curves"].query("Year == @selected_year")
+    scores = tables["optimal_spend_scores"].query("Year == @selected_year")
+    # NaN: the selected curve has no maximum inside the observed range
+    interior = pd.notna(summary["Optimal Expenditure"])
+    # NaN band with an optimum: too few bootstrap resamples had one, so it is unstable
+    stable = interior and pd.notna(summary["Band Low"]) and pd.notna(summary["Band High"])
+    return {
+        "model": summary["Model"],
+        "scores": scores[["Model", "CV MSE"]],
+        "x_grid": curve["x"].to_numpy(),
+        "y_grid": curve["y"].to_numpy(),
+        "optimal_x": summary["Optimal Expenditure"] if interior else None,
+        "optimal_y": summary["Optimal Life Expectancy"] if interior else None,
+        "band": (summary["Band Low"], summary["Band High"]) if stable else None
+    }
+
 # Streamlit Title & Description
 st.title("📊 Optimal Healthcare Expenditure to Maximize Life Expectancy")
 st.write(f"""
 This visualization explores the relationship between **Healthcare Expenditure (% of GDP)** and **Life Expectancy at Birth (Years)**
 for the selected year
-- A **3rd-degree polynomial regression** curve is fitted to model the trend.
-- The **optimal healthcare expenditure** level for **maximizing life expectancy** is highlighted.
+- Polynomial curves (degree 1–3) and smoothing splines are compared by **k-fold cross-validation**, and the best one is fitted to model the trend.
+- The **optimal healthcare expenditure** level for **maximizing life expectancy** is highlighted, with a **bootstrap 95% band** showing how stable it is. When the best curve keeps rising (or falling) across the data, there is no interior optimum to highlight.
 """)
 
 # Let user select the year dynamically
@@ -38,21 +64,19 @@ df_filtered = df_filtered[df_filtered["Gender"] == "Both sexes"]  # Filter for "
 # Remove NaN values
 df_filtered.dropna(subset=["Healthcare Expenditure", "Life Expectancy at Birth"], inplace=True)
 
-# Fit a polynomial regression model to analyze the relationship
-x = df_filtered["Healthcare Expenditure"].values
 y = df_filtered["Life Expectancy at Birth"].values
 
-# Fit a 3rd-degree polynomial regression curve
-z = np.polyfit(x, y, 3)
-p = np.poly1d(z)
-
-# Generate smooth values for plotting the curve
-x_vals = np.linspace(min(x), max(x), 100)
-y_vals = p(x_vals)
+# Select the curve by cross-validation and bootstrap the optimum
+show_status("optimal_spend")
+curve_fit = optimal_spend(selected_year)
+x_vals = curve_fit["x_grid"]
+y_vals = curve_fit["y_grid"]
 
 # Find the optimal healthcare expenditure that maximizes life expectancy
-optimal_expenditure = x_vals[np.argmax(y_vals)]
-optimal_life_expectancy = max(y_vals)
+optimal_expenditure = curve_fit["optimal_x"]
+optimal_life_expectancy = curve_fit["optimal_y"]
+has_optimum = optimal_expenditure is not None
+has_band = curve_fit["band"] is not None
 
 # Create an interactive scatter plot
 fig = px.scatter(
@@ -61,27 +85,39 @@ fig = px.scatter(
     title=f"Optimal Healthcare Expenditure to Maximize Life Expectancy ({selected_year})"
 )
 
-# Add the polynomial regression curve
+# Add the fitted regression curve
 fig.add_trace(
-    go.Scatter(x=x_vals, y=y_vals, mode='lines', name='Fitted Curve', line=dict(color='red', dash='dash'))
+    go.Scatter(x=x_vals, y=y_vals, mode='lines', name=f"Fitted Curve: {curve_fit['model']}",
+               line=dict(color='red', dash='dash'))
 )
 
-# Mark the optimal point
-fig.add_trace(
-    go.Scatter(
-        x=[optimal_expenditure], y=[optimal_life_expectancy],
-        mode='markers', name='Optimal Point',
-        marker=dict(color='green', size=10)
+if has_band:
+    band_low, band_high = curve_fit["band"]
+
+    # Shade the bootstrap band around the optimal expenditure
+    fig.add_vrect(
+        x0=band_low, x1=band_high, fillcolor="green", opacity=0.1, line_width=0,
+        annotation_text="95% bootstrap band", annotation_position="top left"
     )
-)
 
-# Vertical line for optimal expenditure
-fig.add_shape(
-    go.layout.Shape(
-        type="line", x0=optimal_expenditure, x1=optimal_expenditure,
-        y0=min(y), y1=max(y_vals), line=dict(color="gray", dash="dot"),
+if has_optimum:
+
+    # Mark the optimal point
+    fig.add_trace(
+        go.Scatter(
+            x=[optimal_expenditure], y=[optimal_life_expectancy],
+            mode='markers', name='Optimal Point',
+            marker=dict(color='green', size=10)
+        )
+    )
+
+    # Vertical line for optimal expenditure
+    fig.add_shape(
+        go.layout.Shape(
+            type="line", x0=optimal_expenditure, x1=optimal_expenditure,
+            y0=min(y), y1=max(y_vals), line=dict(color="gray", dash="dot"),
+        )
     )
-)
 
 # Update labels and layout
 fig.update_layout(
@@ -101,20 +137,46 @@ with col1:
 
 with col2:
     st.markdown("### Optimal Investment")
-    st.markdown(f"<h1 style='text-align: center;'>{optimal_expenditure:.2f}%</h1>", unsafe_allow_html=True)
+    if has_optimum:
+        st.markdown(f"<h1 style='text-align: center;'>{optimal_expenditure:.2f}%</h1>", unsafe_allow_html=True)
+        if has_band:
+            st.markdown(f"<p style='text-align: center;'>95% band: {band_low:.2f}% – {band_high:.2f}%</p>",
+                        unsafe_allow_html=True)
+        else:
+            st.warning("Unstable optimum: too few bootstrap resamples of the countries have an interior maximum.")
+    else:
+        st.info("No interior optimum: the fitted curve has no maximum within the observed expenditure range.")
+
+with st.expander("Model selection (cross-validated mean squared error)"):
+    st.write(f"Selected model for **{selected_year}**: **{curve_fit['model']}**")
+    st.dataframe(curve_fit["scores"], hide_index=True, use_container_width=True)
 
 # Display optimal healthcare expenditure point
 st.subheader("📌 Key Insights : Optimal Healthcare Investment")
-st.write(f"""
+if has_optimum:
+    st.write(f"""
 - The **optimal healthcare expenditure** to maximize life expectancy in **{selected_year}** is **{optimal_expenditure:.2f}% of GDP**.
 - At this level of investment, the predicted **maximum life expectancy** is **{optimal_life_expectancy:.2f} years**.
 """)
+    if has_band:
+        st.write(f"- Resampling the countries puts the optimum between **{band_low:.2f}%** and **{band_high:.2f}%** "
+                 f"of GDP (95% bootstrap band), so treat the point estimate as a rough guide.")
+    else:
+        st.write("- The optimum is **unstable**: too few resamples of the countries give a curve with an interior "
+                 "maximum, so no bootstrap band is shown and the point estimate should not be relied on.")
+    optimal_level_text = f"in **{selected_year}** is **{optimal_expenditure:.2f}% of GDP**"
+else:
+    st.write(f"""
+- In **{selected_year}** the best-fitting curve (**{curve_fit['model']}**) has **no interior optimum**: predicted life expectancy keeps changing in one direction across the observed range of expenditure.
+- The data therefore do not identify an optimal healthcare expenditure level for this year; any "optimum" would lie outside the range of countries observed.
+""")
+    optimal_level_text = f"could not be identified for **{selected_year}** (no interior optimum), so the levels of other years are the better guide"
 st.subheader("📌 Recommendations")
 
 st.write(f"""
 ### **For Finance and Health Ministers**  
 ✅ **Achieve the Optimal Healthcare Expenditure Level**  
-   - Based on the analysis, the **optimal healthcare expenditure** to maximize life expectancy in **{selected_year}** is **{optimal_expenditure:.2f}% of GDP**. 
+   - Based on the analysis, the **optimal healthcare expenditure** to maximize life expectancy {optimal_level_text}. 
    - To achieve this optimal level of healthcare expenditure, it is crucial for the government to **prioritize investments** in healthcare. The optimal expenditure level should serve as a rough estimate for future budgets and healthcare policies, ensuring that enough resources are allocated to critical sectors such as **healthcare infrastructure**, **workforce expansion**, and **medical technology**.
    
 ✅ **Balanced Allocation of Funds Across Healthcare Sectors**  
@@ -0,0 +1,87 @@
+import pandas as pd
+import streamlit as st
+
+from dashboard import derived, disk_cache, shared_data, warmup
+from dashboard.app_pages import ADMIN_ENABLED
+from dashboard.cache import MANAGER
+
+st.title("🗄️ Cache Status")
+if not ADMIN_ENABLED:
+    st.error("This page is disabled. Start the server with `DASHBOARD_ADMIN=1` to use it.")
+    st.stop()
+st.write("""
+Memory, hit rate and eviction counts for every cache in this server process, to tune the budget
+(`DASHBOARD_CACHE_BUDGET_MB`) under real traffic. Counters start at zero when the server starts.
+""")
+
+MB = 1024 ** 2
+
+# --- In-memory caches ---
+st.header("In-memory caches")
+used = MANAGER.bytes
+st.progress(min(used / MANAGER.budget, 1.0),
+            text=f"{used / MB:,.1f} MB of {MANAGER.budget / MB:,.0f} MB budget in use")
+
+stats = pd.DataFrame(MANAGER.stats())
+if stats.empty:
+    st.info("No cache has been used yet in this process.")
+else:
+    stats["MB"] = stats.pop("Bytes") / MB
+    st.dataframe(
+        stats,
+        hide_index=True,
+        column_config={
+            "MB": st.column_config.NumberColumn(format="%.2f"),
+            "Hit rate": st.column_config.ProgressColumn(min_value=0, max_value=1, format="percent")
+        }
+    )
+
+clear_cols = st.columns([2, 1, 1], vertical_alignment="bottom")
+with clear_cols[0]:
+    to_clear = st.selectbox("Cache", list(MANAGER.caches), index=None, placeholder="Choose a cache")
+with clear_cols[1]:
+    if st.button("Clear cache", disabled=to_clear is None):
+        MANAGER.caches[to_clear].clear()
+        st.rerun()
+with clear_cols[2]:
+    if st.button("Clear all"):
+        MANAGER.clear()
+        st.rerun()
+
+# --- Shared by every process on the host ---
+st.header("On-disk and shared caches")
+entries, size = disk_cache.cache_usage()
+disk_cols = st.columns([3, 1], vertical_alignment="center")
+disk_cols[0].metric(
+    f"Disk cache ({disk_cache.DISK_CACHE_DIR})", f"{entries} entries",
+    f"{size / MB:,.1f} MB of {disk_cache.DISK_CACHE_MAX_BYTES / MB:,.0f} MB", delta_color="off"
+)
+if disk_cols[1].button("Clear disk cache"):
+    disk_cache.clear()
+    st.rerun()
+
+if shared_data.SHARED_DATA:
+    datasets, size = shared_data.shared_usage()
+    shared_cols = st.columns([3, 1], vertical_alignment="center")
+    shared_cols[0].metric(f"Shared datasets ({shared_data.SHARED_DIR})", f"{datasets} datasets",
+                          f"{size / MB:,.1f} MB", delta_color="off")
+    if shared_cols[1].button("Clear shared datasets"):
+        shared_data.clear()
+        st.rerun()
+else:
+    st.caption("Shared-memory datasets are off (set `DASHBOARD_SHARED_DATA=1` to enable them).")
+
+st.subheader("Derived tables")
+manifest = derived.read_manifest()
+st.dataframe(pd.DataFrame([
+    {
+        "Artifact": name,
+        "Status": derived.status(name),
+        "Built": manifest.get(name, {}).get("built"),
+        "Build time (s)": manifest.get(name, {}).get("build_seconds")
+    }
+    for name in derived.ARTIFACTS
+]), hide_index=True)
+
+st.subheader("Warm-up")
+st.write(warmup.status().summary())